@@ -227,6 +227,67 @@ def resolve_dic_variable(var_obj: dict):
     return new_object
 
 
+def copy_dic_args(var_obj: dict):
+    """
+    Copy an instruction data dictionary with the dictionaries and lists it contains, as resolve_dic_variable does,
+    without resolving variables. Instruction implementations can then modify their arguments without modifying the
+    loaded script.
+    """
+    if not isinstance(var_obj, dict):
+        return var_obj
+    new_object = dict()
+    for key, value in var_obj.items():
+        if isinstance(value, dict):
+            value = copy_dic_args(value)
+        elif isinstance(value, list):
+            value = [copy_dic_args(v) for v in value]
+        new_object[key] = value
+    return new_object
+
+
+def contains_variable(value):
+    """
+    Return True if resolve_dic_variable or resolve_variable would replace any user defined variable in the value.
+    """
+    if isinstance(value, str):
+        return value.count(VAR_MARKER) > 1
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if contains_variable(key):
+                return True
+            if isinstance(item, list):
+                if any(isinstance(v, dict) and contains_variable(v) for v in item):
+                    return True
+            elif contains_variable(item):
+                return True
+    return False
+
+
+def find_variable_args(data):
+    """
+    Find the arguments of an instruction that contain user defined variables, so that only those arguments are
+    resolved when the instruction is executed.
+    @param data: The instruction data dictionary, mapping argument names to values.
+    @return tuple: The names of the arguments containing variables, or None if data is not a dictionary or an
+                   argument name contains a variable, in which case all of data must be resolved.
+    """
+    if not isinstance(data, dict) or any(contains_variable(key) for key in data):
+        return None
+    return tuple(key for key in data if contains_variable({key: data[key]}))
+
+
+def resolve_variable_args(data: dict, variable_args):
+    """
+    Resolve the user defined variables of the given arguments of an instruction data dictionary.
+    @param data: The instruction data dictionary.
+    @param variable_args: The names of the arguments to resolve, as returned by find_variable_args.
+    @return dict: A copy of data (see copy_dic_args) with the given arguments resolved.
+    """
+    resolved = copy_dic_args(data)
+    resolved.update(resolve_dic_variable({key: data[key] for key in variable_args}))
+    return resolved
+
+
 INDEX_PATTERN = r'\[(.*?)\]'
 
 
@@ -17,6 +17,8 @@ Event Type definitions for CTF
 # License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
 # either expressed or implied.
 
+from lib.ctf_utility import find_variable_args
+
 
 class Instruction:
     """
@@ -35,3 +37,5 @@ class Instruction:
         self.test = test
         self.command_index = command_index
         self.is_disabled = disabled
+        # Arguments containing user defined variables, which are resolved when the instruction is executed
+        self.variable_args = find_variable_args(command.get("data")) if isinstance(command, dict) else None
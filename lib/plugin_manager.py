@@ -49,10 +49,11 @@ import os
 import pkgutil
 import json
 import sys
+from collections import namedtuple
 from inspect import signature
 
 from lib.ctf_global import Global
-from lib.ctf_utility import resolve_dic_variable
+from lib.ctf_utility import copy_dic_args, resolve_dic_variable, resolve_variable_args
 from lib.exceptions import CtfTestError
 from lib.logger import logger as log
 
@@ -61,6 +62,14 @@ from lib.logger import logger as log
 #     JSON files.
 from lib.status import ObjectFactory
 
+## Signature metadata of an instruction implementation: the implementation, its signature and the number of required
+#  and optional arguments.
+CommandSignature = namedtuple("CommandSignature", ["func", "signature", "required_args", "optional_args"])
+
+## Entry of the PluginManager command table: the plugin implementing an instruction, followed by the signature
+#  metadata of the instruction implementation. Passed to Plugin.process_command_handler to invoke the instruction.
+CommandHandler = namedtuple("CommandHandler", ("plugin",) + CommandSignature._fields)
+
 
 class ArgTypes:
     """
@@ -114,6 +123,40 @@ class Plugin():
         #  without)
         self.end_test_on_fail_commands = []
 
+        ## Signature metadata of the instruction implementations by instruction name, as CommandSignature tuples.
+        #  Filled by the PluginManager when the command table is built, or on the first call of an instruction.
+        self.command_signatures = {}
+
+    def get_command_signature_info(self, instruction):
+        """
+        Return the signature metadata of an instruction implementation, computing it only if the implementation was
+        not seen before.
+        @param instruction: The instruction name, which must be in the command map.
+        @return CommandSignature: The signature metadata of the instruction implementation.
+        """
+        func = self.command_map[instruction][0]
+        cached = self.command_signatures.get(instruction)
+        if cached is None or cached.func is not func:
+            sig = signature(func)
+            req_args = 0
+            optional_args = 0
+            for value in sig.parameters.values():
+                if value.default == sig.empty:
+                    req_args += 1
+                else:
+                    optional_args += 1
+            cached = CommandSignature(func, sig, req_args, optional_args)
+            self.command_signatures[instruction] = cached
+        return cached
+
+    def get_command_signature(self, instruction):
+        """
+        Return the signature of an instruction implementation.
+        @param instruction: The instruction name, which must be in the command map.
+        @return Signature: The signature of the instruction implementation.
+        """
+        return self.get_command_signature_info(instruction).signature
+
     def initialize(self):
         """
         Virtual initialize method definition. Must be overridden by child Plugin class.
@@ -130,37 +173,51 @@ class Plugin():
         @note - This function will ensure that the number of argument provided to the plugin's function is greater than
                 the number of required arguments (non-optional), and less than or equal to the total number of arguments
                 (required + optional)
+        @note - kwargs may include variable_args, the names of the data arguments containing user defined variables
+                (see Instruction.variable_args). If not provided, all of data is resolved.
+        @note - The implementation receives a copy of data, including the dictionaries and lists it contains, so it
+                may modify its arguments without modifying the loaded script.
         """
-        result = False
-
-        # resolve variables in kwargs, so that individual instruction does not need to process the argument
-        kwargs = resolve_dic_variable(kwargs)
-
         instruction = kwargs["instruction"]
-        if "data" in kwargs.keys():
-            data = kwargs["data"]
+        if instruction not in self.command_map.keys():
+            return False
+        handler = CommandHandler(self, *self.get_command_signature_info(instruction))
+        return self.process_command_handler(handler, instruction, kwargs.get("data", {}), kwargs.get("variable_args"))
 
-        if instruction in self.command_map.keys():
-            func = self.command_map[instruction][0]
-            sig = signature(func)
-            req_args = 0
-            optional_args = 0
-            for value in sig.parameters.values():
-                if value.default == sig.empty:
-                    req_args += 1
-                else:
-                    optional_args += 1
+    def process_command_handler(self, handler, instruction, data, variable_args=None):
+        """
+        Invoke the implementation of a CTF Test Instruction given by a command table entry, without looking up the
+        implementation and its signature again.
+
+        @param handler: The CommandHandler of the instruction, as returned by PluginManager.find_command_handler.
+        @param instruction: The instruction name.
+        @param data: The instruction data, passed to the implementation as keyword arguments.
+        @param variable_args: The names of the data arguments containing user defined variables (Optional). If None,
+                              all of data is resolved.
+        @return The result of the instruction implementation, or False if the number of arguments is invalid.
+        """
+        result = False
 
-            if req_args <= len(data) <= (req_args + optional_args):
-                try:
-                    result = func(**data)
-                except Exception as exception:
-                    log.error("Error Applying Function {} with exception {}".format(func, exception))
-                    raise CtfTestError("Error Applying Function") from exception
-            else:
-                log.error("Invalid number of parameters passed to {}. Expected at least {} args".format(instruction,
-                                                                                                        req_args))
-                result = False
+        # resolve variables in data, so that individual instruction does not need to process the argument. If the
+        # arguments containing variables were found when the script was loaded, only those are resolved.
+        if variable_args is None:
+            data = resolve_dic_variable(data)
+        elif variable_args:
+            data = resolve_variable_args(data, variable_args)
+        else:
+            data = copy_dic_args(data)
+
+        func, req_args, optional_args = handler.func, handler.required_args, handler.optional_args
+        if req_args <= len(data) <= (req_args + optional_args):
+            try:
+                result = func(**data)
+            except Exception as exception:
+                log.error("Error Applying Function {} with exception {}".format(func, exception))
+                raise CtfTestError("Error Applying Function") from exception
+        else:
+            log.error("Invalid number of parameters passed to {}. Expected at least {} args".format(instruction,
+                                                                                                    req_args))
+            result = False
         if result is None and instruction not in self.verify_required_commands:
             log.warning("Plugin Execution Result for {} is None. Please ensure all plugin instructions \
                      return a boolean result.".format(instruction))
@@ -190,6 +247,9 @@ class PluginManager:
         self.plugin_packages = plugin_packages
         self.plugins = {}
 
+        ## Command table mapping each instruction name to the CommandHandler of the plugin implementing it
+        self.command_table = {}
+
         self.plugin_name_list = []
         self.reload_plugins()
 
@@ -208,6 +268,39 @@ class PluginManager:
         for plugin in self.plugins.values():
             plugin.shutdown()
 
+    def build_command_table(self):
+        """
+        Build the command table from the command maps of all loaded plugins. Instructions implemented by more than one
+        plugin are reported, and resolved to the first plugin loaded.
+        """
+        self.command_table = {}
+        for plugin in self.plugins.values():
+            for command in plugin.command_map.keys():
+                existing = self.command_table.get(command)
+                if existing is not None:
+                    log.warning("Instruction {} is implemented by plugins {} and {}. Using {}."
+                                .format(command, existing.plugin.name, plugin.name, existing.plugin.name))
+                    continue
+                self.command_table[command] = CommandHandler(plugin, *plugin.get_command_signature_info(command))
+
+    def find_command_handler(self, command):
+        """
+        Given a CTF Test Instruction, find the command table entry of the plugin that can execute that instruction.
+
+        @note - Instructions added to a plugin command map after the plugins are loaded are added to the command table
+                when first found.
+
+        @return CommandHandler: Command table entry of the instruction. None if no plugins found.
+        """
+        handler = self.command_table.get(command)
+        if handler is None:
+            for plugin in self.plugins.values():
+                if command in plugin.command_map.keys():
+                    handler = CommandHandler(plugin, *plugin.get_command_signature_info(command))
+                    self.command_table[command] = handler
+                    break
+        return handler
+
     def find_plugin_for_command(self, command):
         """
         Given a CTF Test Instruction, find the plugin instance that can execute that instruction.
@@ -218,10 +311,8 @@ class PluginManager:
 
         @return Plugin: Plugin instance found that implements the given instruction. None of no plugins found.
         """
-        for plugin in self.plugins.values():
-            if command in plugin.command_map.keys():
-                return plugin
-        return None
+        handler = self.find_command_handler(command)
+        return handler.plugin if handler is not None else None
 
     def find_plugin_for_command_and_execute(self, command):
         """
@@ -261,6 +352,7 @@ class PluginManager:
             self.walk_package(plugin_package)
             os.chdir(cwd)
             Global.plugins_available = self.plugins
+        self.build_command_table()
 
     def walk_package(self, package):
         """Recursively walk the supplied package to retrieve all plugins
@@ -338,7 +430,7 @@ class PluginManager:
                 command_info = ObjectFactory.create_object("CommandInfo")
                 command_info["name"] = command
                 command_info["description"] = ""
-                sig = signature(plugin.command_map[command][0])
+                sig = plugin.get_command_signature(command)
                 parameters = sig.parameters
                 for parameter in parameters.values():
                     parameter_info = ObjectFactory.create_object("ParameterInfo")
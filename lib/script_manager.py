@@ -22,14 +22,22 @@ import os
 import time
 import traceback
 import json
+import multiprocessing
+import queue
 
 from lib import ctf_utility
 from lib.exceptions import CtfTestError
 from lib.logger import logger as log, change_log_file
 from lib.readers.json_script_reader import JSONScriptReader
-from lib.status_manager import StatusDefs
+from lib.status_manager import StatusDefs, WorkerStatusReporter
 from lib.ctf_global import Global
 
+# Config options of UDP ports offset for each worker process in parallel execution
+WORKER_PORT_OPTIONS = ("cmd_udp_port", "tlm_udp_port")
+
+# Period in seconds at which the main process checks that worker processes are alive
+WORKER_POLL_PERIOD = 1.0
+
 
 class ScriptManagerConfig:
     """
@@ -47,6 +55,12 @@ class ScriptManagerConfig:
 
         self.json_results = Global.config.getboolean("logging", "json_results")
 
+        # Number of worker processes to run scripts in parallel. Scripts run sequentially if 0 or 1.
+        self.parallel_workers = Global.config.getint("core", "parallel_workers", fallback=0)
+
+        # Offset between the UDP ports of consecutive worker processes
+        self.parallel_port_stride = Global.config.getint("core", "parallel_port_stride", fallback=100)
+
 
 class ScriptManager:
     """
@@ -89,6 +103,7 @@ class ScriptManager:
     def run_all_scripts(self):
         """
         Run all added scripts, updating the status packets, and ensuring plugins are reloaded between scripts if needed.
+        If parallel_workers is greater than 1, the scripts are run in that many worker processes.
         """
         self.status_manager.start()
         self.status_manager.set_scripts(self.script_list)
@@ -98,107 +113,287 @@ class ScriptManager:
         self.status_manager.update_suite_status(suite_status, suite_details)
 
         try:
+            worker_count = self.get_worker_count()
+            if worker_count > 1:
+                self.prep_logging()
+                results = self.run_scripts_in_workers(worker_count)
+            else:
+                self.plugin_manager.initialize_plugins()
+                self.prep_logging()
+                results = self.run_scripts_sequentially()
+
+            self.status_manager.finalize_suite_status()
+            if self.config.json_results is True:
+                with open(self.regression_summary_json_file_path, "a") as file:
+                    json.dump(results, file, indent=4)
+
+        except Exception as ex:
+            log.error("Exception: ", exc_info=True)
+            suite_status = StatusDefs.error
+            suite_details = str(traceback.format_exc())
+            self.status_manager.update_suite_status(suite_status, suite_details)
+            raise CtfTestError("Error in run_all_scripts") from ex
+
+    def run_scripts_sequentially(self):
+        """
+        Run each script in the script_list sequentially in this process.
+        @return dict: The JSON results of the scripts.
+        """
+        results = {
+            "Test_Results": []
+        }
+        test_count = 1
+        wait_time = Global.config.getfloat("core", "delay_between_scripts", fallback=1.0)
+
+        for i, script in enumerate(self.script_list):
+            self.run_script(script, test_count)
+
+            if self.config.json_results is True:
+                results["Test_Results"].append(self.get_script_result(script))
+
+            test_count = test_count + 1
+
+            if self.config.reset_plugins_between_scripts:
+                self.plugin_manager.shutdown_plugins()
+
+            self.revert_log_file()
+
+            prompt_str = "to run the next test" if i < (len(self.script_list) - 1) else "to clean up plugins"
+            log.info("Test execution complete. Waiting {} seconds {} ...".format(wait_time, prompt_str))
+            Global.time_manager.wait(wait_time)
+
+        if not self.config.reset_plugins_between_scripts:
+            self.plugin_manager.shutdown_plugins()
+
+        return results
+
+    def run_script(self, script, test_count):
+        """
+        Run a single script in its own log directory, then update the script status and the results summary file.
+        @param script: The script to run.
+        @param test_count: The number of scripts run by this process so far, including this one.
+        """
+        # Create directory to log each script output
+        logs_dirname = Global.test_log_dir + "/logs/" + script.input_file + script.params
+        current_time = time.time()
+        self.curr_script_log_dir_path = str("%0s_%0d" % (logs_dirname, current_time))
+        Global.current_script_log_dir = self.curr_script_log_dir_path
+        log.info("Ready to run test script {}".format(script.input_file))
+
+        if self.config.reset_plugins_between_scripts and test_count > 1:
+            # Re-initialize to re-run plugin __init__ function (constructor)
+            self.plugin_manager.reload_plugins()
+
+            # Run the initialize() function on each plugin
             self.plugin_manager.initialize_plugins()
 
-            self.prep_logging()
+        # Start logging in script's log directory
+        os.makedirs(self.curr_script_log_dir_path)
+        change_log_file(os.path.join(Global.current_script_log_dir, script.input_file + ".log"))
 
-            # Run each script in the script_list sequentially
-            results = {
-                "Test_Results": []
-            }
-            test_count = 1
-            wait_time = Global.config.getfloat("core", "delay_between_scripts", fallback=1.0)
+        # update build-in variable
+        ctf_utility.set_variable("_CTF_LOG_DIR", "=", self.curr_script_log_dir_path, "string")
+        try:
+            script.run_script(self.status_manager)
+        except CtfTestError:
+            script.status = StatusDefs.failed
+            self.write_summary_line(script)
+            log.error("Failed to execute script: {}".format(script.input_file))
 
-            for i, script in enumerate(self.script_list):
-                # Create directory to log each script output
-                logs_dirname = Global.test_log_dir + "/logs/" + script.input_file + script.params
-                current_time = time.time()
-                self.curr_script_log_dir_path = str("%0s_%0d" % (logs_dirname, current_time))
-                Global.current_script_log_dir = self.curr_script_log_dir_path
-                log.info("Ready to run test script {}".format(script.input_file))
+        # When finished, update the script status
+        script_status = StatusDefs.passed
+        script_details = "Running"
+        # If any tests have failed, script has failed
+        for test in script.tests:
+            if test.test_result is not True:
+                script_status = StatusDefs.failed
+                script_details = "One or more tests failed"
 
-                if self.config.reset_plugins_between_scripts and test_count > 1:
-                    # Re-initialize to re-run plugin __init__ function (constructor)
-                    self.plugin_manager.reload_plugins()
+        self.status_manager.update_script_status(script_status, script_details)
 
-                    # Run the initialize() function on each plugin
-                    self.plugin_manager.initialize_plugins()
+        self.status_manager.end_script()
 
-                # Start logging in script's log directory
-                os.makedirs(self.curr_script_log_dir_path)
-                change_log_file(os.path.join(Global.current_script_log_dir, script.input_file + ".log"))
+        script.status = StatusDefs.failed if script.failed_tests else StatusDefs.passed
 
-                # update build-in variable
-                ctf_utility.set_variable("_CTF_LOG_DIR", "=", self.curr_script_log_dir_path, "string")
-                try:
-                    script.run_script(self.status_manager)
-                except CtfTestError:
-                    script.status = StatusDefs.failed
-                    self.write_summary_line(script)
-                    log.error("Failed to execute script: {}".format(script.input_file))
-
-                # When finished, update the script status
-                script_status = StatusDefs.passed
-                script_details = "Running"
-                # If any tests have failed, script has failed
-                for test in script.tests:
-                    if test.test_result is not True:
-                        script_status = StatusDefs.failed
-                        script_details = "One or more tests failed"
-
-                self.status_manager.update_script_status(script_status, script_details)
-
-                self.status_manager.end_script()
-
-                script.status = StatusDefs.failed if script.failed_tests else StatusDefs.passed
-
-                log.debug("Going to update results summary file ... ")
-                self.write_summary_line(script)
-
-                if self.config.json_results is True:
-                    results["Test_Results"].append({
-                        "Status": script.status,
-                        "Time": script.exec_time,
-                        "Test_Num": script.test_number,
-                        "Req_Num": script.requirements,
-                        "Tests_Run": script.num_tests,
-                        "Tests_Passed": script.num_passed,
-                        "Tests_Failed": len(script.failed_tests),
-                        "Tests_Error": script.num_error,
-                        "Script": script.input_file
-                    })
+        log.debug("Going to update results summary file ... ")
+        self.write_summary_line(script)
 
+    @staticmethod
+    def revert_log_file():
+        """
+        Revert logging back to the CTF main log file.
+        """
+        try:
+            change_log_file(Global.CTF_log_dir_file)
+        except Exception as ex:
+            # Cannot be reached - change_log_file does not throw an exception, even with an invalid log path/file
+            log.warning("Failed to revert logging to CTF. Does {} still exist?".format(Global.CTF_log_dir_file))
+            raise CtfTestError("Error in run_all_scripts") from ex
+
+    @staticmethod
+    def get_script_result(script):
+        """
+        Get the JSON result entry of a script that has been run.
+        """
+        return {
+            "Status": script.status,
+            "Time": script.exec_time,
+            "Test_Num": script.test_number,
+            "Req_Num": script.requirements,
+            "Tests_Run": script.num_tests,
+            "Tests_Passed": script.num_passed,
+            "Tests_Failed": len(script.failed_tests),
+            "Tests_Error": script.num_error,
+            "Script": script.input_file
+        }
+
+    def get_worker_count(self):
+        """
+        Get the number of worker processes to run the scripts in. Parallel execution requires the fork start method,
+        so that workers inherit the loaded config, plugins and scripts.
+        @return int: The number of workers, or 1 to run the scripts sequentially in this process.
+        """
+        worker_count = min(self.config.parallel_workers, len(self.script_list))
+        if worker_count > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            log.warning("Parallel script execution is not supported on this platform. Running scripts sequentially.")
+            worker_count = 1
+        return max(worker_count, 1)
+
+    def run_scripts_in_workers(self, worker_count):
+        """
+        Run the scripts in the script_list in worker processes. Each worker runs the next script not yet taken by
+        another worker, until all scripts are run. Status updates of the workers are applied to the status manager
+        as they arrive, and the results are merged in the order of the script_list.
+        @param worker_count: The number of worker processes.
+        @return dict: The JSON results of the scripts.
+        """
+        context = multiprocessing.get_context("fork")
+        next_index = context.Value("i", 0)
+        message_queue = context.Queue()
+        workers = [context.Process(target=self.run_worker, args=(worker_index, next_index, message_queue),
+                                   name="CTF_Worker_{}".format(worker_index))
+                   for worker_index in range(worker_count)]
+        log.info("Running {} scripts in {} worker processes".format(len(self.script_list), worker_count))
+        for worker in workers:
+            worker.start()
+
+        script_results = {}
+        running_workers = set(range(worker_count))
+        while running_workers:
+            try:
+                kind, worker_index, payload = message_queue.get(timeout=WORKER_POLL_PERIOD)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    log.error("Worker processes {} exited without completing".format(sorted(running_workers)))
+                    break
+                continue
+            if kind == "status":
+                self.status_manager.apply_worker_update(*payload)
+            elif kind == "result":
+                script_index, script_result = payload
+                script_results[script_index] = script_result
+            elif kind == "error":
+                log.error("Error in worker process {}: {}".format(worker_index, payload))
+            elif kind == "done":
+                running_workers.discard(worker_index)
+
+        for worker in workers:
+            worker.join()
+
+        results = {
+            "Test_Results": []
+        }
+        for script_index, script in enumerate(self.script_list):
+            if script_index in script_results:
+                for name, value in script_results[script_index].items():
+                    setattr(script, name, value)
+            else:
+                log.error("Script {} was not run by a worker process".format(script.input_file))
+                script.status = StatusDefs.error
+                self.status_manager.script_index = script_index
+                self.status_manager.update_script_status(StatusDefs.error, "Error")
+            self.write_summary_line(script)
+            if self.config.json_results is True:
+                results["Test_Results"].append(self.get_script_result(script))
+        return results
+
+    def run_worker(self, worker_index, next_index, message_queue):
+        """
+        Run scripts in a worker process until all scripts are taken. The worker logs to its own directory under the
+        test log directory, offsets the UDP ports of the config by worker_index * parallel_port_stride, and forwards
+        status updates and script results to the main process over the message queue.
+        @param worker_index: Index of this worker process.
+        @param next_index: Shared index of the next script to run.
+        @param message_queue: Queue read by the main process.
+        """
+        try:
+            Global.test_log_dir = os.path.join(Global.test_log_dir, "worker_{}".format(worker_index))
+            os.makedirs(Global.test_log_dir)
+            Global.CTF_log_dir_file = os.path.join(Global.test_log_dir, os.path.basename(Global.CTF_log_dir_file))
+            change_log_file(Global.CTF_log_dir_file)
+            self.offset_worker_ports(worker_index)
+            self.status_manager = WorkerStatusReporter(message_queue, worker_index)
+            self.prep_logging()
+
+            self.plugin_manager.initialize_plugins()
+            test_count = 1
+            wait_time = Global.config.getfloat("core", "delay_between_scripts", fallback=1.0)
+            while True:
+                with next_index.get_lock():
+                    script_index = next_index.value
+                    next_index.value += 1
+                if script_index >= len(self.script_list):
+                    break
+
+                script = self.script_list[script_index]
+                self.status_manager.script_index = script_index
+                self.run_script(script, test_count)
+                message_queue.put(("result", worker_index, (script_index, {
+                    "status": script.status,
+                    "exec_time": script.exec_time,
+                    "num_tests": script.num_tests,
+                    "num_passed": script.num_passed,
+                    "failed_tests": list(script.failed_tests),
+                    "num_error": script.num_error
+                })))
                 test_count = test_count + 1
 
                 if self.config.reset_plugins_between_scripts:
                     self.plugin_manager.shutdown_plugins()
 
-                try:
-                    # Revert logging back to CTF main log
-                    change_log_file(Global.CTF_log_dir_file)
-                except Exception as ex:
-# Cannot be reached - change_log_file does not throw an exception, even with an invalid log path/file
-                    log.warning("Failed to revert logging to CTF. Does {} still exist?".format(Global.CTF_log_dir_file))
-                    raise CtfTestError("Error in run_all_scripts") from ex
-
-                prompt_str = "to run the next test" if i < (len(self.script_list) - 1) else "to clean up plugins"
-                log.info("Test execution complete. Waiting {} seconds {} ...".format(wait_time, prompt_str))
+                self.revert_log_file()
+                log.info("Test execution complete. Waiting {} seconds ...".format(wait_time))
                 Global.time_manager.wait(wait_time)
 
             if not self.config.reset_plugins_between_scripts:
                 self.plugin_manager.shutdown_plugins()
-
-            self.status_manager.finalize_suite_status()
-            if self.config.json_results is True:
-                with open(self.regression_summary_json_file_path, "a") as file:
-                    json.dump(results, file, indent=4)
-
-        except Exception as ex:
+        except Exception:
             log.error("Exception: ", exc_info=True)
-            suite_status = StatusDefs.error
-            suite_details = str(traceback.format_exc())
-            self.status_manager.update_suite_status(suite_status, suite_details)
-            raise CtfTestError("Error in run_all_scripts") from ex
+            message_queue.put(("error", worker_index, traceback.format_exc()))
+        finally:
+            message_queue.put(("done", worker_index, None))
+
+    def offset_worker_ports(self, worker_index):
+        """
+        Offset the UDP ports set in each section of the config by worker_index * parallel_port_stride, so that each
+        worker process communicates with its own targets. Ports set to 0 are chosen by the OS and left unchanged.
+        cfs_port_arg is enabled in each section that sets a command port or cfs_port_arg, in every worker: cFS only
+        listens on the offset command port if it is passed with -p, and local cFS processes of each worker are found
+        and stopped by their command port.
+        """
+        offset = worker_index * self.config.parallel_port_stride
+        for section in Global.config.sections():
+            for option in WORKER_PORT_OPTIONS:
+                if offset == 0 or not Global.config.has_option(section, option):
+                    continue
+                try:
+                    port = Global.config.getint(section, option)
+                except ValueError:
+                    continue
+                if port > 0:
+                    Global.config.set(section, option, str(port + offset))
+            if Global.config.has_option(section, "cmd_udp_port") or Global.config.has_option(section, "cfs_port_arg"):
+                Global.config.set(section, "cfs_port_arg", "True")
 
     def prep_logging(self):
         """
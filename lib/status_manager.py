@@ -1,6 +1,13 @@
 """
 @namespace lib.status_manager
 Publishes CTF status messages over a UDP socket (utilized by the CTF editor)
+
+In the default "full" mode, each status message is the complete suite status. In "delta" mode, each message only
+contains the status nodes that changed since the previous message, and a complete status snapshot is sent
+periodically so that listeners that start late can synchronize.
+
+When scripts run in worker processes, each worker reports its status through a WorkerStatusReporter, and the
+StatusManager of the main process applies the forwarded updates.
 """
 # MSC-26646-1, "Core Flight System Test Framework (CTF)"
 #
@@ -18,11 +25,18 @@ Publishes CTF status messages over a UDP socket (utilized by the CTF editor)
 import traceback
 import socket
 import json
+import threading
 import time
 
 from lib.status import StatusDefs, ObjectFactory
 from lib.logger import logger as log
 
+# Largest payload that can be sent in a single UDP datagram
+MAX_DATAGRAM_SIZE = 65507
+
+# Status updates that may be forwarded from a worker process
+WORKER_STATUS_UPDATES = ("update_script_status", "update_test_status", "update_command_status")
+
 
 class StatusManager:
     """
@@ -32,9 +46,13 @@ class StatusManager:
 
     @param ip_address: IP of the external listener to connect to
     @param: port: Port used by the external listener to receive status messages
+    @param mode: "full" to send the complete status in every message, or "delta" to send only the changed nodes
+    @param max_rate: Maximum number of status messages per second, 0 for no limit. Updates received in between are
+                     coalesced into the next message, which is sent once the minimum update interval has passed.
+    @param snapshot_period: In delta mode, the period in seconds at which a complete status snapshot is sent
     """
 
-    def __init__(self, ip_address="127.0.0.1", port=None):
+    def __init__(self, ip_address="127.0.0.1", port=None, mode="full", max_rate=0.0, snapshot_period=5.0):
         """
         Constructor of StatusManager Class: initiate instance properties.
         """
@@ -47,6 +65,24 @@ class StatusManager:
         self.socket = None
         self.start_time = None
 
+        if mode not in ("full", "delta"):
+            log.warning("Invalid status mode {}. Sending full status messages.".format(mode))
+            mode = "full"
+        self.mode = mode
+        self.min_update_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.snapshot_period = snapshot_period
+        # Sequence number of the last status message sent
+        self.sequence = 0
+        self.last_update_time = None
+        self.last_snapshot_time = None
+        self.update_pending = False
+        # Timer sending the update withheld by the rate limit, and lock serializing status changes with the timer
+        self.flush_timer = None
+        self.lock = threading.RLock()
+        # Paths (script, test and instruction indices) of the status nodes changed since the last message
+        self.changed_nodes = {}
+        self.oversized_msg_logged = False
+
     def start(self):
         """
         Set the start time of test suite execution in the status message.
@@ -58,6 +94,9 @@ class StatusManager:
         Set the script status entry for each script with default values
         """
         self.status = self.blank_status_msg(scripts)
+        self.status = self.sanitize_status()
+        self.changed_nodes.clear()
+        self.last_snapshot_time = None
 
     @staticmethod
     def blank_status_msg(scripts):
@@ -97,70 +136,83 @@ class StatusManager:
         """
         Given an updated status (and details), update the suite status with the latest state.
         """
-        status = self.sanitize_param(status)
-        details = self.sanitize_param(details)
+        with self.lock:
+            status = self.sanitize_param(status)
+            details = self.sanitize_param(details)
 
-        self.status["status"] = status
-        self.status["details"] = details
-        self.send_update()
+            self.status["status"] = status
+            self.status["details"] = details
+            self.send_update(force=True)
 
     def finalize_suite_status(self):
         """
         Set the test suit status (pass/fail) based on the status of all scripts within the suite.
+        Any status update withheld by the rate limit is sent.
         """
-        suite_passed = True
-        for i in self.status["scripts"]:
-            suite_passed &= i["status"] == StatusDefs.passed
-        self.status["status"] = StatusDefs.passed if suite_passed else StatusDefs.failed
+        with self.lock:
+            suite_passed = True
+            for i in self.status["scripts"]:
+                suite_passed &= i["status"] == StatusDefs.passed
+            self.status["status"] = StatusDefs.passed if suite_passed else StatusDefs.failed
+            if self.update_pending:
+                self.send_update(force=True)
 
     def update_script_status(self, status, details=""):
         """
         Update the status of a single script within the test suite.
         """
-        status = self.sanitize_param(status)
-        details = self.sanitize_param(details)
+        with self.lock:
+            status = self.sanitize_param(status)
+            details = self.sanitize_param(details)
 
-        # ENHANCE: details seem unneeded at this level, as the only calls to this method use redundant details:
-        # (StatusDefs.active, "")
-        # (StatusDefs.passed, "Running")
-        # (StatusDefs.failed, "One or more tests failed")
-        # (StatusDefs.error, "Error")
+            # ENHANCE: details seem unneeded at this level, as the only calls to this method use redundant details:
+            # (StatusDefs.active, "")
+            # (StatusDefs.passed, "Running")
+            # (StatusDefs.failed, "One or more tests failed")
+            # (StatusDefs.error, "Error")
 
-        self.status["scripts"][self.script_index]["status"] = status
-        self.status["scripts"][self.script_index]["details"] = details
-        self.send_update()
+            self.status["scripts"][self.script_index]["status"] = status
+            self.status["scripts"][self.script_index]["details"] = details
+            self.changed_nodes[(self.script_index,)] = None
+            self.send_update(force=True)
 
     def update_test_status(self, status, details=""):
         """
         Update the status of a single script within the test suite.
         """
-        status = self.sanitize_param(status)
-        details = self.sanitize_param(details)
+        with self.lock:
+            status = self.sanitize_param(status)
+            details = self.sanitize_param(details)
 
-        self.status["scripts"][self.script_index]["tests"][self.test_index]["status"] = status
-        self.status["scripts"][self.script_index]["tests"][self.test_index]["details"] = details
-        self.send_update()
+            self.status["scripts"][self.script_index]["tests"][self.test_index]["status"] = status
+            self.status["scripts"][self.script_index]["tests"][self.test_index]["details"] = details
+            self.changed_nodes[(self.script_index, self.test_index)] = None
+            self.send_update()
 
     def update_command_status(self, status, details, index=None):
         """
         Update the status of a single command within a test script.
         """
-        if index is None:
-            index = self.command_index
+        with self.lock:
+            if index is None:
+                index = self.command_index
 
-        status = self.sanitize_param(status)
-        details = self.sanitize_param(details)
+            status = self.sanitize_param(status)
+            details = self.sanitize_param(details)
 
-        # for looping control flow, reset statuses of instructions after the current index be to 'waiting'
-        instruction_list = self.status["scripts"][self.script_index]["tests"][self.test_index]["instructions"]
-        for i in range(index + 1, len(instruction_list)):
-            instruction_list[i]["status"] = "waiting"
+            # for looping control flow, reset statuses of instructions after the current index be to 'waiting'
+            instruction_list = self.status["scripts"][self.script_index]["tests"][self.test_index]["instructions"]
+            for i in range(index + 1, len(instruction_list)):
+                if instruction_list[i]["status"] != "waiting":
+                    instruction_list[i]["status"] = "waiting"
+                    self.changed_nodes[(self.script_index, self.test_index, i)] = None
 
-        self.status["scripts"][self.script_index]["tests"][self.test_index]["instructions"][index][
-            "status"] = status
-        self.status["scripts"][self.script_index]["tests"][self.test_index]["instructions"][index][
-            "details"] = details
-        self.send_update()
+            self.status["scripts"][self.script_index]["tests"][self.test_index]["instructions"][index][
+                "status"] = status
+            self.status["scripts"][self.script_index]["tests"][self.test_index]["instructions"][index][
+                "details"] = details
+            self.changed_nodes[(self.script_index, self.test_index, index)] = None
+            self.send_update()
 
     def end_command(self):
         """
@@ -184,6 +236,21 @@ class StatusManager:
         self.test_index = 0
         self.script_index += 1
 
+    def apply_worker_update(self, indices, update, args):
+        """
+        Apply a status update forwarded by a WorkerStatusReporter in a worker process.
+
+        @param indices: The script, test and command indices of the worker when the update was made.
+        @param update: The name of the status update method, one of WORKER_STATUS_UPDATES.
+        @param args: The arguments of the status update method.
+        @return None
+        """
+        if update not in WORKER_STATUS_UPDATES:
+            log.warning("Ignoring unknown worker status update {}".format(update))
+            return
+        self.script_index, self.test_index, self.command_index = indices
+        getattr(self, update)(*args)
+
     @staticmethod
     def sanitize_param(param):
         """
@@ -239,10 +306,42 @@ class StatusManager:
                 self.status["scripts"][script_index]["tests"][test_index] = test
         return status
 
-    def send_update(self):
+    def get_status_node(self, path):
+        """
+        Return the script, test or instruction status identified by a tuple of indices.
+        """
+        node = self.status["scripts"][path[0]]
+        if len(path) > 1:
+            node = node["tests"][path[1]]
+        if len(path) > 2:
+            node = node["instructions"][path[2]]
+        return node
+
+    def build_delta_msg(self):
+        """
+        Build a status message containing the suite status and the status of each node changed since the last
+        message.
+        """
+        changes = []
+        for path in self.changed_nodes:
+            node = self.get_status_node(path)
+            changes.append({"path": list(path), "status": node["status"], "details": node["details"]})
+        return {
+            "seq": self.sequence,
+            "delta": {
+                "elapsed_time": self.status["elapsed_time"],
+                "status": self.status["status"],
+                "details": self.status.get("details", ""),
+                "changes": changes
+            }
+        }
+
+    def send_update(self, force=False):
         """
         Send the latest status packet over the UDP socket.
 
+        @param force: Send the update even if the maximum update rate would be exceeded (Optional).
+
         @note - If the UDP socket encounters an error for any reason, the port will be set to None and CTF will not
         send updates to the Editor any more. The socket failure is most likely to be a computer issue, not CTF issue.
         """
@@ -259,13 +358,129 @@ class StatusManager:
                 self.port = None
 
         # If socket is connected, send status messages
-        self.status["elapsed_time"] = time.time() - self.start_time
-        if self.port is not None:
-            self.status = self.sanitize_status()
-            try:
-                data = json.dumps(self.status, sort_keys=False, separators=(",", ":"), ensure_ascii=False)
-                self.socket.sendall(data.encode())
-            except socket.error as exception:
-                log.error("Status Manager cannot send status to {}:{}. Disabling status updates. Error: {}"
-                          .format(self.ip_address, self.port, exception))
-                self.port = None
+        now = time.time()
+        self.status["elapsed_time"] = now - self.start_time
+        if self.port is None:
+            self.changed_nodes.clear()
+            return
+
+        if not force and self.last_update_time is not None and \
+                now - self.last_update_time < self.min_update_interval:
+            self.update_pending = True
+            if self.flush_timer is None:
+                self.flush_timer = threading.Timer(self.last_update_time + self.min_update_interval - now,
+                                                   self.flush_pending_update)
+                self.flush_timer.daemon = True
+                self.flush_timer.start()
+            return
+
+        self.sequence += 1
+        if self.mode == "full":
+            msg = self.status
+        elif self.last_snapshot_time is None or now - self.last_snapshot_time >= self.snapshot_period:
+            msg = dict(self.status, seq=self.sequence)
+            self.last_snapshot_time = now
+        else:
+            msg = self.build_delta_msg()
+        self.changed_nodes.clear()
+        self.update_pending = False
+        self.last_update_time = now
+        self.cancel_flush_timer()
+
+        try:
+            data = json.dumps(msg, sort_keys=False, separators=(",", ":"), ensure_ascii=False).encode()
+            if len(data) > MAX_DATAGRAM_SIZE:
+                if not self.oversized_msg_logged:
+                    log.warning("Status message of {} bytes is too large for a UDP datagram and is not sent. "
+                                "Consider setting ctf_status_mode to delta.".format(len(data)))
+                    self.oversized_msg_logged = True
+                return
+            self.socket.sendall(data)
+        except socket.error as exception:
+            log.error("Status Manager cannot send status to {}:{}. Disabling status updates. Error: {}"
+                      .format(self.ip_address, self.port, exception))
+            self.port = None
+
+    def flush_pending_update(self):
+        """
+        Send the update withheld by the rate limit, if it has not been sent since. Called by the flush timer, so
+        that the last status of a long instruction reaches the listener without waiting for another update.
+        """
+        with self.lock:
+            self.flush_timer = None
+            if self.update_pending:
+                self.send_update(force=True)
+
+    def cancel_flush_timer(self):
+        """
+        Cancel the timer sending the update withheld by the rate limit.
+        """
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+            self.flush_timer = None
+
+
+class WorkerStatusReporter:
+    """
+    The WorkerStatusReporter class stands in for the StatusManager in a worker process. It tracks the active script,
+    test and command indices like the StatusManager, and forwards each status update to the StatusManager of the main
+    process over a message queue.
+
+    @param message_queue: Queue read by the main process. Updates are put as ("status", worker_index, payload).
+    @param worker_index: Index of the worker process
+    """
+
+    def __init__(self, message_queue, worker_index):
+        """
+        Constructor of WorkerStatusReporter Class: initiate instance properties.
+        """
+        self.message_queue = message_queue
+        self.worker_index = worker_index
+        self.script_index = 0
+        self.test_index = 0
+        self.command_index = 0
+
+    def forward_update(self, update, *args):
+        """
+        Put a status update on the message queue, with the current indices.
+        """
+        indices = (self.script_index, self.test_index, self.command_index)
+        self.message_queue.put(("status", self.worker_index, (indices, update, args)))
+
+    def update_script_status(self, status, details=""):
+        """
+        Forward an update of the status of the active script.
+        """
+        self.forward_update("update_script_status", status, details)
+
+    def update_test_status(self, status, details=""):
+        """
+        Forward an update of the status of the active test.
+        """
+        self.forward_update("update_test_status", status, details)
+
+    def update_command_status(self, status, details, index=None):
+        """
+        Forward an update of the status of a command of the active test.
+        """
+        self.forward_update("update_command_status", status, details, index)
+
+    def end_command(self):
+        """
+        Increment the current active command index.
+        """
+        self.command_index += 1
+
+    def end_test(self):
+        """
+        Increment the current active test index. Reset the command index to 0.
+        """
+        self.command_index = 0
+        self.test_index += 1
+
+    def end_script(self):
+        """
+        Reset the test and command indices to 0. The next script index is assigned by the worker.
+        """
+        self.command_index = 0
+        self.test_index = 0
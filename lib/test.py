@@ -18,6 +18,7 @@ Represents a single CTF test within a script
 # either expressed or implied.
 
 
+import itertools
 import time
 
 from lib.ctf_global import Global, CtfVerificationStage
@@ -51,6 +52,8 @@ class Test:
 
         self.ctf_verification_timeout = Global.config.getfloat("core", "ctf_verification_timeout")
         self.ctf_verification_poll_period = Global.config.getfloat("core", "ctf_verification_poll_period")
+        self.event_driven_verification = Global.config.getboolean("core", "ctf_event_driven_verification",
+                                                                  fallback=False)
         self.end_test_on_fail = Global.config.getboolean("core", "end_test_on_fail")
 
         self.ignored_instructions = []
@@ -78,9 +81,11 @@ class Test:
 
         self.current_instruction_index = 0
 
-    def execute_instruction(self, test_instruction, command_index):
+    def execute_instruction(self, test_instruction, command_index, variable_args=None):
         """
         Execute a CTF Test Instruction
+        @param variable_args: The names of the instruction arguments containing user defined variables
+                              (see Instruction.variable_args). If None, all arguments are resolved.
         """
         # for command in commands:
         instruction = test_instruction["instruction"]
@@ -91,11 +96,12 @@ class Test:
             return False
 
         # execute command if not verification
-        plugin_to_use = Global.plugin_manager.find_plugin_for_command(instruction)
+        handler = Global.plugin_manager.find_command_handler(instruction)
         data_str = str(data).replace("\n", "\n" + " " * 20)
-        if plugin_to_use is not None:
+        if handler is not None:
             try:
-                instruction_passed = plugin_to_use.process_command(instruction=instruction, data=data)
+                instruction_passed = handler.plugin.process_command_handler(handler, instruction, data,
+                                                                            variable_args)
             except CtfTestError:
                 instruction_passed = False
 
@@ -119,11 +125,13 @@ class Test:
 
         return instruction_passed
 
-    def execute_verification(self, command, command_index, timeout, new_verification=False):
+    def execute_verification(self, command, command_index, timeout, new_verification=False, variable_args=None):
         """
         Execute a CTF Verification Instruction.
         @note - Verification instructions will be executed at the specified poll period until the verification passes
                 or a timeout is reached
+        @note - With event-driven verification, the instruction is also executed as soon as the time manager
+                reports new data for it, until the timeout has elapsed in execution time
         """
         if new_verification or Global.current_verification_start_time is None:
             Global.current_verification_start_time = Global.time_manager.exec_time
@@ -138,20 +146,31 @@ class Test:
         num_verify = int(timeout / self.ctf_verification_poll_period) + 1
         verified = False
         verification_start_time = time.time()
+        if self.event_driven_verification:
+            # The number of evaluations depends on how often new data arrives
+            verification_deadline = Global.time_manager.exec_time + timeout
+            attempts = itertools.count()
+        else:
+            attempts = range(num_verify)
 
-        for i in range(num_verify):
+        # The instruction is resolved once, rather than on each poll of the verification
+        handler = Global.plugin_manager.find_command_handler(instruction)
+        for i in attempts:
             log.info("Executing {}th verification of the command {}".format(i+1, command))
-            plugin_to_use = Global.plugin_manager.find_plugin_for_command(instruction)
-            if plugin_to_use is not None:
+            if self.event_driven_verification:
+                is_last_verification = Global.time_manager.exec_time >= verification_deadline
+            else:
+                is_last_verification = i == num_verify - 1
+            if handler is not None:
                 if i == 0:
                     Global.current_verification_stage = CtfVerificationStage.first_ver
-                elif i == num_verify - 1:
+                elif is_last_verification:
                     Global.current_verification_stage = CtfVerificationStage.last_ver
                 else:
                     Global.current_verification_stage = CtfVerificationStage.polling
 
                 try:
-                    verified = plugin_to_use.process_command(instruction=instruction, data=data)
+                    verified = handler.plugin.process_command_handler(handler, instruction, data, variable_args)
                 except CtfTestError:
                     verified = False
 
@@ -163,8 +182,13 @@ class Test:
             # In case CTF is over-loaded, use system time to break the loop
             if (time.time() - verification_start_time) > (timeout+1):
                 break
+            if self.event_driven_verification and is_last_verification:
+                break
             try:
-                self.process_verification_delay()
+                if self.event_driven_verification:
+                    self.process_verification_delay(verification_deadline - Global.time_manager.exec_time)
+                else:
+                    self.process_verification_delay()
             except CtfConditionError as exception:
                 self.test_result = False
                 log.test(False, False, "CtfConditionError: Condition not satisfied: {}".format(exception))
@@ -193,13 +217,18 @@ class Test:
         """
         Global.time_manager.wait(delay)
 
-    def process_verification_delay(self):
+    def process_verification_delay(self, remaining=None):
         """
         Utilize the current CTF time manager to wait for the duration of the polling period before executing a CTF
-        Verification Test Instruction
+        Verification Test Instruction. With event-driven verification, the wait is limited to the remaining
+        verification time, and ends early if the time manager reports new data for the verification.
         """
-
-        Global.time_manager.wait(self.ctf_verification_poll_period)
+        if self.event_driven_verification:
+            delay = self.ctf_verification_poll_period if remaining is None \
+                else min(self.ctf_verification_poll_period, remaining)
+            Global.time_manager.wait_for_update(delay)
+        else:
+            Global.time_manager.wait(self.ctf_verification_poll_period)
 
     def run_commands(self):
         """
@@ -285,10 +314,12 @@ class Test:
                 instruction_result = self.execute_verification(i.command,
                                                                i.command_index,
                                                                timeout,
-                                                               reset_ver_start_time)
+                                                               reset_ver_start_time,
+                                                               i.variable_args)
             # this handles continuously verified commands.
             else:
-                instruction_result = self.execute_instruction(i.command, self.current_instruction_index)
+                instruction_result = self.execute_instruction(i.command, self.current_instruction_index,
+                                                              i.variable_args)
 
             prev_instruction = i
             try:
@@ -45,6 +45,14 @@ class TimeInterface:
         """
         raise NotImplementedError()
 
+    def wait_for_update(self, seconds):
+        """
+        Wait up to an amount of time, returning early if new data is available for the current verification.
+
+        @note - Time managers that cannot detect new data wait the full amount of time.
+        """
+        self.wait(seconds)
+
     @staticmethod
     def pre_command():
         """
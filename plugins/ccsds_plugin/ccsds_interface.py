@@ -22,6 +22,40 @@ ccsds_interface.py: Defines the interface by which a CCSDS reader class can conf
 from lib.logger import logger as log
 
 
+class MidMapIndex:
+    """
+    Reverse lookup indexes of a MID map, from MID values to MID names and from (MID value, command code) pairs to
+    command code names. Where several entries share a value, the first entry of the MID map is indexed.
+    """
+
+    def __init__(self, mid_map):
+        """
+        Constructor for MidMapIndex class. Indexes the entries of mid_map.
+        @param mid_map: The MID map to index. The index must be rebuilt if the MID map is modified.
+        """
+        self.mid_map = mid_map
+        self.mid_names = {}
+        self.cc_names = {}
+        for mid_name, msg in mid_map.items():
+            mid = msg.get("MID")
+            self.mid_names.setdefault(mid, mid_name)
+            for cc_name, cc_dict in (msg.get("CC") or {}).items():
+                self.cc_names.setdefault((mid, cc_dict.get("CODE")), cc_name)
+
+    def get_mid_name(self, mid):
+        """
+        Return the name of the MID map entry with the given MID value, or None if there is none.
+        """
+        return self.mid_names.get(mid)
+
+    def get_cc_name(self, mid, code):
+        """
+        Return the name of the command code with the given value in the MID map entry with the given MID value,
+        or None if there is none.
+        """
+        return self.cc_names.get((mid, code))
+
+
 class CCSDSInterface:
     """
     This class provides an interface and partial implementation for a CCSDS reader to process CCSDS data from
@@ -31,6 +65,7 @@ class CCSDSInterface:
     def __init__(self, config):
         self.mids = {}
         self.mid_map = {}
+        self.mid_index = None
         self.enum_map = {}
 
         # Exports may have CCSDS Header included or not.
@@ -99,6 +134,15 @@ class CCSDSInterface:
         if self.log_ccsds_imports:
             log.info("Added Enumeration {}:{}".format(key, value))
 
+    def build_mid_index(self):
+        """
+        Builds the reverse lookup indexes of the MID map. Must be called once the MID map is populated.
+
+        @return MidMapIndex: The indexes of the MID map
+        """
+        self.mid_index = MidMapIndex(self.mid_map)
+        return self.mid_index
+
     # Virtual Functions
     def get_ccsds_messages_from_dir(self, directory):
         """
@@ -96,13 +96,11 @@ class CcsdsV2PrimaryHeader(CcsdsPrimaryHeaderBase):
     """
     This class provides an interface to a CCSDS V2 primary header
 
-    @note - This is a sample implementation showing how custom headers can extend CcsdsPrimaryHeaderBase as needed.
-            The implementation of is_command is redundant with CcsdsPrimaryHeaderBase.
+    @note - Custom headers can extend CcsdsPrimaryHeaderBase as needed. If a header overrides is_command, get_msg_id
+            or get_sequence_count, CTF decodes the header structure of each received packet instead of unpacking the
+            standard header fields directly.
     """
 
-    def is_command(self) -> int:
-        return self.type
-
 
 # pylint: disable=no-self-use
 class CcsdsV2Packet(CcsdsPacketInterface):
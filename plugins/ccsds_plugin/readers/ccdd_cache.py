@@ -0,0 +1,247 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+"""
+ccdd_cache.py: Persistent cache of CCSDS dictionaries loaded from CCDD exports.
+
+- A loaded dictionary (type dictionary, MIDs, MID map and enumerations) is stored as JSON, with each ctypes type
+  described by its layout. On a cache hit, the types are recreated from their layouts instead of parsing the
+  CCDD export files.
+- Cache files are named by a hash of the export files, CCSDS target, header path and endianness, so a changed
+  dictionary is never read from a stale cache.
+"""
+
+import ctypes
+import hashlib
+import json
+import os
+import tempfile
+import traceback
+
+from lib.ctf_global import Global
+from lib.logger import logger as log
+
+# Version of the cache file format. Changing the format must change this value, so that older cache files are ignored.
+CCDD_CACHE_FORMAT_VERSION = 1
+
+# Simple ctypes types by name, used to describe the fields of cached types
+SIMPLE_CTYPES = {name: value for name, value in vars(ctypes).items()
+                 if isinstance(value, type) and issubclass(value, ctypes._SimpleCData)  # pylint: disable=protected-access
+                 and name.startswith("c_")}
+
+# JSON-serializable values that may be stored as constants and enumerations
+CONSTANT_TYPES = (int, float, bool, str, type(None))
+
+
+class CacheFormatError(Exception):
+    """
+    Raised when a dictionary cannot be described in, or read from, the cache format.
+    """
+
+
+def ccdd_cache_key(directory, files, config):
+    """
+    Compute the cache key of a CCSDS dictionary.
+
+    @param directory: The CCSDS data directory.
+    @param files: The sorted list of CCDD export files in the directory.
+    @param config: The CfsConfig of the target loading the dictionary.
+    @return str: The hex digest identifying the dictionary.
+    """
+    digest = hashlib.sha256()
+    header_path = Global.config.get("ccsds", "CCSDS_header_path", fallback="")
+    for item in (CCDD_CACHE_FORMAT_VERSION, config.ccsds_target, config.endianess_of_target, header_path):
+        digest.update("{}\0".format(item).encode())
+    for filename in files:
+        digest.update("{}\0".format(os.path.relpath(filename, directory)).encode())
+        with open(filename, "rb") as file:
+            digest.update(file.read())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class _TypeEncoder:
+    """
+    Describes ctypes types as a list of layouts, in which each type only references types listed before it.
+    """
+
+    def __init__(self, structure_base):
+        self.structure_base = structure_base
+        self.layouts = []
+        self.type_ids = {}
+
+    def encode(self, data_type):
+        """
+        Return the index of the layout describing a type, adding the layouts of the type and its fields as needed.
+        """
+        type_id = self.type_ids.get(data_type)
+        if type_id is not None:
+            return type_id
+
+        # pylint: disable=protected-access
+        if SIMPLE_CTYPES.get(getattr(data_type, "__name__", None)) is data_type:
+            layout = ["simple", data_type.__name__]
+        elif isinstance(data_type, type) and issubclass(data_type, ctypes.Array):
+            layout = ["array", self.encode(data_type._type_), data_type._length_]
+        elif isinstance(data_type, type) and data_type.__bases__ == (self.structure_base,):
+            fields = []
+            for field in data_type._fields_:
+                fields.append([field[0], self.encode(field[1])] + list(field[2:]))
+            layout = ["struct", data_type.__name__, fields]
+        else:
+            raise CacheFormatError("Type {} cannot be cached".format(data_type))
+
+        self.type_ids[data_type] = len(self.layouts)
+        self.layouts.append(layout)
+        return self.type_ids[data_type]
+
+
+def encode_dictionary(reader):
+    """
+    Describe the dictionary loaded by a CCDDExportReader in the cache format.
+
+    @param reader: The CCDDExportReader instance, after loading the dictionary.
+    @return dict: The JSON-serializable description of the dictionary.
+    """
+    encoder = _TypeEncoder(reader.ctype_structure)
+
+    type_dict = {}
+    for name, value in reader.type_dict.items():
+        if not isinstance(name, str):
+            raise CacheFormatError("Type name {} cannot be cached".format(name))
+        if isinstance(value, type):
+            type_dict[name] = ["type", encoder.encode(value)]
+        elif isinstance(value, CONSTANT_TYPES):
+            type_dict[name] = ["value", value]
+        else:
+            raise CacheFormatError("Constant {} cannot be cached".format(name))
+
+    mid_map = {}
+    for mid_name, msg in reader.mid_map.items():
+        if "CC" in msg:
+            mid_map[mid_name] = {"MID": msg["MID"],
+                                 "CC": {cc_name: {"CODE": cc["CODE"], "ARG_CLASS": encoder.encode(cc["ARG_CLASS"])}
+                                        for cc_name, cc in msg["CC"].items()}}
+        else:
+            mid_map[mid_name] = {"MID": msg["MID"], "name": msg["name"],
+                                 "PARAM_CLASS": encoder.encode(msg["PARAM_CLASS"])}
+
+    for name, value in reader.enum_map.items():
+        if not isinstance(name, str) or not isinstance(value, CONSTANT_TYPES):
+            raise CacheFormatError("Enumeration {} cannot be cached".format(name))
+
+    return {"version": CCDD_CACHE_FORMAT_VERSION, "types": encoder.layouts, "type_dict": type_dict,
+            "mids": reader.mids, "mid_map": mid_map, "enum_map": reader.enum_map}
+
+
+def decode_dictionary(data, reader):
+    """
+    Recreate a cached dictionary into a CCDDExportReader.
+
+    @param data: The description of the dictionary, as returned by encode_dictionary.
+    @param reader: The CCDDExportReader instance receiving the dictionary.
+    """
+    if data.get("version") != CCDD_CACHE_FORMAT_VERSION:
+        raise CacheFormatError("Unsupported cache format version {}".format(data.get("version")))
+
+    types = []
+    for layout in data["types"]:
+        if layout[0] == "simple":
+            types.append(SIMPLE_CTYPES[layout[1]])
+        elif layout[0] == "array":
+            types.append(types[layout[1]] * layout[2])
+        elif layout[0] == "struct":
+            fields = [tuple([field[0], types[field[1]]] + field[2:]) for field in layout[2]]
+            types.append(reader.create_struct_type(layout[1], fields))
+        else:
+            raise CacheFormatError("Unknown type layout {}".format(layout[0]))
+
+    reader.type_dict = {name: types[value] if kind == "type" else value
+                        for name, (kind, value) in data["type_dict"].items()}
+    reader.mids = data["mids"]
+    reader.mid_map = {}
+    for mid_name, msg in data["mid_map"].items():
+        if "CC" in msg:
+            reader.mid_map[mid_name] = {"MID": msg["MID"],
+                                        "CC": {cc_name: {"CODE": cc["CODE"], "ARG_CLASS": types[cc["ARG_CLASS"]]}
+                                               for cc_name, cc in msg["CC"].items()}}
+        else:
+            reader.mid_map[mid_name] = {"MID": msg["MID"], "name": msg["name"],
+                                        "PARAM_CLASS": types[msg["PARAM_CLASS"]]}
+    reader.enum_map = data["enum_map"]
+
+
+class CcddCache:
+    """
+    Directory of cached CCSDS dictionaries, one file per cache key.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Constructor for CcddCache class.
+        @param cache_dir: The directory of the cache files. It is created when the first dictionary is stored.
+        """
+        self.cache_dir = cache_dir
+
+    def cache_file(self, key):
+        """
+        Return the path of the cache file of a cache key.
+        """
+        return os.path.join(self.cache_dir, "ccdd_{}.cache".format(key))
+
+    def load(self, key, reader):
+        """
+        Load a cached dictionary into a CCDDExportReader.
+        @return bool: True if the dictionary was loaded from the cache, False otherwise.
+        """
+        path = self.cache_file(key)
+        if not os.path.isfile(path):
+            return False
+        try:
+            with open(path) as file:
+                decode_dictionary(json.load(file), reader)
+        except (OSError, ValueError, KeyError, IndexError, TypeError, CacheFormatError) as exception:
+            log.warning("Ignoring invalid CCSDS dictionary cache {}: {}".format(path, exception))
+            log.debug(traceback.format_exc())
+            return False
+        log.info("Loaded CCSDS dictionary from cache {}".format(path))
+        return True
+
+    def store(self, key, reader):
+        """
+        Store the dictionary loaded by a CCDDExportReader in the cache.
+        @return bool: True if the dictionary was stored, False otherwise.
+        """
+        try:
+            data = encode_dictionary(reader)
+        except CacheFormatError as exception:
+            log.warning("CCSDS dictionary cannot be cached: {}".format(exception))
+            return False
+
+        path = self.cache_file(key)
+        temp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temporary file first, so that concurrent runs never read a partial cache file
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump(data, file)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as exception:
+            log.warning("Failed to write CCSDS dictionary cache {}: {}".format(path, exception))
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        log.debug("Stored CCSDS dictionary in cache {}".format(path))
+        return True
@@ -23,12 +23,14 @@ import os
 import fnmatch
 import json
 import ctypes
+import threading
 from pprint import pformat
 
 from lib.logger import logger as log
 from lib.exceptions import CtfTestError
 from lib.ctf_global import Global
 from plugins.ccsds_plugin.ccsds_interface import CCSDSInterface
+from plugins.ccsds_plugin.readers.ccdd_cache import CcddCache, ccdd_cache_key
 
 try:
     TLM_FORMATTER = Global.config.get("logging", "tlm_formatter", fallback=None)
@@ -38,6 +40,10 @@ except (AttributeError, ValueError) as exception:
     TLM_FORMATTER = "compact"
     PPRINT_DEPTH = 7
 
+# Dictionaries loaded by load_ccsds_dictionary, shared by all targets with the same key
+_loaded_dictionaries = {}
+_loaded_dictionaries_lock = threading.Lock()
+
 
 # Helper Functions
 def ctypes_name(name):
@@ -217,6 +223,15 @@ class CCDDExportReader(CCSDSInterface):
         else:
             log.error("No valid endianess_of_target in config")
 
+    def create_struct_type(self, name, fields):
+        """
+        Creates a structure type with the endianness of the target.
+
+        @param name: The name of the new type
+        @param fields: The list of fields of the new type
+        """
+        return create_type_class(name, self.ctype_structure, fields)
+
     @staticmethod
     def is_command_msg(json_data):
         """
@@ -588,6 +603,46 @@ class CCDDExportReader(CCSDSInterface):
             log.error("Unable to parse type definition in {}: {}".format(self.current_file_name, ex))
             raise CtfTestError("Error in process_custom_types") from ex
 
+    @staticmethod
+    def load_ccsds_json_file(filename):
+        """
+        Reads and parses the JSON of a single CCDD export file.
+
+        @param filename: The path to the file to be read
+        @return The parsed JSON data, or None if the file is not valid JSON
+        """
+        with open(filename) as file:
+            try:
+                return json.load(file)
+            except json.decoder.JSONDecodeError:
+                log.error("Invalid JSON CCDD Export File: {}. Skipping".format(file))
+                return None
+
+    def process_ccsds_json(self, filename, json_dict, second_pass=False):
+        """
+        Parses the JSON data of a single CCDD export file according to its contents.
+
+        @param filename: The path of the file the data was read from
+        @param json_dict: The JSON data of the file
+        @param second_pass: True if this is the second time parsing type macros, whose types should already be defined
+        """
+        if self.config.log_ccsds_imports:
+            log.info("Processing {}".format(filename))
+        # Determine if file is a telemetry or command message
+        try:
+            if self.is_command_msg(json_dict):
+                self.process_command(json_dict)
+            elif self.is_telemetry_msg(json_dict):
+                self.process_telemetry(json_dict)
+            elif self.is_custom_types(json_dict):
+                self.process_custom_types(json_dict)
+            elif second_pass:
+                self.process_types_second_pass(json_dict)
+            else:
+                self.process_types(json_dict)
+        except CtfTestError:
+            log.error("Failed to process json file {} ".format(filename))
+
     def process_ccsds_json_file(self, filename, file_filter=None, second_pass=False):
         """
         Reads JSON from a single file and, if it matches the filter, parses the contents
@@ -599,60 +654,28 @@ class CCDDExportReader(CCSDSInterface):
         @param file_filter: A callable that will return True if the file is to be parsed. Pass None to parse all files
         @param second_pass: True if this is the second time parsing type macros, whose types should already be defined
         """
-        with open(filename) as file:
-            try:
-                json_dict = json.load(file)
-
-                if file_filter is None or file_filter(json_dict):
-                    if self.config.log_ccsds_imports:
-                        log.info("Processing {}".format(filename))
-                    # Determine if file is a telemetry or command message
-                    try:
-                        if self.is_command_msg(json_dict):
-                            self.process_command(json_dict)
-                        elif self.is_telemetry_msg(json_dict):
-                            self.process_telemetry(json_dict)
-                        elif self.is_custom_types(json_dict):
-                            self.process_custom_types(json_dict)
-                        elif second_pass:
-                            self.process_types_second_pass(json_dict)
-                        else:
-                            self.process_types(json_dict)
-                    except CtfTestError:
-                        log.error("Failed to process json file {} ".format(filename))
-
-            except json.decoder.JSONDecodeError:
-                log.error("Invalid JSON CCDD Export File: {}. Skipping".format(file))
+        json_dict = self.load_ccsds_json_file(filename)
+        if json_dict is not None and (file_filter is None or file_filter(json_dict)):
+            self.process_ccsds_json(filename, json_dict, second_pass)
 
     def get_ccsds_messages_from_dir(self, directory):
         """
         Walks through a directory and parses CCSDS command and telemetry messages and type macros
         from the JSON, as appropriate. Creates and returns dictionaries mapping names to these constructs.
 
+        @note - If the target config sets ccsds_cache_dir, the dictionary is loaded from the cache when the files
+        are unchanged, and stored in the cache otherwise.
+
         @param directory: The path to the root directory containing CCSDS exports as .json files
         """
-        # Get list of JSON Files in the directory
-        files = []
-        for root, _, file_names in os.walk(directory):
-            for basename in file_names:
-                if fnmatch.fnmatch(basename, "*.json"):
-                    filename = os.path.join(root, basename)
-                    files.append(filename)
-
-        # Process only types & macros first, then custom types, then macros again for custom type aliases
-        files = sorted(files)
-        for file in files:
-            self.current_file_name = os.path.basename(file)
-            self.process_ccsds_json_file(file, self.is_types_macros)
-        for file in files:
-            self.current_file_name = os.path.basename(file)
-            self.process_ccsds_json_file(file, self.is_custom_types)
-        for file in files:
-            self.current_file_name = os.path.basename(file)
-            self.process_ccsds_json_file(file, self.is_command_tlm)
-        for file in files:
-            self.current_file_name = os.path.basename(file)
-            self.process_ccsds_json_file(file, self.is_types_macros, True)
+        files = list_ccsds_json_files(directory)
+        cache = CcddCache(self.config.ccsds_cache_dir) if self.config.ccsds_cache_dir else None
+        cache_key = ccdd_cache_key(directory, files, self.config) if cache else None
+        if cache is None or not cache.load(cache_key, self):
+            self.process_ccsds_json_files(files)
+            if cache is not None:
+                cache.store(cache_key, self)
+        self.build_mid_index()
 
         # Collect and convert integer values from enum_map and type_dict
         macro_map = dict(filter(lambda item: isinstance(item[1], (int, float, bool, str)), self.type_dict.items()))
@@ -660,3 +683,79 @@ class CCDDExportReader(CCSDSInterface):
             value = int(value, 0) if isinstance(value, str) else value
             macro_map[key] = value
         return self.mid_map, macro_map
+
+    def process_ccsds_json_files(self, files):
+        """
+        Reads each CCDD export file once, and processes the contents of all files in dependency order: types & macros
+        first, then custom types, then command and telemetry messages, then macros again for custom type aliases.
+
+        @param files: The list of paths of the files to be read, in processing order
+        """
+        # Read each file once, and classify its contents
+        types_macros = []
+        custom_types = []
+        command_tlm = []
+        for file in files:
+            json_dict = self.load_ccsds_json_file(file)
+            if self.is_types_macros(json_dict):
+                types_macros.append((file, json_dict))
+            elif self.is_command_tlm(json_dict):
+                command_tlm.append((file, json_dict))
+            elif self.is_custom_types(json_dict):
+                custom_types.append((file, json_dict))
+
+        for category, second_pass in ((types_macros, False), (custom_types, False), (command_tlm, False),
+                                      (types_macros, True)):
+            for file, json_dict in category:
+                self.current_file_name = os.path.basename(file)
+                self.process_ccsds_json(file, json_dict, second_pass)
+
+
+def list_ccsds_json_files(directory):
+    """
+    Find the CCDD export files in a directory and its subdirectories.
+
+    @param directory: The path to the root directory containing CCSDS exports as .json files
+    @return list: The sorted paths of the .json files
+    """
+    files = []
+    for root, _, file_names in os.walk(directory):
+        for basename in file_names:
+            if fnmatch.fnmatch(basename, "*.json"):
+                files.append(os.path.join(root, basename))
+    return sorted(files)
+
+
+def load_ccsds_dictionary(config):
+    """
+    Load the CCSDS dictionary of a target, or return the dictionary already loaded for another target with the same
+    CCSDS data directory, CCSDS target, header path and endianness.
+
+    @note - Targets sharing a dictionary share the same reader, MID map and macro map, which must not be modified.
+    The key includes the contents of the CCDD export files, so the dictionary is loaded again if they are regenerated,
+    for example by BuildCfs.
+
+    @param config: The CfsConfig of the target.
+    @return tuple: (CCDDExportReader, mid_map, macro_map)
+    """
+    data_dir = os.path.realpath(config.ccsds_data_dir)
+    key = (data_dir, ccdd_cache_key(data_dir, list_ccsds_json_files(data_dir), config))
+    with _loaded_dictionaries_lock:
+        dictionary = _loaded_dictionaries.get(key)
+        if dictionary is None:
+            reader = CCDDExportReader(config)
+            mid_map, macro_map = reader.get_ccsds_messages_from_dir(config.ccsds_data_dir)
+            dictionary = (reader, mid_map, macro_map)
+            _loaded_dictionaries[key] = dictionary
+        else:
+            log.info("Using CCSDS dictionary already loaded from {} for target {}"
+                     .format(config.ccsds_data_dir, config.name))
+    return dictionary
+
+
+def clear_ccsds_dictionaries():
+    """
+    Forget the dictionaries loaded by load_ccsds_dictionary, so that they are loaded again when next requested.
+    """
+    with _loaded_dictionaries_lock:
+        _loaded_dictionaries.clear()
@@ -0,0 +1,136 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+import ctypes
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from plugins.ccsds_plugin.readers.ccdd_cache import CcddCache, ccdd_cache_key, encode_dictionary, CacheFormatError
+from plugins.ccsds_plugin.readers.ccdd_export_reader import CCDDExportReader, _compare_ctypes
+from plugins.cfs.cfs_config import CfsConfig
+
+
+@pytest.fixture(name="ccsds_data_dir")
+def _ccsds_data_dir(tmp_path):
+    data_dir = tmp_path / "ccsds"
+    data_dir.mkdir()
+    files = {
+        "custom.json": {"data_type": "MY_CUSTOM_t",
+                        "parameters": [{"name": "Field", "data_type": "MY_INT"},
+                                       {"name": "Bits", "data_type": "uint8", "bit_length": 3},
+                                       {"name": "Name", "data_type": "char", "array_size": 8}]},
+        "tlm.json": {"tlm_mid_name": "MY_TLM_MID", "tlm_data_type": "MY_TLM_t",
+                     "tlm_parameters": [{"name": "Value", "data_type": "MY_CUSTOM_t", "array_size": 2},
+                                        {"name": "Mode", "data_type": "uint8",
+                                         "enumeration": [{"label": "MODE_ON", "value": 1}]}]},
+        "cmd.json": {"cmd_mid_name": "MY_CMD_MID",
+                     "cmd_codes": [{"cc_name": "MY_NOOP_CC", "cc_value": "0", "cc_data_type": "MY_NOOP_t",
+                                    "cc_parameters": []},
+                                   {"cc_name": "MY_SET_CC", "cc_value": "1", "cc_data_type": "MY_SET_t",
+                                    "cc_parameters": [{"name": "Value", "data_type": "MY_ALIAS_t"}]}]},
+        "types.json": [{"alias_name": "MY_INT", "actual_name": "c_uint16"},
+                       {"alias_name": "MY_ALIAS_t", "actual_name": "MY_CUSTOM_t"},
+                       {"constant_name": "MY_CONSTANT", "constant_value": "5"},
+                       {"target": "set1", "mids": [{"mid_name": "MY_TLM_MID", "mid_value": "0x0801"},
+                                                   {"mid_name": "MY_CMD_MID", "mid_value": "0x1801"}]}],
+    }
+    for name, contents in files.items():
+        with open(data_dir / name, "w") as file:
+            json.dump(contents, file)
+    return data_dir
+
+
+def create_reader(cache_dir):
+    config = CfsConfig("cfs")
+    config.ccsds_target = "set1"
+    config.ccsds_cache_dir = str(cache_dir) if cache_dir else None
+    return CCDDExportReader(config)
+
+
+def test_ccdd_cache_round_trip(ccsds_data_dir, tmp_path):
+    cache_dir = tmp_path / "cache"
+    reader = create_reader(cache_dir)
+    mid_map, macro_map = reader.get_ccsds_messages_from_dir(str(ccsds_data_dir))
+    assert len(os.listdir(cache_dir)) == 1
+
+    cached_reader = create_reader(cache_dir)
+    with patch.object(CCDDExportReader, "process_ccsds_json_files") as mock_process:
+        cached_mid_map, cached_macro_map = cached_reader.get_ccsds_messages_from_dir(str(ccsds_data_dir))
+        mock_process.assert_not_called()
+
+    assert cached_macro_map == macro_map
+    assert cached_reader.mids == reader.mids
+    assert cached_reader.enum_map == reader.enum_map
+    assert cached_mid_map["MY_TLM_MID"]["MID"] == 0x0801
+    assert cached_mid_map["MY_TLM_MID"]["name"] == "MY_TLM_t"
+    assert cached_mid_map["MY_CMD_MID"]["CC"]["MY_SET_CC"]["CODE"] == 1
+    tlm_class = cached_mid_map["MY_TLM_MID"]["PARAM_CLASS"]
+    assert _compare_ctypes(tlm_class, mid_map["MY_TLM_MID"]["PARAM_CLASS"])
+    assert ctypes.sizeof(tlm_class) == ctypes.sizeof(mid_map["MY_TLM_MID"]["PARAM_CLASS"])
+    assert issubclass(tlm_class, ctypes.LittleEndianStructure)
+    # types shared by several names remain a single type
+    assert cached_reader.type_dict["MY_ALIAS_t"] is cached_reader.type_dict["MY_CUSTOM_t"]
+    assert cached_mid_map["MY_CMD_MID"]["CC"]["MY_SET_CC"]["ARG_CLASS"] is cached_reader.type_dict["MY_SET_t"]
+
+    payload = tlm_class()
+    payload.Value[1].Bits = 5
+    payload.Value[1].Name = b"abc"
+    assert "Bits: 5" in str(payload)
+
+
+def test_ccdd_cache_key(ccsds_data_dir, tmp_path):
+    reader = create_reader(tmp_path / "cache")
+    files = sorted(str(path) for path in ccsds_data_dir.iterdir())
+    key = ccdd_cache_key(str(ccsds_data_dir), files, reader.config)
+    assert ccdd_cache_key(str(ccsds_data_dir), files, reader.config) == key
+
+    reader.config.endianess_of_target = "big"
+    assert ccdd_cache_key(str(ccsds_data_dir), files, reader.config) != key
+    reader.config.endianess_of_target = "little"
+
+    with open(ccsds_data_dir / "tlm.json", "a") as file:
+        file.write(" ")
+    assert ccdd_cache_key(str(ccsds_data_dir), files, reader.config) != key
+
+
+def test_ccdd_cache_invalid(ccsds_data_dir, tmp_path, utils):
+    cache_dir = tmp_path / "cache"
+    create_reader(cache_dir).get_ccsds_messages_from_dir(str(ccsds_data_dir))
+    cache_file = cache_dir / os.listdir(cache_dir)[0]
+    with open(cache_file, "w") as file:
+        file.write("{")
+
+    utils.clear_log()
+    reader = create_reader(cache_dir)
+    mid_map, _ = reader.get_ccsds_messages_from_dir(str(ccsds_data_dir))
+    assert utils.has_log_level("WARNING")
+    assert mid_map["MY_TLM_MID"]["MID"] == 0x0801
+    # the invalid cache file is replaced
+    with open(cache_file) as file:
+        assert json.load(file)["mid_map"]
+
+
+def test_ccdd_cache_unsupported(tmp_path, utils):
+    reader = create_reader(None)
+    reader.type_dict["MY_TUPLE"] = (1, 2)
+    with pytest.raises(CacheFormatError):
+        encode_dictionary(reader)
+
+    utils.clear_log()
+    assert not CcddCache(str(tmp_path)).store("key", reader)
+    assert utils.has_log_level("WARNING")
+    assert not CcddCache(str(tmp_path)).load("key", reader)
@@ -14,6 +14,7 @@
 
 import os
 import ctypes
+import json
 from unittest.mock import patch
 import pytest
 from importlib import reload
@@ -23,7 +24,8 @@ import plugins
 from lib.ctf_global import Global
 from lib.exceptions import CtfTestError
 from plugins.ccsds_plugin.readers.ccdd_export_reader import CCDDExportReader, ctypes_name, dynamic_init, \
-     create_type_class, to_string, _compare_field, _compare_ctypes, build_obj_from_ctype, build_str_from_ctype
+     create_type_class, to_string, _compare_field, _compare_ctypes, build_obj_from_ctype, build_str_from_ctype, \
+     load_ccsds_dictionary, clear_ccsds_dictionaries
 from plugins.cfs.cfs_config import CfsConfig
 
 
@@ -831,6 +833,70 @@ def test_ccdd_export_reader_process_ccsds_get_ccsds_messages_from_dir(ccdd_expor
     assert len(macro_map) > 0
 
 
+def test_ccdd_export_reader_get_ccsds_messages_from_dir_single_pass(ccdd_export_reader, tmp_path):
+    """
+    Test CCDDExportReader class method: get_ccsds_messages_from_dir
+    Each file is read once, and processed in dependency order regardless of the file names.
+    """
+    files = {
+        "a_tlm.json": {"tlm_mid_name": "MY_TLM_MID", "tlm_data_type": "MY_TLM_t",
+                       "tlm_parameters": [{"name": "Value", "data_type": "MY_CUSTOM_t"}]},
+        "b_custom.json": {"data_type": "MY_CUSTOM_t", "parameters": [{"name": "Field", "data_type": "MY_INT"}]},
+        "c_types.json": [{"alias_name": "MY_INT", "actual_name": "c_uint16"},
+                         {"alias_name": "MY_ALIAS_t", "actual_name": "MY_CUSTOM_t"},
+                         {"constant_name": "MY_CONSTANT", "constant_value": "5"},
+                         {"target": ccdd_export_reader.config.ccsds_target,
+                          "mids": [{"mid_name": "MY_TLM_MID", "mid_value": "0x0801"}]}],
+        "d_invalid.json": "[",
+    }
+    for name, contents in files.items():
+        with open(tmp_path / name, "w") as file:
+            file.write(contents if isinstance(contents, str) else json.dumps(contents))
+
+    with patch("plugins.ccsds_plugin.readers.ccdd_export_reader.json.load", side_effect=json.load) as mock_load:
+        mid_map, macro_map = ccdd_export_reader.get_ccsds_messages_from_dir(str(tmp_path))
+        assert mock_load.call_count == len(files)
+
+    assert mid_map["MY_TLM_MID"]["MID"] == 0x0801
+    assert macro_map["MY_CONSTANT"] == 5
+    assert ccdd_export_reader.type_dict["MY_ALIAS_t"] is ccdd_export_reader.type_dict["MY_CUSTOM_t"]
+    assert ccdd_export_reader.type_dict["MY_CUSTOM_t"]._fields_[0][1] is ctypes.c_uint16
+
+
+def test_load_ccsds_dictionary(tmp_path):
+    """
+    Test function load_ccsds_dictionary: targets with the same data directory, CCSDS target, header path,
+    endianness and export file contents share one dictionary.
+    """
+    (tmp_path / "types.json").write_text(json.dumps([{"constant_name": "MY_CONSTANT", "constant_value": "5"}]))
+    config = CfsConfig("cfs")
+    config.ccsds_data_dir = str(tmp_path)
+    other_config = CfsConfig("cfs")
+    other_config.ccsds_data_dir = str(tmp_path) + "/"
+
+    clear_ccsds_dictionaries()
+    with patch.object(CCDDExportReader, "process_ccsds_json_files", autospec=True,
+                      side_effect=CCDDExportReader.process_ccsds_json_files) as mock_load:
+        reader, mid_map, macro_map = load_ccsds_dictionary(config)
+        assert macro_map["MY_CONSTANT"] == 5
+        assert load_ccsds_dictionary(other_config) == (reader, mid_map, macro_map)
+        assert mock_load.call_count == 1
+
+        other_config.endianess_of_target = "big"
+        assert load_ccsds_dictionary(other_config)[0] is not reader
+        assert mock_load.call_count == 2
+
+        # regenerated export files are loaded again
+        (tmp_path / "types.json").write_text(json.dumps([{"constant_name": "MY_CONSTANT", "constant_value": "6"}]))
+        assert load_ccsds_dictionary(config)[2]["MY_CONSTANT"] == 6
+        assert mock_load.call_count == 3
+
+        clear_ccsds_dictionaries()
+        assert load_ccsds_dictionary(config)[0] is not reader
+        assert mock_load.call_count == 4
+    clear_ccsds_dictionaries()
+
+
 def test_ctypes_create_to_str():
     Global.config.set('logging', 'tlm_formatter', 'pprint')
     # reload module to set tlm_formatter to 'pprint'
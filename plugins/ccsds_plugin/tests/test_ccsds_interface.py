@@ -169,3 +169,25 @@ def test_cccsds_interface_add_telem_msg_with_parameter_enums(ccsdsinterface_inst
     assert ccsdsinterface_instance.enum_map['CI_OUT_DATA_MID'] == 10757
 
     assert ccsdsinterface_instance.mid_map['CI_OUT_DATA_MID']['MID'] == 10757
+
+
+def test_cccsds_interface_build_mid_index(ccsdsinterface_instance):
+    """
+    Test CCSDSInterface class build_mid_index method: Builds the reverse lookup indexes of the MID map
+    """
+    assert ccsdsinterface_instance.mid_index is None
+    command_codes = {'CI_NOOP_CC': {"CODE": 0, "ARG_CLASS": None}, 'CI_RESET_CC': {"CODE": 1, "ARG_CLASS": None}}
+    ccsdsinterface_instance.add_cmd_msg(mid_name='CI_CMD_MID', mid=0x1884, command_code_map=command_codes)
+    ccsdsinterface_instance.add_cmd_msg(mid_name='CI_ALIAS_CMD_MID', mid=0x1884, command_code_map={})
+    ccsdsinterface_instance.add_telem_msg(mid_name='CI_HK_TLM_MID', mid=0x0884, name='CI_HkTlm_t', parameters=None)
+
+    mid_index = ccsdsinterface_instance.build_mid_index()
+    assert ccsdsinterface_instance.mid_index is mid_index
+    assert mid_index.mid_map is ccsdsinterface_instance.mid_map
+    # the first entry of a MID value is indexed
+    assert mid_index.get_mid_name(0x1884) == 'CI_CMD_MID'
+    assert mid_index.get_mid_name(0x0884) == 'CI_HK_TLM_MID'
+    assert mid_index.get_mid_name(0x1885) is None
+    assert mid_index.get_cc_name(0x1884, 1) == 'CI_RESET_CC'
+    assert mid_index.get_cc_name(0x1884, 2) is None
+    assert mid_index.get_cc_name(0x0884, 0) is None
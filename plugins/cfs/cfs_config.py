@@ -21,6 +21,7 @@ cfs_config.py: CFS Plugin Config for CTF.
 
 import os
 import socket
+import tempfile
 import traceback
 from pprint import pformat
 
@@ -56,6 +57,7 @@ class CfsConfig:
         self.telemetry_header_struct_type = None
         self.command_header_struct_type = None
         self.log_ccsds_imports = None
+        self.ccsds_cache_dir = None
         self.cfs_build_dir = None
         self.cfs_build_cmd = None
         self.cfs_run_dir = None
@@ -85,7 +87,19 @@ class CfsConfig:
         self.telemetry_debug = None
         self.csv_tlm_log = None
         self.send_keepalive_msg = None
+        self.tlm_receive_thread = None
+        self.tlm_receive_queue_size = None
+        self.tlm_max_batch = None
+        self.tlm_rcvbuf_size = None
+        self.tlm_buffer_max_packets = None
+        self.tlm_buffer_max_age = None
         self.crc = None
+        self.port_lease = None
+        self.port_lease_min = None
+        self.port_lease_max = None
+        self.port_lease_dir = None
+        self.build_cache = None
+        self.build_cache_exclude = None
 
         try:
             self.configure(self.name)
@@ -254,6 +268,64 @@ class CfsConfig:
         self.send_keepalive_msg = self.load_optional_field(section_name, "send_keepalive_msg", Global.config.getboolean,
                                                            False, self.validation.validate_boolean)
 
+        self.tlm_receive_thread = self.load_optional_field(section_name, "tlm_receive_thread", Global.config.getboolean,
+                                                           False, self.validation.validate_boolean)
+
+        self.tlm_receive_queue_size = self.load_optional_field(section_name, "tlm_receive_queue_size",
+                                                               Global.config.getint, 10000,
+                                                               self.validation.validate_int)
+
+        self.tlm_max_batch = self.load_optional_field(section_name, "tlm_max_batch", Global.config.getint, 32,
+                                                      self.validation.validate_int)
+
+        self.tlm_rcvbuf_size = self.load_optional_field(section_name, "tlm_rcvbuf_size", Global.config.getint, 0,
+                                                        self.validation.validate_int)
+
+        self.tlm_buffer_max_packets = self.load_optional_field(section_name, "tlm_buffer_max_packets",
+                                                               Global.config.getint, 10000,
+                                                               self.validation.validate_int)
+
+        self.tlm_buffer_max_age = self.load_optional_field(section_name, "tlm_buffer_max_age", Global.config.getfloat,
+                                                           0.0, self.validation.validate_number)
+
+        self.tlm_log_async = self.load_optional_field(section_name, "tlm_log_async", Global.config.getboolean, False,
+                                                      self.validation.validate_boolean)
+
+        self.tlm_log_queue_size = self.load_optional_field(section_name, "tlm_log_queue_size", Global.config.getint,
+                                                           10000, self.validation.validate_int)
+
+        self.tlm_log_format = self.load_optional_field(section_name, "tlm_log_format", Global.config.get, "text")
+        if self.tlm_log_format not in ("text", "binary"):
+            log.error("Invalid Config Value at {}:tlm_log_format. Expected text or binary.".format(section_name))
+            self.validation.add_error("field tlm_log_format")
+
+        self.ccsds_cache_dir = self.load_optional_field(section_name, "ccsds_cache_dir", Global.config.get, None,
+                                                        expand_path)
+
+        self.port_lease = self.load_optional_field(section_name, "port_lease", Global.config.getboolean, False,
+                                                   self.validation.validate_boolean)
+
+        self.port_lease_min = self.load_optional_field(section_name, "port_lease_min", Global.config.getint, 20000,
+                                                       self.validation.validate_int)
+
+        self.port_lease_max = self.load_optional_field(section_name, "port_lease_max", Global.config.getint, 29999,
+                                                       self.validation.validate_int)
+        if self.port_lease and not 0 < self.port_lease_min <= self.port_lease_max < 65536:
+            log.error("Invalid Config Value at {}: port_lease_min and port_lease_max must be a valid port range."
+                      .format(section_name))
+            self.validation.add_error("field port_lease_min")
+
+        self.port_lease_dir = self.load_optional_field(section_name, "port_lease_dir", Global.config.get,
+                                                       os.path.join(tempfile.gettempdir(), "ctf_port_leases"),
+                                                       expand_path)
+
+        self.build_cache = self.load_optional_field(section_name, "build_cache", Global.config.getboolean, False,
+                                                    self.validation.validate_boolean)
+
+        build_cache_exclude = self.load_optional_field(section_name, "build_cache_exclude", Global.config.get,
+                                                       "build,.git")
+        self.build_cache_exclude = [path.strip() for path in build_cache_exclude.split(",") if path.strip()]
+
         # The following variable is set by the CCSDS Reader Implementation
         self.ccsds_header_info_included = self.load_field("ccsds", "CCSDS_header_info_included",
                                                           Global.config.getboolean, self.validation.validate_boolean)
@@ -279,6 +351,17 @@ class CfsConfig:
         self.cfs_run_args = cfs_run_args or self.cfs_run_args
         self.cfs_run_cmd = (self.cfs_exe + " " + self.cfs_run_args).strip()
 
+    def get_process_pattern(self):
+        """
+        Get the pattern (as used by pgrep -f and pkill -f) matching the command line of the cFS process of this target.
+        If the command port is passed to cFS with -p, the port is part of the pattern, so that instances of the same
+        executable started by parallel workers or concurrent CTF processes are told apart.
+        @return String: the process pattern
+        """
+        if self.cfs_port_arg:
+            return "{}.* -p {}([^0-9]|$)".format(self.cfs_run_cmd, self.cmd_udp_port)
+        return self.cfs_run_cmd
+
     def get_error_count(self):
         """
         Return field validation error counts.
@@ -19,14 +19,16 @@ cfs_plugin.py: CFS Plugin Implementation for CTF.
 - When enabled, this plugin will override the default CTF time manager,
   and utilizes the CfsTimeManager.
 - Implements the Register, Build, Start, and Shutdown cFS functionality
-  for multiple cFS targets. Implements Send Command, Check Tlm
-  (once or continuous) functionality.
+  for multiple cFS targets, optionally on all targets concurrently.
+  Implements Send Command, Check Tlm (once or continuous) functionality.
 """
 
 # ENHANCE - Potentially support multiple names for the cfs instructions.
 #               Currently it is either a single target, or all
 
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 
 from lib.ctf_global import Global, CtfVerificationStage
@@ -37,6 +39,7 @@ from lib.plugin_manager import Plugin, ArgTypes
 from plugins.cfs.cfs_config import CfsConfig, RemoteCfsConfig
 from plugins.cfs.cfs_time_manager import CfsTimeManager
 from plugins.cfs.pycfs.cfs_controllers import CfsController, RemoteCfsController
+from plugins.cfs.pycfs.port_lease import get_port_lease_registry
 
 
 def _resolve_tlm_args_values(tlm_args):
@@ -95,6 +98,12 @@ class CfsPlugin(Plugin):
         self.description = "Provide CFS command/telemetry support for CTF"
         self.targets = {}
         self.has_attempted_register = False
+        # Port lease directory of each target with leased ports
+        self.port_lease_dirs = {}
+        # Build, start and shut down targets concurrently, with at most concurrent_targets_max_workers threads
+        self.concurrent_targets = Global.config.getboolean("cfs", "concurrent_targets", fallback=False)
+        self.concurrent_targets_max_workers = Global.config.getint("cfs", "concurrent_targets_max_workers",
+                                                                   fallback=0)
 
         self.protocols = {
             "local": (CfsConfig, CfsController),
@@ -149,6 +158,19 @@ class CfsPlugin(Plugin):
             "SendCfsCommandWithRawPayload":
                 (self.send_raw_cfs_command,
                  [ArgTypes.cmd_mid, ArgTypes.cmd_code, ArgTypes.string, ArgTypes.string, ArgTypes.string]),
+            # SendCfsCommandBurst: Sends a burst of identical CFS commands with consecutive sequence counts
+            # - mid: The message ID of the command
+            # - cc: The command code for the command
+            # - args: Either an array or dictionary object containing the command arguments
+            # - count: The number of commands to send
+            # - rate: (Optional) The number of commands to send per second
+            # - gap: (Optional) The time in seconds between the start of consecutive commands
+            # - target: (Optional) A previously registered target name, or empty for all registered targets
+            # - header: (Optional) An object where the key is the header field name, and the value is the field value.
+            "SendCfsCommandBurst":
+                (self.send_cfs_command_burst,
+                 [ArgTypes.cmd_mid, ArgTypes.cmd_code, ArgTypes.cmd_arg, ArgTypes.number, ArgTypes.number,
+                  ArgTypes.number, ArgTypes.string, ArgTypes.string]),
             # CheckTlmValue: Checks that a telemetry message matching the given parameters has been received
             # - mid: The telemetry message ID to check
             # - args: an array of argument objects that describe the values to be checked
@@ -282,6 +304,8 @@ class CfsPlugin(Plugin):
 
         if config.get_error_count() > 0:
             status = False
+        elif config.port_lease and not self.lease_target_ports(config):
+            status = False
         else:
             controller = controller_type(config)
             status = controller.initialize()
@@ -289,10 +313,75 @@ class CfsPlugin(Plugin):
                 self.targets[target] = controller
             else:
                 log.error("Register for {} failed.".format(target))
+                self.release_target_ports(target)
 
         log.info("Register for {} finished with status {}.".format(target, status))
         return status
 
+    def lease_target_ports(self, config) -> bool:
+        """Leases free command and telemetry ports for a target from the port lease registry shared by CTF processes
+        on this host, and sets them in the target config. The command port is passed to cFS in the launch arguments,
+        which also identifies the cFS process of the target when it is started or shut down, and cFS is told to send
+        telemetry to the telemetry port when output is enabled."""
+        registry = get_port_lease_registry(config.port_lease_dir)
+        ports = registry.lease_ports(config.name, 2, config.port_lease_min, config.port_lease_max)
+        if ports is None:
+            log.error("Failed to lease ports for CFS target {}".format(config.name))
+            return False
+        config.cmd_udp_port, config.tlm_udp_port = ports
+        config.cfs_port_arg = True
+        self.port_lease_dirs[config.name] = config.port_lease_dir
+        log.info("Leased command port {} and telemetry port {} for CFS target {}"
+                 .format(config.cmd_udp_port, config.tlm_udp_port, config.name))
+        return True
+
+    def release_target_ports(self, target: str) -> None:
+        """Releases the ports leased for a target, if any."""
+        lease_dir = self.port_lease_dirs.pop(target, None)
+        if lease_dir is not None:
+            get_port_lease_registry(lease_dir).release_owner(target)
+
+    def run_on_targets(self, action: str, targets: list, *args) -> list:
+        """Calls a controller method on each target, returning the results in the order of the targets.
+        If concurrent_targets is set, the method runs on all targets concurrently in a thread pool, and an exception
+        raised on any target is re-raised once all targets have finished. The result and duration on each target
+        are logged."""
+        if not self.concurrent_targets or len(targets) < 2 or not isinstance(Global.time_manager, CfsTimeManager):
+            results = []
+            for controller in targets:
+                result, exception = self.run_on_target(action, controller, args)
+                if exception is not None:
+                    raise exception
+                results.append(result)
+            return results
+
+        max_workers = self.concurrent_targets_max_workers or len(targets)
+        log.info("Running {} on {} CFS targets concurrently".format(action, len(targets)))
+        with Global.time_manager.concurrent_section(), \
+                ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="CfsTarget") as executor:
+            outcomes = list(executor.map(lambda controller: self.run_on_target(action, controller, args), targets))
+
+        failed = [controller.config.name for controller, (_, exception) in zip(targets, outcomes) if exception]
+        if failed:
+            exception = next(exception for _, exception in outcomes if exception is not None)
+            raise CtfTestError("Error in {} on CFS target(s) {}".format(action, ", ".join(failed))) from exception
+        return [result for result, _ in outcomes]
+
+    @staticmethod
+    def run_on_target(action: str, controller, args: tuple) -> tuple:
+        """Calls a controller method, logging its result and duration.
+        Returns the result and None, or False and the exception raised by the method."""
+        name = controller.config.name
+        start_time = time.monotonic()
+        try:
+            result, exception = getattr(controller, action)(*args), None
+        except Exception as error:  # pylint: disable=broad-except
+            result, exception = False, error
+            log.error("{} on CFS target {} raised {}".format(action, name, repr(error)))
+        log.info("{} on CFS target {} returned {} in {:.2f}s"
+                 .format(action, name, result, time.monotonic() - start_time))
+        return result, exception
+
     def load_configured_targets(self, target: str = None) -> bool:
         """Configures targetS based on the config file. Any section starting with 'cfs_' will be interpreted
         as a target configuration. If no such sections are found, a single target named 'cfs' will be configured
@@ -342,7 +431,7 @@ class CfsPlugin(Plugin):
                 return False
 
         # Collect the results of build_cfs on each specified target, and check that all passed
-        status = [t.build_cfs() for t in self.get_cfs_targets(target)]
+        status = self.run_on_targets("build_cfs", self.get_cfs_targets(target))
         return all(status) if status else False
 
     def start_cfs(self, target: str = None, run_args: str = "") -> bool:
@@ -359,7 +448,7 @@ class CfsPlugin(Plugin):
                 return False
 
         # Collect the results of start_cfs on each specified target, and check that all passed
-        status = [t.start_cfs(run_args) for t in self.get_cfs_targets(target)]
+        status = self.run_on_targets("start_cfs", self.get_cfs_targets(target), run_args)
         return all(status) if status else False
 
     def enable_cfs_output(self, target: str = None) -> bool:
@@ -424,6 +513,29 @@ class CfsPlugin(Plugin):
 
         return all(status) if status else False
 
+    def send_cfs_command_burst(self, mid: str, cc: str, args: any, count: int, rate: float = None,
+                               gap: float = None, target: str = None, header: dict = None) -> bool:
+        """Implements the instruction SendCfsCommandBurst."""
+        # pylint: disable=invalid-name
+        log.debug("SendCfsCommandBurst - Target: {}, MID: {}, CC: {}, Args: {}, Count: {}, Rate: {}, Gap: {}"
+                  .format(target, mid, cc, json.dumps(args), count, rate, gap))
+
+        target = resolve_variable(target)
+        mid = resolve_variable(mid)
+        cc = resolve_variable(cc)
+        count = resolve_variable(count)
+        rate = resolve_variable(rate)
+        gap = resolve_variable(gap)
+
+        copied_args = deepcopy(args)
+        CfsPlugin.resolve_cmd_args_value(copied_args)
+
+        # Collect the results of send_cfs_command_burst on each specified target, and check that all passed
+        status = [t.send_cfs_command_burst(mid, cc, deepcopy(copied_args), count, rate, gap, header)
+                  for t in self.get_cfs_targets(target)]
+
+        return all(status) if status else False
+
     def check_tlm_value(self, mid: str, args: list, target: str = None, backward: float = 0) -> bool:
         """Implements the instruction CheckTlmValue."""
         if Global.current_verification_stage == CtfVerificationStage.first_ver:
@@ -556,7 +668,7 @@ class CfsPlugin(Plugin):
 
         target = resolve_variable(target)
         # Collect the results of shutdown_cfs on each specified target, and check that all passed
-        status = [t.shutdown_cfs() for t in self.get_cfs_targets(target)]
+        status = self.run_on_targets("shutdown_cfs", self.get_cfs_targets(target))
         return all(status) if status else False
 
     def archive_cfs_files(self, source_path: str, target: str = None) -> bool:
@@ -583,9 +695,10 @@ class CfsPlugin(Plugin):
         To shut down individual targets, use shutdown_cfs.
         """
         log.info("CfsPlugin.shutdown")
+        log.debug("Shutting down CFS targets: {}".format(", ".join(self.targets)))
+        self.run_on_targets("shutdown", list(self.targets.values()))
         for target in self.targets:
-            log.debug("Shutting down CFS target: {}".format(target))
-            self.targets[target].shutdown()
+            self.release_target_ports(target)
 
         # Controller resources are now freed, as they are all shut down and available for garbage collection
         self.targets.clear()
@@ -24,17 +24,35 @@ cfs_time_manager.py: CFS Time Manager for CTF.
 - The cFS time manager also invokes the continuous verification checks
   between polls to ensure each packet is verified if a continuous verification
   exists.
+
+- If core:ctf_realtime_wait is set, polls are scheduled against the monotonic
+  clock so that execution time does not drift behind wall-clock time.
+
+- The telemetry sockets of all targets are registered with one selector, so
+  each poll only reads telemetry from the targets that received data.
+
+- Within a concurrent section, such as when several targets are started at once
+  from worker threads, waits only sleep, and execution time is advanced by the
+  elapsed time when the section ends.
 """
 
+import select
+import selectors
+import socket
 import traceback
 import time
 import logging as log
+from contextlib import contextmanager
 
 from lib.ctf_global import Global
 from lib.exceptions import CtfTestError
 from lib.time_interface import TimeInterface
 from plugins.cfs.pycfs.cfs_interface import CtfConditionError
 
+# Longest time to block waiting for telemetry when a target's socket is drained by a receive thread,
+# since those packets can only be detected by checking the receive queue
+RECEIVE_THREAD_CHECK_PERIOD = 0.01
+
 
 class CfsTimeManager(TimeInterface):
     """
@@ -59,10 +77,22 @@ class CfsTimeManager(TimeInterface):
         """
         TimeInterface.__init__(self)
         self.ctf_verification_poll_period = Global.config.getfloat("core", "ctf_verification_poll_period", fallback=0.1)
-        log.info("CfsTimeManager Initialized. Verification Poll Period = {}."
-                 .format(self.ctf_verification_poll_period))
+        self.realtime_wait = Global.config.getboolean("core", "ctf_realtime_wait", fallback=False)
+        log.info("CfsTimeManager Initialized. Verification Poll Period = {}. Real-time Wait = {}."
+                 .format(self.ctf_verification_poll_period, self.realtime_wait))
         self.cfs_targets = cfs_targets
 
+        # Monotonic clock reading corresponding to exec_time == 0, used by the real-time wait mode
+        self.monotonic_origin = time.monotonic() - self.exec_time
+        self.overrun_count = 0
+
+        # Selector of the telemetry sockets of connected targets, and the socket registered for each target name
+        self.selector = selectors.DefaultSelector()
+        self.registered_sockets = {}
+
+        # Whether instructions are running on several targets concurrently (see concurrent_section)
+        self.concurrent = False
+
     @staticmethod
     def handle_test_exception_during_wait(error, msg, do_raise=False):
         """
@@ -73,6 +103,20 @@ class CfsTimeManager(TimeInterface):
         if do_raise:
             raise error
 
+    def poll(self):
+        """
+        Run pre_command() and post_command() once, raising any CtfTestError after logging it.
+        """
+        try:
+            self.pre_command()
+        except CtfTestError as exception:
+            self.handle_test_exception_during_wait(exception, "CfsTimeManager: Pre-Command Failed", True)
+
+        try:
+            self.post_command()
+        except CtfTestError as exception:
+            self.handle_test_exception_during_wait(exception, "CfsTimeManager: Post-Command Failed", True)
+
     def wait(self, seconds):
         """
         Do polling for certain seconds. Continue to do pre_command(), post_command(),
@@ -82,32 +126,225 @@ class CfsTimeManager(TimeInterface):
 
         @return None
         """
+        if self.concurrent:
+            time.sleep(seconds)
+            return
+
+        if self.realtime_wait:
+            self.wait_realtime(seconds)
+            return
+
         start_time = self.exec_time
         log.debug("CfsTimeManager wait {} seconds".format(seconds))
         while self.exec_time < start_time + seconds:
-            try:
-                self.pre_command()
-            except CtfTestError as exception:
-                self.handle_test_exception_during_wait(exception, "CfsTimeManager: Pre-Command Failed", True)
-
-            try:
-                self.post_command()
-            except CtfTestError as exception:
-                self.handle_test_exception_during_wait(exception, "CfsTimeManager: Post-Command Failed", True)
+            self.poll()
 
             time.sleep(self.ctf_verification_poll_period)
             self.exec_time += self.ctf_verification_poll_period
 
+    @contextmanager
+    def concurrent_section(self):
+        """
+        Context manager for running instructions on several targets concurrently from worker threads. Telemetry
+        cannot be polled safely while targets are connected and disconnected by other threads, so within the
+        section waits only sleep. When the section ends, exec_time is advanced by the elapsed time.
+        """
+        start_monotonic = time.monotonic()
+        self.concurrent = True
+        try:
+            yield
+        finally:
+            self.concurrent = False
+            self.exec_time += time.monotonic() - start_monotonic
+
+    def wait_realtime(self, seconds):
+        """
+        Do polling for certain seconds, scheduling each poll against the monotonic clock. Only the remainder of
+        each poll period left after pre_command() and post_command() is slept, so that time spent receiving
+        and checking telemetry is counted, and exec_time tracks the elapsed monotonic time.
+
+        @param seconds: polling duration.
+
+        @return None
+        """
+        # Account for the time spent executing instructions since the last wait
+        self.sync_exec_time()
+        start_time = self.exec_time
+        start_monotonic = time.monotonic()
+        end_deadline = start_monotonic + seconds
+        next_deadline = start_monotonic
+        log.debug("CfsTimeManager real-time wait {} seconds".format(seconds))
+        while self.exec_time < start_time + seconds:
+            self.poll()
+
+            next_deadline += self.ctf_verification_poll_period
+            now = time.monotonic()
+            if now > next_deadline:
+                self.report_overrun(now - next_deadline)
+                # Skip the periods that were missed instead of polling back-to-back to catch up
+                next_deadline = now
+            elif now < end_deadline:
+                time.sleep(min(next_deadline, end_deadline) - now)
+            self.exec_time = start_time + (time.monotonic() - start_monotonic)
+
+    def wait_for_update(self, seconds):
+        """
+        Poll telemetry for up to the given time, returning as soon as a packet is received for a MID that a
+        target was subscribed to by the current verification. If no target has subscriptions, this is equivalent
+        to wait(). Subscriptions are cleared before returning, since the verification subscribes again each time
+        it is evaluated.
+
+        @param seconds: maximum polling duration.
+
+        @return None
+        """
+        connected = [target.cfs for target in self.cfs_targets.values() if target is not None and target.cfs]
+        try:
+            if not any(cfs.subscribed_mids for cfs in connected):
+                self.wait(seconds)
+                return
+
+            if self.realtime_wait:
+                self.sync_exec_time()
+            start_time = self.exec_time
+            start_monotonic = time.monotonic()
+            log.debug("CfsTimeManager wait up to {} seconds for subscribed telemetry".format(seconds))
+            while True:
+                self.poll()
+                remaining = seconds - (time.monotonic() - start_monotonic)
+                if remaining <= 0 or any(cfs.subscription_updated for cfs in connected):
+                    break
+                self.wait_for_telemetry(connected, min(remaining, self.ctf_verification_poll_period))
+            self.exec_time = start_time + (time.monotonic() - start_monotonic)
+        finally:
+            for cfs in connected:
+                cfs.clear_subscriptions()
+
+    @staticmethod
+    def wait_for_telemetry(connected, timeout):
+        """
+        Block until telemetry may be available on any of the given interfaces, or the timeout expires.
+
+        @param connected: the CfsInterface instances to wait on.
+        @param timeout: maximum time to block, in seconds.
+
+        @return None
+        """
+        sockets = []
+        for cfs in connected:
+            if cfs.telemetry.is_receive_thread_running():
+                timeout = min(timeout, RECEIVE_THREAD_CHECK_PERIOD)
+            else:
+                sockets.append(cfs.telemetry.socket)
+        try:
+            if sockets:
+                select.select(sockets, [], [], timeout)
+                return
+        except (OSError, ValueError):
+            log.debug("Unable to wait on telemetry sockets, sleeping instead")
+        time.sleep(timeout)
+
+    def sync_exec_time(self):
+        """
+        Advance exec_time to the monotonic time elapsed since the time manager was created, if it is behind.
+        """
+        self.exec_time = max(self.exec_time, time.monotonic() - self.monotonic_origin)
+
+    def report_overrun(self, overrun):
+        """
+        Report that receiving and checking telemetry took longer than the poll period.
+
+        @param overrun: time in seconds by which the poll period was exceeded.
+        """
+        self.overrun_count += 1
+        msg = "CfsTimeManager poll overran the {}s poll period by {:.3f}s ({} overruns)" \
+            .format(self.ctf_verification_poll_period, overrun, self.overrun_count)
+        if self.overrun_count == 1:
+            log.warning(msg)
+        else:
+            log.debug(msg)
+
+    @staticmethod
+    def get_selectable_socket(cfs):
+        """
+        Get the telemetry socket of a connected target, if its telemetry can be detected by selecting the socket.
+        Sockets drained by a receive thread, and closed sockets that are re-created on the next read, are not.
+
+        @param cfs: the CfsInterface of the target.
+
+        @return socket.socket: the telemetry socket, or None.
+        """
+        if cfs.telemetry.is_receive_thread_running():
+            return None
+        tlm_socket = cfs.telemetry.socket
+        if not isinstance(tlm_socket, socket.socket) or tlm_socket.fileno() == -1:
+            return None
+        return tlm_socket
+
+    def unregister_socket(self, name):
+        """
+        Remove the telemetry socket of a target from the selector.
+        """
+        tlm_socket = self.registered_sockets.pop(name)
+        try:
+            self.selector.unregister(tlm_socket)
+        except (KeyError, ValueError):
+            pass
+
+    def select_ready_targets(self):
+        """
+        Get the names of the connected targets to read telemetry from: the targets whose telemetry socket has data,
+        and the targets whose telemetry cannot be detected by the selector. The selector registrations are updated
+        first, as targets connect and disconnect or re-create their sockets.
+
+        @return set: names of the targets to read telemetry from.
+        """
+        unselectable = set()
+        selectable = set()
+        for name, target in self.cfs_targets.items():
+            if target is None or not target.cfs:
+                continue
+            tlm_socket = self.get_selectable_socket(target.cfs)
+            if tlm_socket is None:
+                unselectable.add(name)
+                continue
+            if self.registered_sockets.get(name) is not tlm_socket:
+                if name in self.registered_sockets:
+                    self.unregister_socket(name)
+                try:
+                    self.selector.register(tlm_socket, selectors.EVENT_READ, name)
+                except (KeyError, ValueError, OSError):
+                    log.debug("Unable to select telemetry socket of target {}".format(name))
+                    unselectable.add(name)
+                    continue
+                self.registered_sockets[name] = tlm_socket
+            selectable.add(name)
+
+        for name in set(self.registered_sockets) - selectable:
+            self.unregister_socket(name)
+
+        if not self.registered_sockets:
+            return unselectable
+        return unselectable | {key.data for key, _ in self.selector.select(0)}
+
     def pre_command(self):
         """
         Read Telemetry Packets for CFS Target, and run continuous verification.
+        Telemetry is only read from targets that received data since the previous poll.
         Raise any occurring Exception
         """
         super().pre_command()
+        try:
+            ready_targets = self.select_ready_targets()
+        except Exception as exception:
+            log.error("Failed to select CFS targets with received telemetry.")
+            log.debug(traceback.format_exc())
+            raise CtfTestError('Error from select_ready_targets') from exception
         for name, target in self.cfs_targets.items():
             try:
                 if target.cfs:
-                    target.cfs.read_sb_packets()
+                    if name in ready_targets:
+                        target.cfs.read_sb_packets()
                     target.cfs.output_manager.on_time_interval()
                 else:
                     log.debug("Target {} is not connected".format(name))
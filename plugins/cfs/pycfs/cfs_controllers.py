@@ -34,13 +34,16 @@ import time
 import traceback
 from ast import literal_eval
 from pathlib import Path
+from subprocess import run
 
 from lib.exceptions import CtfParameterError, CtfTestError
 from lib.ctf_global import Global, CtfVerificationStage
 from lib.logger import logger as log
+from plugins.ccsds_plugin.ccsds_interface import MidMapIndex
 from plugins.ccsds_plugin.ccsds_packet_interface import import_ccsds_header_types
-from plugins.ccsds_plugin.readers.ccdd_export_reader import CCDDExportReader
+from plugins.ccsds_plugin.readers.ccdd_export_reader import load_ccsds_dictionary
 from plugins.cfs.pycfs.local_cfs_interface import LocalCfsInterface
+from plugins.cfs.pycfs.command_encoder import get_command_encoder
 from plugins.cfs.pycfs.command_interface import CommandInterface
 from plugins.cfs.pycfs.tlm_listener import TlmListener
 from plugins.ssh.ssh_plugin import SshController, SshConfig
@@ -123,6 +126,7 @@ class CfsController:
         self.cfs_pid = None
         self.ccsds_reader = None
         self.mid_map = None
+        self.mid_index = None
         self.macro_map = None
         self.ccsds = None
         self.first_call_flag = True
@@ -131,12 +135,13 @@ class CfsController:
     def process_ccsds_files(self):
         """
         Create mid map for CFS plugin, if map does not exist, create ccsds_reader from INIT config file.
+        @note - Targets with the same CCSDS data directory, CCSDS target and endianness share one dictionary.
         """
         result = True
         if self.mid_map is None:
             log.info("Creating MID Map from CCDD Data at {}".format(self.config.ccsds_data_dir))
-            self.ccsds_reader = CCDDExportReader(self.config)
-            self.mid_map, self.macro_map = self.ccsds_reader.get_ccsds_messages_from_dir(self.config.ccsds_data_dir)
+            self.ccsds_reader, self.mid_map, self.macro_map = load_ccsds_dictionary(self.config)
+            self.mid_index = self.ccsds_reader.mid_index
         else:
             log.debug("MID Map is already populated; skipping CCDD Data...")
 
@@ -168,7 +173,10 @@ class CfsController:
         command = CommandInterface(self.ccsds, port=self.config.cmd_udp_port, ip=self.config.cfs_target_ip,
                                    endianness=self.config.endianess_of_target, local_port=self.config.tlm_udp_port,
                                    crc=self.config.crc)
-        telemetry = TlmListener(self.config.ctf_ip, self.config.tlm_udp_port)
+        telemetry = TlmListener(self.config.ctf_ip, self.config.tlm_udp_port,
+                                receive_thread=self.config.tlm_receive_thread,
+                                receive_queue_size=self.config.tlm_receive_queue_size,
+                                max_batch=self.config.tlm_max_batch, rcvbuf_size=self.config.tlm_rcvbuf_size)
         self.cfs = LocalCfsInterface(self.config, telemetry, command, self.mid_map, self.ccsds)
         result = self.cfs.init_passed
         if not result:
@@ -329,18 +337,72 @@ class CfsController:
         arg_data = self.build_command_payload(mid_name, cc_name, args, payload_length, ctype_args)
         log.debug("Sending bytes: {}".format(arg_data))
 
-        # Resolve macros in header args - NEW
-        if header_args is not None and isinstance(header_args, dict):
-            for key, value in header_args.items():
-                value = self.resolve_macros(value)
-                if str(value).isnumeric():
-                    header_args[key] = int(value)
+        self.resolve_header_macros(header_args)
         result = self.cfs.send_command(mid, cc, arg_data, header_args)
 
         if not result:
             log.error("Failed to send command message: MID {}, CC {}, args {}".format(hex(mid), cc, args))
         return result
 
+    def send_cfs_command_burst(self, mid: str, cc: str, args: dict, count: int, rate: float=None, gap: float=None,
+                               header_args: dict=None) -> bool:
+        """
+        Implementation of CFS plugin instruction send_cfs_command_burst. The command payload is encoded once, and
+        count commands with consecutive sequence counts are sent at the given rate (commands per second) or gap
+        (seconds between commands), or back to back if neither is given or gap is 0. The rate must be positive.
+        @return True if all commands were successfully sent to the target, False otherwise
+        """
+        # pylint: disable=invalid-name
+        log.info("Sending {} CFS Commands to target: {}, {}:{} with Args: {}, Rate: {}, Gap: {}"
+                 .format(count, self.config.name, mid, cc, json.dumps(args), rate, gap))
+
+        mid_name = self.validate_mid_value(mid)
+        if mid_name is None:
+            log.error("Could not find MID {} in MID Map".format(mid))
+            return False
+        mid = self.mid_map[mid_name]['MID']
+
+        cc_name = self.validate_cc_value(self.mid_map[mid_name], cc)
+        if cc_name is None:
+            log.error("Could not find Command Code {} for MID {} in MID Map".format(cc, hex(mid)))
+            return False
+        cc = self.mid_map[mid_name]['CC'][cc_name]['CODE']
+
+        try:
+            count = int(count)
+            rate = float(rate) if rate is not None else None
+            gap = float(gap) if gap else None
+        except (TypeError, ValueError):
+            log.error("Invalid burst parameters: count {}, rate {}, gap {}".format(count, rate, gap))
+            return False
+        if count <= 0 or (rate is not None and rate <= 0) or (gap is not None and gap < 0):
+            log.error("Invalid burst parameters: count {}, rate {}, gap {}".format(count, rate, gap))
+            return False
+
+        arg_data = self.build_command_payload(mid_name, cc_name, args)
+        log.debug("Sending bytes: {}".format(arg_data))
+
+        self.resolve_header_macros(header_args)
+        result = self.cfs.send_command_burst(mid, cc, arg_data, count, rate, gap, header_args)
+
+        achieved_rate = result.sent / result.elapsed if result.elapsed > 0 else float("inf")
+        log.info("Sent {} of {} commands in {:.6f} seconds ({:.1f} commands per second)"
+                 .format(result.sent, count, result.elapsed, achieved_rate))
+        if result.failed:
+            log.error("Failed to send {} of {} command messages: MID {}, CC {}, args {}"
+                      .format(result.failed, count, hex(mid), cc, args))
+        return result.sent == count
+
+    def resolve_header_macros(self, header_args: dict):
+        """
+        Resolve macros in the values of command header args, replacing numeric values by integers.
+        """
+        if header_args is not None and isinstance(header_args, dict):
+            for key, value in header_args.items():
+                value = self.resolve_macros(value)
+                if str(value).isnumeric():
+                    header_args[key] = int(value)
+
     def build_command_payload(self, mid_name: str, cc_name: str, args: dict,
                               payload_length: int=None, ctype_args: bool=False) -> bytes:
         """
@@ -410,6 +472,10 @@ class CfsController:
         Implements the encoding of a ctypes Structure into a byte buffer.
         @return bytes: A raw byte representation of args
         """
+        encoder = get_command_encoder(type(args), type(self.ccsds_reader.ctype_structure),
+                                      self.config.endianess_of_target)
+        if encoder is not None:
+            return encoder.encode(args)
 
         # pylint: disable=protected-access
 
@@ -652,6 +718,7 @@ class CfsController:
                 return False
 
         args = self.convert_check_tlm_args(args) if args else None
+        self.cfs.subscribe(current_mid_value)
         # As .cfs.clear_received_msgs_before_verification_start in .cfs.check_tlm_value func clears stale packets,
         # there is no need to clear buffer again after the verification by setting discard_old_packets to True
         result = self.cfs.check_tlm_value(mid, args, discard_old_packets=False, backward=backward)
@@ -676,7 +743,7 @@ class CfsController:
         if mid_value not in self.cfs.received_mid_packets_dic:
             log.error("MID {} not in the cfs controller's mid dictionary.".format(mid_value))
             return False
-        self.cfs.received_mid_packets_dic[mid_value] = []
+        self.cfs.received_mid_packets_dic[mid_value].clear()
         return True
 
     def get_tlm_value(self, mid: str, tlm_variable: str, is_header: bool=False, tlm_args: list=None) -> any:
@@ -789,6 +856,8 @@ class CfsController:
             {"compare": "==", "variable": "Payload.PacketID.EventID", "value": event_id}
         ]
 
+        self.cfs.subscribe(self.cfs.evs_short_event_msg_mid)
+        self.cfs.subscribe(self.cfs.evs_long_event_msg_mid)
         result = self.cfs.check_tlm_value(self.cfs.evs_short_event_msg_mid, args, discard_old_packets=False)
         if result:
             log.info("Received EVS_ShortEventTlm_t. Ignoring 'Message' field...")
@@ -851,10 +920,11 @@ class CfsController:
                           .format(self.cfs_pid))
         else:
             log.warning("CFS pid is not known. Will attempt to kill process by name '{}'"
-                        .format(self.config.cfs_run_cmd))
+                        .format(self.config.get_process_pattern()))
 
-        # try to kill outer command (xterm, sh) run by CTF
-        if os.system('pkill -fe -9 "{}"'.format(self.config.cfs_run_cmd)) != 0:
+        # try to kill outer command (xterm, sh) run by CTF. pkill is run without a shell, whose command line would
+        # also match the pattern.
+        if run(["pkill", "-fe", "-9", self.config.get_process_pattern()], check=False).returncode != 0:
             status = False
             log.error("Failed to kill any {}. CFS may have already exited or still be running!"
                       .format(self.config.cfs_exe))
@@ -879,6 +949,14 @@ class CfsController:
         else:
             log.info("CFS was already shut down")
 
+    def get_mid_index(self) -> MidMapIndex:
+        """
+        Return the reverse lookup indexes of the MID map, rebuilding them if the MID map was replaced.
+        """
+        if self.mid_index is None or self.mid_index.mid_map is not self.mid_map:
+            self.mid_index = MidMapIndex(self.mid_map)
+        return self.mid_index
+
     def validate_mid_value(self, mid):
         """
         Implementation of helper function validate_mid_value.
@@ -899,10 +977,7 @@ class CfsController:
 
                 # mid may be provided or evaluated as a number
                 if isinstance(mid, int):
-                    for key, value in self.mid_map.items():
-                        if value.get("MID") == mid:
-                            mid = key
-                            break
+                    mid = self.get_mid_index().get_mid_name(mid) or mid
 
                 available = mid in self.mid_map
         except TypeError as exception:
@@ -936,10 +1011,11 @@ class CfsController:
                         pass
 
                 if isinstance(cc, int):
-                    for key, value in mid_dict['CC'].items():
-                        if value['CODE'] == cc:
-                            cc = key
-                            break
+                    cc_name = self.get_mid_index().get_cc_name(mid_dict.get('MID'), cc)
+                    if cc_name is None or mid_dict['CC'].get(cc_name, {}).get('CODE') != cc:
+                        # mid_dict is not the indexed entry of its MID value
+                        cc_name = next((key for key, value in mid_dict['CC'].items() if value['CODE'] == cc), None)
+                    cc = cc_name if cc_name is not None else cc
 
                 available = cc in mid_dict['CC']
         except TypeError as exception:
@@ -990,7 +1066,10 @@ class RemoteCfsController(CfsController):
             command = CommandInterface(self.ccsds, port=self.config.cmd_udp_port, ip=self.config.cfs_target_ip,
                                        endianness=self.config.endianess_of_target,
                                        local_port=self.config.tlm_udp_port, crc=self.config.crc)
-            telemetry = TlmListener(self.config.ctf_ip, self.config.tlm_udp_port)
+            telemetry = TlmListener(self.config.ctf_ip, self.config.tlm_udp_port,
+                                    receive_thread=self.config.tlm_receive_thread,
+                                    receive_queue_size=self.config.tlm_receive_queue_size,
+                                    max_batch=self.config.tlm_max_batch, rcvbuf_size=self.config.tlm_rcvbuf_size)
             self.cfs = RemoteCfsInterface(self.config, telemetry, command, self.mid_map, self.ccsds, self.execution)
             result = self.cfs.init_passed
             if not result:
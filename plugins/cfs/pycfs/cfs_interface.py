@@ -23,6 +23,8 @@ import importlib
 import os
 import re
 import socket
+import struct
+import time
 import traceback
 from collections import namedtuple
 
@@ -31,21 +33,93 @@ from lib import ctf_utility
 from lib.ctf_global import Global, CtfVerificationStage
 from lib.exceptions import CtfConditionError
 from lib.logger import logger as log
-
-OPERATION_DIC = {
-    "==": float.__eq__,
-    "!=": float.__ne__,
-    "<=": float.__le__,
-    ">=": float.__ge__,
-    "<": float.__lt__,
-    ">": float.__gt__
-}
+from plugins.ccsds_plugin.ccsds_primary_header import CcsdsPrimaryHeaderBase
+from plugins.cfs.pycfs import tlm_log_writer
+from plugins.cfs.pycfs.tlm_log_writer import LogWriter
+from plugins.cfs.pycfs.tlm_packet_store import TlmPacketStore
+from plugins.cfs.pycfs.tlm_predicate import OPERATION_DIC, TlmPredicate
+
+# Maximum number of compiled telemetry checks kept by each interface
+TLM_PREDICATE_CACHE_SIZE = 256
+# Maximum number of telemetry check cursors kept by each interface
+TLM_CHECK_CURSOR_LIMIT = 256
+
+# CCSDS primary header words: packet identification, packet sequence control and packet data length
+CCSDS_PRIMARY_HEADER = struct.Struct(">HHH")
+# Methods of CcsdsPrimaryHeaderBase whose results unpack_primary_header reproduces
+PRIMARY_HEADER_ACCESSORS = ("is_command", "get_msg_id", "get_sequence_count")
 
 # This is defining a tuple with 3 fields. mid, payload and packetCount
 Packet = namedtuple('Packet', 'mid header payload packetCount timestamp')
 TlmCondition = namedtuple('TlmCondition', 'mid args')
 
 
+class LazyPacket:
+    """
+    Received telemetry packet that keeps a view of the raw payload bytes and only builds the payload structure
+    the first time it is accessed. Provides the same fields as Packet.
+    """
+    # pylint: disable=invalid-name
+    __slots__ = ("mid", "header", "payload_class", "raw_payload", "packetCount", "timestamp", "_payload", "_decoded")
+
+    def __init__(self, mid, header, payload_class, raw_payload, packet_count, timestamp):
+        """
+        Constructor for LazyPacket class.
+        @param mid: The MID of the packet.
+        @param header: The telemetry header of the packet.
+        @param payload_class: The ctypes type of the payload.
+        @param raw_payload: A memoryview of the payload bytes in the received datagram.
+        @param packet_count: The number of packets received for this MID, including this one.
+        @param timestamp: The CTF execution time at which the packet was received.
+        """
+        self.mid = mid
+        self.header = header
+        self.payload_class = payload_class
+        self.raw_payload = raw_payload
+        self.packetCount = packet_count
+        self.timestamp = timestamp
+        self._payload = None
+        self._decoded = False
+
+    @property
+    def payload(self):
+        """
+        The payload structure, built on first access without copying the payload bytes, or None if the bytes
+        cannot be decoded as the payload type.
+        """
+        if not self._decoded:
+            self._decoded = True
+            try:
+                self._payload = self.payload_class.from_buffer(self.raw_payload)
+            except (ValueError, TypeError):
+                log.error("Cannot decode payload of packet with MID {}.".format(hex(self.mid)))
+                log.debug(traceback.format_exc())
+        return self._payload
+
+
+def unpack_primary_header(buffer):
+    """
+    Extract the fields of a CCSDS primary header from the start of a buffer, without building a header structure.
+    @return tuple: (is_command, app_id, sequence_count, length)
+    @throws struct.error if the buffer is shorter than a primary header.
+    """
+    packet_id, sequence, length = CCSDS_PRIMARY_HEADER.unpack_from(buffer)
+    return bool(packet_id & 0x1000), packet_id & 0x7FF, sequence & 0x3FFF, length
+
+
+def is_standard_primary_header(header_class):
+    """
+    Check whether a primary header class has the standard CCSDS layout and accessors, so that its fields can be
+    extracted by unpack_primary_header instead of building a header structure.
+    @return bool: True if the class is a CcsdsPrimaryHeaderBase of the standard size, which does not override the
+                  methods interpreting the header fields.
+    """
+    return isinstance(header_class, type) and issubclass(header_class, CcsdsPrimaryHeaderBase) and \
+        ctypes.sizeof(header_class) == CCSDS_PRIMARY_HEADER.size and \
+        all(getattr(header_class, name) is getattr(CcsdsPrimaryHeaderBase, name)
+            for name in PRIMARY_HEADER_ACCESSORS)
+
+
 class TelemetryVerification:
     """
     Telemetry Verification class
@@ -60,6 +134,9 @@ class TelemetryVerification:
         self.passed = False
         self.pass_count = 0
         self.fail_count = 0
+        # Number of packets appended to the buffer of the condition's MID that have been checked
+        self.checked_count = 0
+        self.predicate = None
 
 
 class CfsInterface:
@@ -107,6 +184,12 @@ class CfsInterface:
         self.mid_payload_map.update({
             val["MID"]: val["CC"] for val in mid_map.values() if "CC" in val
         })
+        # Argument types of received command packets, by MID and command code
+        self.cmd_arg_class_map = {
+            (mid, value["CODE"]): value.get("ARG_CLASS")
+            for mid, cmd_dict in self.mid_payload_map.items() if isinstance(cmd_dict, dict)
+            for value in cmd_dict.values()
+        }
 
         # This call will determine which output app to use and instantiate it
         output_app_interface = importlib.import_module('plugins.cfs.pycfs.output_app_interface')
@@ -121,16 +204,33 @@ class CfsInterface:
         self.evs_log_file = None
         self.tlm_log_file = None
         self.tlm_csv_file = None
+        self.tlm_bin_file = None
+        self.log_writer = LogWriter(self.config.tlm_log_queue_size) if self.config.tlm_log_async else None
         # This flag is used to indicate the tlm is starting to come
         # in from the CFS application being tested
         self.tlm_has_been_received = False
 
         # List of MIDs for packets that have been received since the last continuous telemetry check
-        self.unchecked_packet_mids = []
+        # MIDs with packets not yet checked by continuous verifications
+        self.unchecked_packet_mids = set()
         self.tlm_verifications_by_mid_and_vid = {}
+        self.tlm_verification_mids = {}
 
         self.cmd_packet_list = []
-        self.received_mid_packets_dic = {mid: [] for mid in self.mid_payload_map}
+
+        # MIDs the current verification is waiting on, and whether a packet for one of them has been received
+        # since the subscriptions were last cleared by the time manager
+        self.subscribed_mids = set()
+        self.subscription_updated = False
+
+        # Number of packets already rejected by a verification, keyed by MID and verification arguments, so that
+        # each poll only checks packets received since the previous poll. Limited to TLM_CHECK_CURSOR_LIMIT entries.
+        self.tlm_check_cursors = {}
+        # Compiled telemetry check arguments, keyed by the representation of the arguments
+        self.tlm_predicates = {}
+
+        self.received_mid_packets_dic = TlmPacketStore(self.mid_payload_map, self.config.tlm_buffer_max_packets,
+                                                       self.config.tlm_buffer_max_age)
 
         # These two arrays are used to ensure that the code only prints that it is receiving packets from each specific
         # mid once and not every time a packet is received
@@ -138,10 +238,22 @@ class CfsInterface:
 
         self.ccsds = ccsds
         self.pheader_offset = ctypes.sizeof(self.ccsds.CcsdsPrimaryHeader())
+        # Primary headers with the standard CCSDS layout are unpacked directly, without building a header structure
+        self.unpack_pheader = is_standard_primary_header(self.ccsds.CcsdsPrimaryHeader)
         self.should_skip_header = not self.config.ccsds_header_info_included
         self.tlm_header_offset = ctypes.sizeof(self.ccsds.CcsdsTelemetry)
         self.cmd_header_offset = ctypes.sizeof(self.ccsds.CcsdsCommand)
 
+        # Payload sizes used to validate telemetry packets without decoding them. Payload types that are not
+        # ctypes types have no known size, so their packets are decoded as soon as they are received.
+        self.payload_size_by_mid = {}
+        for val in mid_map.values():
+            if "PARAM_CLASS" in val:
+                try:
+                    self.payload_size_by_mid[val["MID"]] = ctypes.sizeof(val["PARAM_CLASS"])
+                except TypeError:
+                    self.payload_size_by_mid[val["MID"]] = None
+
     def build_cfs(self):
         """
         Abstract class method, raise NotImplementedError exception
@@ -164,7 +276,15 @@ class CfsInterface:
         self.command.cleanup()
         self.telemetry.cleanup()
 
+        # Write pending log records before closing files
+        if self.log_writer is not None:
+            self.log_writer.stop()
+
         # Close files
+        if self.tlm_bin_file is not None and not self.tlm_bin_file.closed:
+            log.debug("Closing tlm binary log file {}".format(self.tlm_bin_file.name))
+            self.tlm_bin_file.close()
+            self.tlm_bin_file = None
         if self.tlm_log_file is not None and not self.tlm_log_file.closed:
             log.debug("Closing tlm log file {}".format(self.tlm_log_file.name))
             self.tlm_log_file.close()
@@ -190,6 +310,10 @@ class CfsInterface:
                 # update build-in variable for ctf tlm folder
                 ctf_utility.set_variable("_CTF_TLM_DIR", "=", os.path.abspath(Global.current_script_log_dir), "string")
 
+            if self.tlm_bin_file is None and self.config.tlm_log_format == "binary":
+                tlm_bin_file_path = os.path.join(Global.current_script_log_dir, self.config.name + "_tlm_msgs.bin")
+                self.tlm_bin_file = open(tlm_bin_file_path, "ab")
+
             if self.tlm_csv_file is None and self.config.csv_tlm_log and self.config.telemetry_debug:
                 tlm_log_csv_path = os.path.join(Global.current_script_log_dir, self.config.name + "_tlm_msgs.csv")
                 self.tlm_csv_file = open(tlm_log_csv_path, "a+")
@@ -199,34 +323,43 @@ class CfsInterface:
             log.error("Failed to create tlm log file {}")
             log.debug(traceback.format_exc())
 
-    def write_tlm_log(self, payload, buf: bytearray, header):
+    def write_log(self, file, render, *args):
+        """
+        Write a log record to a file. The record is rendered by calling render with args, either immediately or,
+        if logs are written asynchronously, later by the log writer thread.
+        """
+        if self.log_writer is not None:
+            self.log_writer.write(file, render, *args)
+        else:
+            file.write(render(*args))
+
+    def write_tlm_log(self, payload, buf: bytearray, header, payload_class=None):
         """
         Write payload and mid to telemetry log file. if log file does not exist, create one.
+        If payload is None, it is decoded from buf with payload_class when the record is rendered.
         """
+        mid = None
         try:
             if self.tlm_log_file is None:
                 self.__create_tlm_log_file()
 
             mid = header.get_msg_id()
-            sequence_count = header.get_sequence_count()
-            timestamp_seconds = header.get_timestamp_seconds()
-            timestamp_subseconds = header.get_timestamp_subseconds()
+            record_fields = (Global.get_time_manager().exec_time, time.time(), mid, header.get_sequence_count(),
+                             header.get_timestamp_seconds(), header.get_timestamp_subseconds())
 
-            self.tlm_log_file.write("{} - {}: mid:{} seq: {} timestamp_seconds: {} timestamp_subseconds: {}\n\t{}\n".
-                                    format(Global.get_time_manager().exec_time,
-                                           datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3],
-                                           hex(mid), sequence_count, timestamp_seconds, timestamp_subseconds,
-                                           str(payload).replace("\n", "\n\t")))
+            if self.config.tlm_log_format == "binary":
+                self.write_log(self.tlm_bin_file, tlm_log_writer.pack_binary_tlm_record, *record_fields, buf)
+            else:
+                self.write_log(self.tlm_log_file, tlm_log_writer.format_tlm_record, *record_fields, payload,
+                               payload_class, buf)
 
             if self.config.telemetry_debug:
-                self.tlm_log_file.write("        For MID {} Payload length: {} hex values: 0x{}\n".format(hex(mid),
-                                                                                                          len(buf),
-                                                                                                          buf.hex()))
+                self.write_log(self.tlm_log_file, tlm_log_writer.format_tlm_debug_record, mid, buf)
                 if self.config.csv_tlm_log:
-                    self.tlm_csv_file.write("{}, {}, {}\n".format(hex(mid), len(buf), buf.hex()))
+                    self.write_log(self.tlm_csv_file, tlm_log_writer.format_csv_record, hex(mid), buf)
 
-        except (IOError, ValueError):
-            log.error("Failed to write telemetry packet received for {}".format(hex(mid)))
+        except (IOError, ValueError, struct.error):
+            log.error("Failed to write telemetry packet received for {}".format(hex(mid) if mid is not None else mid))
             log.debug(traceback.format_exc())
 
     def write_tlm_error_log(self, mid: str, description: str, buf: bytearray):
@@ -238,13 +371,12 @@ class CfsInterface:
             if self.tlm_log_file is None:
                 self.__create_tlm_log_file()
 
-            self.tlm_log_file.write("{} - {}: mid:{} \n\t{}\n".
-                                    format(Global.get_time_manager().exec_time,
-                                           datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3], mid, description))
+            self.write_log(self.tlm_log_file, tlm_log_writer.format_tlm_error_record,
+                           Global.get_time_manager().exec_time, time.time(), mid, description)
             if self.config.telemetry_debug:
-                self.tlm_log_file.write("        For MID {} buf hex values: 0x{}\n".format(mid, buf.hex()))
+                self.write_log(self.tlm_log_file, tlm_log_writer.format_tlm_error_debug_record, mid, buf)
                 if self.config.csv_tlm_log:
-                    self.tlm_csv_file.write("{}, {}, {}\n".format(mid, len(buf), buf.hex()))
+                    self.write_log(self.tlm_csv_file, tlm_log_writer.format_csv_record, mid, buf)
 
         except (IOError, ValueError):
             log.error("Failed to write telemetry packet received for {}".format(mid))
@@ -260,15 +392,10 @@ class CfsInterface:
             if self.evs_log_file is None:
                 evs_log_file_path = os.path.join(Global.current_script_log_dir, self.config.name + "_evs_msgs.log")
                 self.evs_log_file = open(evs_log_file_path, "a+")
-            self.evs_log_file.write("%s/%s/%s %s: %s\n" %
-                                    (payload.PacketID.SpacecraftID,
-                                     payload.PacketID.ProcessorID,
-                                     payload.PacketID.AppName.decode(),
-                                     payload.PacketID.EventID,
-                                     payload.Message.decode() if hasattr(payload, "Message") else ""))
-            # one option to replace .flush is print(msg, file=self.evs_log_file, flush=True)
-            # but it is not consistent with other .write functions.
-            self.evs_log_file.flush()
+            self.write_log(self.evs_log_file, tlm_log_writer.format_evs_record, payload)
+            # The log writer thread flushes the files after each batch of records
+            if self.log_writer is None:
+                self.evs_log_file.flush()
         except (UnicodeDecodeError, IOError, ValueError):
             log.error("Failed to write event packet to EVS Log file for Event Payload: {}".format(str(payload)))
             log.debug(traceback.format_exc())
@@ -284,21 +411,25 @@ class CfsInterface:
         """
         mids_read = []
         while True:
-            # Read from the socket until no more data available
+            # Read from the socket until no more data available. The packet is copied because
+            # batched reads return views into buffers that the listener reuses.
             try:
                 recvd = bytearray(self.telemetry.read_socket())
                 if len(recvd) <= 0:
                     break
                 # Pull the primary header from the received data
                 try:
-                    pheader = self.ccsds.CcsdsPrimaryHeader.from_buffer(recvd[0:self.pheader_offset])
-                except ValueError:
+                    if self.unpack_pheader:
+                        is_command = unpack_primary_header(recvd)[0]
+                    else:
+                        is_command = self.ccsds.CcsdsPrimaryHeader.from_buffer_copy(recvd).is_command()
+                except (ValueError, struct.error):
                     log.error("Cannot create CCSDS Primary Header")
                     log.debug("Invalid header bytes: {}".format(recvd.hex()))
                     continue
 
                 # If the packet is a command packet it is handled differently
-                if pheader.is_command():
+                if is_command:
                     mid = self.parse_command_packet(recvd)
                 else:
                     mid = self.parse_telemetry_packet(recvd)
@@ -317,7 +448,7 @@ class CfsInterface:
         Parse command packets from received buffer.
         """
         try:
-            header = self.ccsds.CcsdsCommand.from_buffer(buffer[0:self.cmd_header_offset])
+            header = self.ccsds.CcsdsCommand.from_buffer_copy(buffer)
             mid = header.get_msg_id()
         except ValueError:
             log.debug("Cannot retrieve command header.")
@@ -327,12 +458,8 @@ class CfsInterface:
             self.log_unknown_packet_mid(mid)
             return None
 
-        cmd_dict = self.mid_payload_map[mid]
-        cc_class = None
+        cc_class = self.cmd_arg_class_map.get((mid, header.get_function_code()))
         offset = self.cmd_header_offset if self.should_skip_header else 0
-        for value in cmd_dict.values():
-            if value["CODE"] == header.get_function_code():
-                cc_class = value["ARG_CLASS"]
 
         try:
             payload = {
@@ -351,7 +478,7 @@ class CfsInterface:
         Parse telemetry packets from received buffer.
         """
         try:
-            header = self.ccsds.CcsdsTelemetry.from_buffer(buffer[0:self.tlm_header_offset])
+            header = self.ccsds.CcsdsTelemetry.from_buffer_copy(buffer)
             mid = header.get_msg_id()
             if not header.validate(buffer):
                 log.debug("Telemetry packet is discarded as CRC check fails.")
@@ -369,18 +496,29 @@ class CfsInterface:
 
         param_class = self.mid_payload_map[mid]
         offset = self.tlm_header_offset if self.should_skip_header else 0
+        raw_payload = memoryview(buffer)[offset:]
+        payload_size = self.payload_size_by_mid.get(mid)
         try:
-            payload = param_class.from_buffer(buffer[offset:])
+            if payload_size is None:
+                param_class.from_buffer(raw_payload)
+            elif len(raw_payload) < payload_size:
+                raise ValueError("Buffer size too small ({} instead of at least {} bytes)"
+                                 .format(len(raw_payload), payload_size))
         except ValueError:
             self.log_invalid_packet(mid)
             self.write_tlm_error_log(hex(mid), 'Could not build payload, check ccdd json definition files', buffer)
             return None
 
-        self.write_tlm_log(payload, buffer[offset:], header)
-        self.on_packet_received(mid, header, payload)
+        # The payload is only decoded when the packet is logged or checked
+        packet = self.on_packet_received(mid, header, param_class, raw_payload)
+        if self.log_writer is None and self.config.tlm_log_format == "text":
+            self.write_tlm_log(packet.payload, raw_payload, header)
+        else:
+            # The log writer thread or the binary log reader decode their own copy of the payload
+            self.write_tlm_log(None, raw_payload, header, param_class)
         if mid in [self.evs_long_event_msg_mid, self.evs_short_event_msg_mid]:
             # Write this packet to the CFS EVS Log File
-            self.write_evs_log(payload)
+            self.write_evs_log(packet.payload)
         return mid
 
     def log_unknown_packet_mid(self, mid):
@@ -404,30 +542,53 @@ class CfsInterface:
             self.has_received_mid[mid] = True
             log.debug(traceback.format_exc())
 
-    def on_packet_received(self, mid: int, header: any, payload: any) -> None:
+    def on_packet_received(self, mid: int, header: any, payload: any, raw_payload: memoryview = None) -> any:
         """
         If this is the first time receiving a packet with the given mid then print the value of the mid.
+        If raw_payload is given, payload is the payload type and the stored packet decodes raw_payload on demand.
+        @return The stored packet
         """
         exec_time = Global.get_time_manager().exec_time
         if not self.has_received_mid[mid]:
+            type_name = payload.__name__ if raw_payload is not None else type(payload).__name__
             log.info("Target:{} receiving first packet for Data Type: {} with MID: {} at time: {}"
-                     .format(self.config.name, type(payload).__name__, hex(mid), exec_time))
+                     .format(self.config.name, type_name, hex(mid), exec_time))
 
             # Update the array so that the message is not printed again
             self.has_received_mid[mid] = True
 
-        payload_count = len(self.received_mid_packets_dic[mid]) + 1
+        payload_count = self.received_mid_packets_dic[mid].appended_count + 1
         # Add the received packet to the dictionary under the correct mid
-        packet = Packet(mid, header, payload, payload_count, exec_time)
+        if raw_payload is not None:
+            packet = LazyPacket(mid, header, payload, raw_payload, payload_count, exec_time)
+        else:
+            packet = Packet(mid, header, payload, payload_count, exec_time)
         self.received_mid_packets_dic[mid].append(packet)
         self.tlm_has_been_received = True
-        self.unchecked_packet_mids.append(mid)
+        if mid in self.subscribed_mids:
+            self.subscription_updated = True
+        self.unchecked_packet_mids.add(mid)
+        return packet
+
+    def subscribe(self, mid):
+        """
+        Register interest of the current verification in packets with the given MID, so that the time manager can
+        end its wait as soon as one is received.
+        """
+        self.subscribed_mids.add(mid)
+
+    def clear_subscriptions(self):
+        """
+        Remove all MID subscriptions.
+        """
+        self.subscribed_mids.clear()
+        self.subscription_updated = False
 
     def add_tlm_condition(self, v_id, mid, args):
         """
         Add verification condition (with ID) to telemetry verification dictionary and do verification based on id
         """
-        if [v_ids for v_ids in self.tlm_verifications_by_mid_and_vid.values() if v_id in v_ids]:
+        if v_id in self.tlm_verification_mids:
             log.error("Condition with id {} is already registered! Check your test instructions".format(v_id))
             return False
 
@@ -435,15 +596,20 @@ class CfsInterface:
         if mid_val not in self.tlm_verifications_by_mid_and_vid:
             self.tlm_verifications_by_mid_and_vid[mid_val] = {}
 
-        self.tlm_verifications_by_mid_and_vid[mid_val][v_id] = \
-            TelemetryVerification(v_id, TlmCondition(mid, args))
+        verification = TelemetryVerification(v_id, TlmCondition(mid, args))
+        # Only packets received after the condition is added are checked
+        packets = self.received_mid_packets_dic.get(mid_val)
+        verification.checked_count = packets.appended_count if packets is not None else 0
+        self.tlm_verifications_by_mid_and_vid[mid_val][v_id] = verification
+        self.tlm_verification_mids[v_id] = mid_val
         return True
 
     def remove_tlm_condition(self, v_id):
         """
         Remove verification condition (with ID) from telemetry verification dictionary.
         """
-        verification = next((ids[v_id] for ids in self.tlm_verifications_by_mid_and_vid.values() if v_id in ids), None)
+        mid_val = self.tlm_verification_mids.get(v_id)
+        verification = self.tlm_verifications_by_mid_and_vid[mid_val].get(v_id) if mid_val is not None else None
         if not verification:
             if self.config.remove_continuous_on_fail:
                 log.error(
@@ -456,30 +622,50 @@ class CfsInterface:
         log.info("Number times Passed:                {}".format(verification.pass_count))
         log.info("Number times Failed:                {}".format(verification.fail_count))
 
-        self.tlm_verifications_by_mid_and_vid[verification.condition.mid['MID']].pop(v_id)
+        self.tlm_verifications_by_mid_and_vid[mid_val].pop(v_id)
+        self.tlm_verification_mids.pop(v_id)
         return True
 
     def check_tlm_conditions(self):
         """
-        Check all unchecked telemetry message by mid and vid.
+        Check each telemetry packet received since the last check against the continuous verifications of its MID.
         If verification fails, raise CtfConditionError exception.
         """
-        for mid in self.unchecked_packet_mids:
-            if mid in self.tlm_verifications_by_mid_and_vid:
-                for v_id, verification in self.tlm_verifications_by_mid_and_vid[mid].items():
-                    # If there is only one packet for this MID it will be the placeholder
-                    if len(self.received_mid_packets_dic[mid]) == 1:
-                        continue
-
-                    if not self.check_tlm_value(*verification.condition,
-                                                discard_old_packets=False):
-                        if self.config.remove_continuous_on_fail:
-                            self.remove_tlm_condition(v_id)
-                        verification.fail_count += 1
-                        raise CtfConditionError("Continuous Telemetry Check {} Failed.".format(v_id), verification)
-                    verification.passed = True
-                    verification.pass_count += 1
-        self.unchecked_packet_mids.clear()
+        for mid in list(self.unchecked_packet_mids):
+            verifications = self.tlm_verifications_by_mid_and_vid.get(mid)
+            if verifications:
+                packets = self.received_mid_packets_dic[mid]
+                for verification in list(verifications.values()):
+                    self.check_tlm_condition(verification, packets)
+            # A MID stays unchecked if a verification fails, so that its remaining packets are checked next time
+            self.unchecked_packet_mids.discard(mid)
+
+    def check_tlm_condition(self, verification, packets):
+        """
+        Check the packets received since the last check of a continuous verification, in the order they were
+        received. If a packet fails the verification, raise CtfConditionError exception.
+        """
+        mid, args = verification.condition
+        if args and verification.predicate is None:
+            verification.predicate = self.compile_tlm_args(args)
+
+        unchecked_packets = packets.appended_after(verification.checked_count)
+        first_count = packets.appended_count - len(unchecked_packets)
+        for i, packet in enumerate(unchecked_packets):
+            verification.checked_count = first_count + i + 1
+            payload = packet.payload
+            if payload is None:
+                log.error("Failed to extract packet from received MID: {}. Continuing...".format(hex(mid["MID"])))
+                continue
+
+            if args and not verification.predicate.check(payload):
+                if self.config.remove_continuous_on_fail:
+                    self.remove_tlm_condition(verification.verification_id)
+                verification.fail_count += 1
+                raise CtfConditionError("Continuous Telemetry Check {} Failed.".format(verification.verification_id),
+                                        verification)
+            verification.passed = True
+            verification.pass_count += 1
 
     def send_command(self, msg_id, function_code, data, header_args=None):
         """
@@ -488,6 +674,12 @@ class CfsInterface:
         sent_bytes = self.command.send_command(msg_id, function_code, data, header_args)
         return sent_bytes
 
+    def send_command_burst(self, msg_id, function_code, data, count, rate=None, gap=None, header_args=None):
+        """
+        Send a burst of identical commands to CFS instance through command interface.
+        """
+        return self.command.send_command_burst(msg_id, function_code, data, count, rate, gap, header_args)
+
     @staticmethod
     def check_strings(actual, expected, equal):
         """
@@ -606,17 +798,15 @@ class CfsInterface:
         log.debug(
             "Clearing received packets for MID: {} before time = {} exec_time={} "
             .format(hex(mid), start_time, Global.time_manager.exec_time))
-        self.received_mid_packets_dic[mid] = [
-            self.received_mid_packets_dic[mid][index]
-            for index, i in enumerate(self.received_mid_packets_dic[mid])
-            if i.timestamp >= start_time
-        ]
+        self.received_mid_packets_dic[mid].discard_before(start_time)
         return
 
-    def check_tlm_value(self, mid, args=None, discard_old_packets=True, backward=0.0):
+    def check_tlm_value(self, mid, args=None, discard_old_packets=True, backward=0.0, use_cursor=True):
         """
          Given a mid and a arguments, iterate over all received packets since the start of the verification.
          Validate each packet until a success is seen, or there are no more packets to check.
+         When use_cursor is set, packets that failed the same check in a previous poll of the verification are not
+         checked again.
         """
         # Flag indicating result of current CheckTlmValue
         check_tlm_result = True
@@ -630,8 +820,10 @@ class CfsInterface:
             log.error("Unknown MID value {}".format(mid))
             check_tlm_result = False
 
+        cursor_key = (mid, repr(args))
         if Global.current_verification_stage == CtfVerificationStage.first_ver:
             self.clear_received_msgs_before_verification_start(mid, backward)
+            self.tlm_check_cursors.pop(cursor_key, None)
 
         if check_tlm_result and len(self.received_mid_packets_dic[mid]) == 0:
             log.debug("No messages received between polling to check. MID = {}".format(hex(mid)))
@@ -642,11 +834,20 @@ class CfsInterface:
         if not check_tlm_result:
             return check_tlm_result
 
+        packets = self.received_mid_packets_dic[mid]
+        predicate = self.compile_tlm_args(args, cursor_key[1]) if args else None
+        checked_count = self.tlm_check_cursors.get(cursor_key, 0) if use_cursor else 0
+        if checked_count > packets.appended_count:
+            checked_count = 0
+        unchecked_packets = packets.appended_after(checked_count)
+        check_tlm_result = bool(unchecked_packets)
+
         # Traverse packets backwards validating each packet for the selected MID
-        log.debug("Check tlmvalue for MID {} in {} messages".format(hex(mid), len(self.received_mid_packets_dic[mid])))
-        for i in range(len(self.received_mid_packets_dic[mid]) - 1, -1, -1):
+        log.debug("Check tlmvalue for MID {} in {} of {} messages".format(hex(mid), len(unchecked_packets),
+                                                                          len(packets)))
+        for packet in reversed(unchecked_packets):
             # Get current packet for the selected MID
-            payload = self.received_mid_packets_dic[mid][i].payload
+            payload = packet.payload
 
             # Check that a payload exists, otherwise proceed to the next packet
             if payload is None:
@@ -654,12 +855,22 @@ class CfsInterface:
                 continue
             # Check the current packet against provided args, if any. If successful,
             # the check_tlm_value will pass and discard packets if needed.
-            check_tlm_result = (not args) or self.check_tlm_packet(payload, args)
+            check_tlm_result = (not args) or self.check_tlm_packet(payload, predicate)
             if check_tlm_result:
                 break
 
+        if use_cursor:
+            if check_tlm_result:
+                self.tlm_check_cursors.pop(cursor_key, None)
+            else:
+                if cursor_key not in self.tlm_check_cursors and \
+                        len(self.tlm_check_cursors) >= TLM_CHECK_CURSOR_LIMIT:
+                    # Checks whose cursors are dropped check every packet again on their next poll
+                    self.tlm_check_cursors.clear()
+                self.tlm_check_cursors[cursor_key] = packets.appended_count
+
         if discard_old_packets:
-            self.received_mid_packets_dic[mid] = []
+            self.received_mid_packets_dic[mid].clear()
         return check_tlm_result
 
     def get_tlm_value(self, mid: dict, tlm_variable: str, is_header: bool=False, tlm_args: list=None):
@@ -681,6 +892,7 @@ class CfsInterface:
             log.error("No messages received for MID = {}".format(hex(mid)))
             return None
 
+        predicate = self.compile_tlm_args(tlm_args) if tlm_args else None
         # Traverse packets backwards validating each packet for the selected MID
         log.debug("There are {} packets with mid {}".format(len(self.received_mid_packets_dic[mid]), hex(mid)))
         for i in range(len(self.received_mid_packets_dic[mid]) - 1, -1, -1):
@@ -692,7 +904,7 @@ class CfsInterface:
             if data is None:
                 log.error("Failed to extract packet from received MID: {}. Continuing...".format(hex(mid)))
                 continue
-            if tlm_args and not self.check_tlm_packet(packet.payload, tlm_args, False):
+            if tlm_args and not self.check_tlm_packet(packet.payload, predicate, False):
                 log.debug("Packet {} does not match provided args. Continuing...".format(i))
                 continue
             latest_tlm_value = ctf_utility.rgetattr(data, tlm_variable, None)
@@ -728,97 +940,28 @@ class CfsInterface:
                 result.append(self.check_value(variable, expected_value, compare, None, None))
         return any(result)
 
-    def check_tlm_packet(self, payload, args, log_result=True):
+    def compile_tlm_args(self, args, key=None):
         """
-        Check telemetry message's value based on argument payload and args
-        """
-        packet_passed = True
-        # Compare the current packet to the expected packet using each variable in args.
-        for arg in args:
-            expected_value = arg.get("value")
-            if isinstance(expected_value, list):
-                expected_value = expected_value[0]
-            variable = arg.get("variable")
-            mask = arg.get("mask")
-            mask_value = arg.get("maskValue")
-            tol = arg.get("tolerance")
-            tol_plus = arg.get("tolerance_plus")
-            tol_minus = arg.get("tolerance_minus")
-
-            if expected_value is None:
-                # If there is no expected value provided, check_tlm_value will fail before
-                # checking packets since there is no value to compare to.
-                if Global.current_verification_stage == CtfVerificationStage.first_ver:
-                    log.error("No expected 'value' provided in arg: {}. with payload {}".format(arg, payload))
-                packet_passed = False
-
-            if variable is None:
-                # If there is no variable provided, check_tlm_value will fail before
-                # checking packets since there is no value to compare to.
-                if Global.current_verification_stage == CtfVerificationStage.first_ver:
-                    log.error("No variable provided in arg: {}".format(arg))
-                packet_passed = False
-
-            if not packet_passed:
-                return packet_passed
-
-            if tol is not None:
-                tol_plus = tol
-                tol_minus = tol
-            if tol_plus is None:
-                tol_plus = 0
-            if tol_minus is None:
-                tol_minus = 0
-            try:
-                actual = ctf_utility.rgetattr(payload, variable)
-            except (AttributeError, ValueError) as exception:
-                log.error("Failed to evaluate variable payload.{}: {}".format(variable, exception))
-                log.debug(traceback.format_exc())
-                packet_passed = False
-                break
-
-            if isinstance(actual, bytes):
-                log.debug("Bytes object {} is decoded to {}".format(actual, actual.decode()))
-                actual = actual.decode()
-
-            # if the actual is an array type, loop through to compare with the expected_value and return the result
-            # Note (ctypes.c_char*N) is not ctypes.Array
-            if isinstance(actual, ctypes.Array):
-                # does not allow tolerance compare
-                tol_plus = None
-                tol_minus = None
-                array_cmp_result = self.check_array_value(actual, expected_value, arg["compare"])
-                arg_result = array_cmp_result
-
-            else:  # the actual is a simple type
-                initial_result = self.check_value(actual, expected_value, arg["compare"], mask, mask_value)
-                arg_result = initial_result
-
-                if tol_plus:
-                    tol_plus_value = expected_value + tol_plus
-                    tol_plus_result = self.check_value(actual, tol_plus_value, "<=", mask, mask_value)
-                    tol_plus_result &= self.check_value(actual, expected_value, ">=", mask, mask_value)
-                    arg_result |= tol_plus_result
-
-                if tol_minus:
-                    tol_minus_value = expected_value - tol_minus
-                    tol_minus_result = self.check_value(actual, tol_minus_value, ">=", mask, mask_value)
-                    tol_minus_result &= self.check_value(actual, expected_value, "<=", mask, mask_value)
-                    arg_result |= tol_minus_result
-
-            if log_result:
-                if not arg_result:
-                    log.debug(
-                        "FAILED Intermediate Check - {}: Actual: {}, Expected: {}, Comparison: {}, Tol: +{}, -{}"
-                        .format(variable, actual, expected_value, arg["compare"], tol_plus, tol_minus))
-                else:
-                    log.debug(
-                        "PASSED Intermediate Check - {}: Actual: {}, Expected: {}, Comparison: {}, Tol: +{}, -{}"
-                        .format(variable, actual, expected_value, arg["compare"], tol_plus, tol_minus))
-
-            packet_passed = packet_passed and arg_result
+        Return the TlmPredicate for the given telemetry check arguments, compiling them on first use.
+        @param args: The list of argument dictionaries of the telemetry check.
+        @param key: The representation of args, if already computed (Optional).
+        """
+        key = repr(args) if key is None else key
+        predicate = self.tlm_predicates.get(key)
+        if predicate is None:
+            if len(self.tlm_predicates) >= TLM_PREDICATE_CACHE_SIZE:
+                self.tlm_predicates.clear()
+            predicate = TlmPredicate(args, self)
+            self.tlm_predicates[key] = predicate
+        return predicate
 
-        return packet_passed
+    def check_tlm_packet(self, payload, args, log_result=True):
+        """
+        Check telemetry message's value based on argument payload and args.
+        The args may be a list of argument dictionaries, or a TlmPredicate compiled from them.
+        """
+        predicate = args if isinstance(args, TlmPredicate) else self.compile_tlm_args(args)
+        return predicate.check(payload, log_result)
 
     def enable_output(self):
         """
@@ -0,0 +1,226 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+"""
+@namespace plugins.cfs.pycfs.command_encoder
+command_encoder.py: Command payload encoders compiled from the layout of command argument types.
+
+The layout of a command argument type is flattened once into a struct.Struct format covering every value field, and
+a list of bitfield masks. Encoding a payload then reads each field value and packs them in a single call, producing
+the same bytes as the field walk of CfsController.encode_ctypes_to_bytes: values in the byte order of their ctypes
+type, and bitfields packed from the most significant bit in the byte order of the target.
+"""
+
+import ctypes
+import operator
+import struct
+
+# Attribute of an argument class holding its compiled encoder
+ENCODER_ATTRIBUTE = "_ctf_command_encoder_"
+
+# struct format characters for each size of signed integer
+INTEGER_FORMATS = {1: "b", 2: "h", 4: "i", 8: "q"}
+
+
+class UnsupportedLayoutError(Exception):
+    """
+    Raised when a command argument type cannot be compiled into an encoder.
+    """
+
+
+def value_format(ctype):
+    """
+    Return the struct format of a simple ctypes type, as a tuple of its byte order character ('<' or '>', or None
+    for single byte types) and its format character.
+    """
+    # pylint: disable=protected-access
+    code = getattr(ctype, "_type_", None)
+    if not isinstance(code, str):
+        raise UnsupportedLayoutError("Unsupported field type {}".format(ctype))
+    size = ctypes.sizeof(ctype)
+    if code in "bBhHiIlLqQ" and size in INTEGER_FORMATS:
+        fmt = INTEGER_FORMATS[size] if code.islower() else INTEGER_FORMATS[size].upper()
+    elif code in "fd?c":
+        fmt = code
+    else:
+        raise UnsupportedLayoutError("Unsupported field type {}".format(ctype))
+    if size == 1:
+        return None, fmt
+
+    # Structures of the other byte order than the host replace their field types by swapped types,
+    # so the byte order is found from the bytes ctypes produces for the type.
+    encoded = bytes(ctype(1))
+    for byte_order in "<>":
+        if encoded == struct.pack(byte_order + fmt, 1):
+            return byte_order, fmt
+    raise UnsupportedLayoutError("Unsupported byte order of field type {}".format(ctype))
+
+
+def compile_getter(path):
+    """
+    Return a function reading the value at path (a tuple of attribute names and indices) from a ctypes object.
+    """
+    if all(isinstance(step, str) for step in path):
+        return operator.attrgetter(".".join(path))
+
+    def get_value(obj):
+        for step in path:
+            obj = obj[step] if isinstance(step, int) else getattr(obj, step)
+        return obj
+
+    return get_value
+
+
+class CommandEncoder:
+    """
+    Encoder of the payloads of one command argument type.
+    """
+
+    def __init__(self, arg_class, structure_meta, endianness):
+        """
+        Constructor for CommandEncoder class. Compiles the layout of arg_class.
+        @param arg_class: The ctypes structure type of the command arguments.
+        @param structure_meta: The metaclass of the structure types of the target, identifying nested structures.
+        @param endianness: The byte order of the target, 'little' or 'big', used to pack bitfields.
+        @throws UnsupportedLayoutError if the layout cannot be compiled.
+        """
+        self.arg_class = arg_class
+        self.structure_meta = structure_meta
+        self.endianness = endianness
+        self.size = ctypes.sizeof(arg_class)
+        # (offset, size, byte order, format, getter, is_array) of each value field, in layout order
+        self.values = []
+        # (getter, start byte, stop byte, lsb position, mask) of each bitfield
+        self.bitfields = []
+
+        # pylint: disable=protected-access
+        self._compile_fields(arg_class._fields_, (), 0, 0)
+        self._build_struct()
+
+    def _compile_fields(self, fields, path, byte_offset, bit_offset):
+        """
+        Compile the fields of a structure, following the offsets of CfsController.encode_ctypes_to_bytes.
+        """
+        for field in fields:
+            byte_offset, bit_offset = self._compile_field(field, path, byte_offset, bit_offset)
+        return byte_offset, bit_offset
+
+    def _compile_field(self, field, path, byte_offset, bit_offset):
+        # pylint: disable=protected-access
+        field_name, field_type = field[0], field[1]
+        bit_width = field[2] if len(field) > 2 else None
+        field_path = path + (field_name,)
+        field_length = ctypes.sizeof(field_type)
+
+        if isinstance(field_type, self.structure_meta):
+            byte_offset, _ = self._compile_fields(field_type._fields_, field_path, byte_offset, bit_offset)
+            return byte_offset, 0
+
+        if hasattr(field_type, "_length_") and not hasattr(field_type._type_, "_type_"):
+            # Array of structures: each element is compiled as a field of the element type
+            for index in range(int(field_type._length_)):
+                byte_offset, _ = self._compile_field((index, field_type._type_), field_path, byte_offset, 0)
+            return byte_offset, 0
+
+        element_type = getattr(field_type, "_type_", None)
+        if element_type is None:
+            raise UnsupportedLayoutError("Unsupported field type {}".format(field_type))
+        getter = compile_getter(field_path)
+        if isinstance(element_type, type(ctypes.c_char)):
+            # Array of simple values
+            count = field_length // ctypes.sizeof(element_type)
+            if element_type is ctypes.c_char:
+                self.values.append((byte_offset, field_length, None, "{}s".format(count), getter, False))
+            else:
+                byte_order, fmt = value_format(element_type)
+                self.values.append((byte_offset, field_length, byte_order, fmt * count, getter, True))
+            return byte_offset + field_length, 0
+
+        if bit_width:
+            stop_bit = (field_length * 8) - bit_offset - bit_width
+            mask = ((1 << bit_width) - 1) << stop_bit
+            self.bitfields.append((getter, byte_offset, byte_offset + field_length, stop_bit, mask))
+            bit_offset += bit_width
+            if bit_offset >= field_length * 8:
+                return byte_offset + field_length, 0
+            return byte_offset, bit_offset
+
+        byte_order, fmt = value_format(field_type)
+        self.values.append((byte_offset, field_length, byte_order, fmt, getter, False))
+        return byte_offset + field_length, 0
+
+    def _build_struct(self):
+        """
+        Build the struct.Struct packing all value fields, with padding for bitfields and gaps.
+        """
+        # All multi-byte values are packed by a single struct.Struct, so they must share one byte order
+        byte_orders = {byte_order for _, _, byte_order, _, _, _ in self.values if byte_order is not None}
+        if len(byte_orders) > 1:
+            raise UnsupportedLayoutError("Mixed byte orders in {}".format(self.arg_class.__name__))
+        value_format_str = byte_orders.pop() if byte_orders else "<"
+        position = 0
+        for offset, size, _, fmt, _, _ in self.values:
+            if offset < position:
+                raise UnsupportedLayoutError("Overlapping fields in {}".format(self.arg_class.__name__))
+            if offset > position:
+                value_format_str += "{}x".format(offset - position)
+            value_format_str += fmt
+            position = offset + size
+        if position > self.size:
+            raise UnsupportedLayoutError("Fields exceed the size of {}".format(self.arg_class.__name__))
+        # Values are written first, then bitfields are OR-ed in, so bitfields may not share bytes with values
+        for _, start_byte, stop_byte, _, _ in self.bitfields:
+            for offset, size, _, _, _, _ in self.values:
+                if start_byte < offset + size and offset < stop_byte:
+                    raise UnsupportedLayoutError("Bitfield overlaps a field in {}".format(self.arg_class.__name__))
+        self.struct = struct.Struct(value_format_str)
+        self.value_getters = [(getter, is_array) for _, _, _, _, getter, is_array in self.values]
+
+    def encode(self, args):
+        """
+        Encode a command argument structure.
+        @param args: An instance of the argument class.
+        @return bytes: The payload bytes.
+        """
+        buf = bytearray(self.size)
+        values = []
+        for getter, is_array in self.value_getters:
+            if is_array:
+                values.extend(getter(args))
+            else:
+                values.append(getter(args))
+        self.struct.pack_into(buf, 0, *values)
+
+        endianness = self.endianness
+        for getter, start_byte, stop_byte, stop_bit, mask in self.bitfields:
+            bitfield_value = int.from_bytes(buf[start_byte:stop_byte], endianness)
+            bitfield_value |= (getter(args) << stop_bit) & mask
+            buf[start_byte:stop_byte] = bitfield_value.to_bytes(stop_byte - start_byte, endianness)
+        return bytes(buf)
+
+
+def get_command_encoder(arg_class, structure_meta, endianness):
+    """
+    Return the encoder of a command argument type, compiling it on first use and caching it on the type.
+    @return CommandEncoder: The encoder, or None if the layout of the type cannot be compiled.
+    """
+    cached = arg_class.__dict__.get(ENCODER_ATTRIBUTE)
+    if cached is not None and cached[0] == (structure_meta, endianness):
+        return cached[1]
+    try:
+        encoder = CommandEncoder(arg_class, structure_meta, endianness)
+    except UnsupportedLayoutError:
+        encoder = None
+    setattr(arg_class, ENCODER_ATTRIBUTE, ((structure_meta, endianness), encoder))
+    return encoder
@@ -17,12 +17,21 @@ command_interface.py: Handles sending commands to a cFS target.
 
 - Receives command structure from the cFS interface and sends it over UDP
   to cFS per the configured command port.
+- Sends bursts of pre-encoded commands, paced at a given rate or inter-packet gap.
 """
 
 import socket
+import time
 import logging as log
+from collections import namedtuple
 from lib.ctf_utility import set_nested_attr, resolve_variable
 
+# Number of values of the 14-bit CCSDS sequence count
+SEQUENCE_COUNT_MODULO = 1 << 14
+
+# Result of a command burst: the number of commands sent and failed, and the elapsed time in seconds
+BurstResult = namedtuple("BurstResult", ["sent", "failed", "elapsed"])
+
 
 class CommandInterface:
     """
@@ -44,6 +53,8 @@ class CommandInterface:
         self.endianness = 1 if endianness == "big" else 0
         self.debug = False
         self.crc = crc
+        # Sequence count of the next command sent in a burst
+        self.sequence_count = 0
 
     def init_socket(self):
         """
@@ -64,18 +75,18 @@ class CommandInterface:
         self.command_socket.close()
         log.info("Closing command_interface udp socket")
 
-    def build_command(self, msg_id, function_code, data, header_args=None):
+    def build_command(self, msg_id, function_code, data, header_args=None, sequence_count=0):
         """
         This method constructs a CCSDS command packet.
         @param msg_id: The message ID of the command to send.
         @param function_code: The app specific function/command code (CC).
         @param data: A bytearray representing the packed message payload.
         @param header_args: An optional dictionary of additional kwargs for the header constructor.
+        @param sequence_count: The CCSDS sequence count of the packet.
         @return: The constructed CCSDS command packet.
         """
 
-        sequence_counter = 0
-        command = self.ccsds.CcsdsCommand(msg_id, function_code, len(data), sequence_count=sequence_counter,
+        command = self.ccsds.CcsdsCommand(msg_id, function_code, len(data), sequence_count=sequence_count,
                                           endian=self.endianness, crc=self.crc, **(header_args or {}))
 
         if header_args is not None and isinstance(header_args, dict):
@@ -134,3 +145,50 @@ class CommandInterface:
             self.init_socket()
             bytessent = 0
         return bytessent == len(to_send)
+
+    def send_command_burst(self, msg_id, function_code, data, count, rate=None, gap=None, header_args=None):
+        """
+        This method constructs count CCSDS command packets with consecutive sequence counts, then sends them
+        to the ip:port defined when creating the class via UDP.
+
+        @param msg_id: The message ID of the commands to send.
+        @param function_code: The app specific function/command code (CC).
+        @param data: A bytearray representing the packed message payload, shared by all commands.
+        @param count: The number of commands to send.
+        @param rate: (Optional) The number of commands to send per second.
+        @param gap: (Optional) The time in seconds from the start of one command to the next. Ignored if rate is given.
+        If neither rate nor gap is given, the commands are sent back to back.
+        @param header_args: An optional dictionary of additional kwargs for the header constructor.
+        @return BurstResult: The number of commands sent and failed, and the time taken to send them.
+        """
+        interval = 1.0 / rate if rate else (gap or 0.0)
+
+        # Encode all packets before sending, so that sending is only paced by the socket
+        packets = []
+        for _ in range(count):
+            packets.append(bytes(self.build_command(msg_id, function_code, data, header_args, self.sequence_count)))
+            self.sequence_count = (self.sequence_count + 1) % SEQUENCE_COUNT_MODULO
+
+        if self.command_socket.fileno() == -1:
+            self.init_socket()
+        address = (self.ip_address, self.port)
+        sent = 0
+        failed = 0
+        start_time = time.perf_counter()
+        for index, packet in enumerate(packets):
+            if interval:
+                # Pace against the start of the burst rather than the previous packet, so delays do not accumulate
+                delay = start_time + index * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            try:
+                if self.command_socket.sendto(packet, address) == len(packet):
+                    sent += 1
+                else:
+                    failed += 1
+            except socket.error:
+                log.error("Command socket exception: close and re-init socket")
+                self.command_socket.close()
+                self.init_socket()
+                failed += 1
+        return BurstResult(sent, failed, time.perf_counter() - start_time)
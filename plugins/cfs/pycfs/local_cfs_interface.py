@@ -18,8 +18,11 @@
 local_cfs_interface.py: Lower-level interface to communicate with cFS locally (linux).
 
 - Inherits CFS Interface
+- Optionally skips building cFS when the build directory is unchanged since the last build
 """
 
+import fcntl
+import hashlib
 import os
 from io import StringIO
 from pathlib import Path
@@ -34,6 +37,10 @@ from lib.ctf_global import Global
 from lib.exceptions import CtfTestError
 from lib.logger import logger as log
 
+# Files written by CTF in the cFS build directory, which are excluded from the build fingerprint
+BUILD_FINGERPRINT_FILE = ".ctf_build_fingerprint"
+BUILD_LOCK_FILE = ".ctf_build.lock"
+
 
 class LocalCfsInterface(CfsInterface):
     """
@@ -99,6 +106,110 @@ class LocalCfsInterface(CfsInterface):
         """
         Build cfs image. The path of cFS source is configured in config init file.
         The build output folder is also configured in init file.
+        If build_cache is set, the build is skipped when the build fingerprint matches the last successful build,
+        and the build directory is locked so that concurrent CTF runs do not build it at once.
+        @return bool: True if build succeed, otherwise False
+        """
+        if not self.config.build_cache:
+            return self.run_build_cmd()
+
+        lock_path = os.path.join(self.config.cfs_build_dir, BUILD_LOCK_FILE)
+        fingerprint_path = os.path.join(self.config.cfs_build_dir, BUILD_FINGERPRINT_FILE)
+        try:
+            with open(lock_path, "a") as lock_file:
+                log.debug("Waiting for build lock {}".format(lock_path))
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+                # Checked while holding the lock, since another CTF run may have just built the same directory
+                if self.is_build_current(fingerprint_path):
+                    log.info("Build of {} is up to date. Skipping build.".format(self.config.cfs_build_dir))
+                    return True
+
+                if os.path.exists(fingerprint_path):
+                    os.remove(fingerprint_path)
+                # Computed before the build, so that sources modified during the build trigger the next build
+                fingerprint = self.get_build_fingerprint()
+                build_success = self.run_build_cmd()
+                if build_success:
+                    with open(fingerprint_path, "w") as fingerprint_file:
+                        fingerprint_file.write(fingerprint)
+                return build_success
+        except OSError as exception:
+            log.error("Error using build cache in {}".format(self.config.cfs_build_dir))
+            log.error(exception)
+            raise CtfTestError('Error from build_cfs') from exception
+
+    def is_build_current(self, fingerprint_path):
+        """
+        Check whether the fingerprint of the build directory matches the fingerprint saved after the last successful
+        build, and the cFS executable exists.
+        @param fingerprint_path: path of the saved build fingerprint.
+        @return bool: True if the build can be skipped, otherwise False
+        """
+        if not os.path.isfile(os.path.join(self.config.cfs_run_dir, self.config.cfs_exe)):
+            return False
+        try:
+            with open(fingerprint_path) as fingerprint_file:
+                saved_fingerprint = fingerprint_file.read().strip()
+        except FileNotFoundError:
+            return False
+        return saved_fingerprint == self.get_build_fingerprint()
+
+    def get_build_fingerprint(self):
+        """
+        Compute a hash of the build configuration, and of the path, size and modification time of each file in the
+        build directory, except those under the build_cache_exclude paths. Symbolic links are followed, since apps and
+        mission configurations are often linked into the build directory.
+        @return str: the hex digest of the build fingerprint.
+        """
+        build_dir = self.config.cfs_build_dir
+        digest = hashlib.sha256()
+        for value in (self.config.cfs_build_cmd, os.path.abspath(build_dir), self.config.cfs_run_dir,
+                      self.config.cfs_exe):
+            digest.update("{}\0".format(value).encode())
+
+        excluded = {os.path.normpath(path) for path in self.config.build_cache_exclude}
+        excluded.update((BUILD_FINGERPRINT_FILE, BUILD_LOCK_FILE))
+        visited_dirs = {self.get_file_id(build_dir)}
+        for root, dirs, files in os.walk(build_dir, followlinks=True):
+            rel_root = os.path.relpath(root, build_dir)
+            walk_dirs = []
+            for name in sorted(dirs):
+                if os.path.normpath(os.path.join(rel_root, name)) in excluded:
+                    continue
+                # Directories already walked, such as links to a parent directory, are skipped to avoid cycles
+                dir_id = self.get_file_id(os.path.join(root, name))
+                if dir_id is not None and dir_id not in visited_dirs:
+                    visited_dirs.add(dir_id)
+                    walk_dirs.append(name)
+            dirs[:] = walk_dirs
+            for name in sorted(files):
+                rel_path = os.path.normpath(os.path.join(rel_root, name))
+                if rel_path in excluded:
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                digest.update("{}\0{}\0{}\n".format(rel_path, stat.st_size, stat.st_mtime_ns).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_file_id(path):
+        """
+        Get the device and inode numbers identifying a file, following symbolic links.
+        @param path: path of the file.
+        @return tuple: the device and inode numbers, or None if the file cannot be accessed.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def run_build_cmd(self):
+        """
+        Run the configured build command in the build directory, saving its output to the script log directory.
         @return bool: True if build succeed, otherwise False
         """
         build_success = True
@@ -138,13 +249,6 @@ class LocalCfsInterface(CfsInterface):
                 starts successfully, otherwise False;  and 'pid': the pid of cfs instance process.
         """
 
-        # Remove ram drive if not a processor reset
-        if "RPR" not in self.config.cfs_run_args:
-            ram_drive_path = self.config.cfs_ram_drive_path
-            if ram_drive_path:
-                log.info("Removing ram drive {} before startup since -RPR arg was not included".format(ram_drive_path))
-                rmtree(Path(ram_drive_path), ignore_errors=True)
-
         start_string = self.get_start_string(run_args)
         # Did CFS startup and if so what is the pid?
         return_values = {
@@ -153,13 +257,24 @@ class LocalCfsInterface(CfsInterface):
         }
 
         # check whether CFS Executable has already started
-        pidof_cfs = "pgrep -f \"{}\"".format(self.config.cfs_run_cmd)
-        pid = run(pidof_cfs, stdout=PIPE, stderr=STDOUT, shell=True, check=False).stdout.decode()
+        pid = self.find_cfs_processes(self.config.get_process_pattern())
         if pid != "":
             log.error("CFS executable {} has already started! its pid is {}".format(self.config.cfs_run_cmd, pid))
             return_values["result"] = False
             return return_values
 
+        # Remove ram drive if not a processor reset
+        if "RPR" not in self.config.cfs_run_args:
+            ram_drive_path = self.config.cfs_ram_drive_path
+            # The ram drive is shared by all instances of the executable on this host, which are only told apart
+            # by their command port
+            if ram_drive_path and self.config.cfs_port_arg and self.find_cfs_processes(self.config.cfs_run_cmd):
+                log.warning("Not removing ram drive {} since another instance of {} is running"
+                            .format(ram_drive_path, self.config.cfs_run_cmd))
+            elif ram_drive_path:
+                log.info("Removing ram drive {} before startup since -RPR arg was not included".format(ram_drive_path))
+                rmtree(Path(ram_drive_path), ignore_errors=True)
+
         log.info("Starting CFS Executable")
         log.debug("\t Command : {}".format(start_string))
 
@@ -193,3 +308,13 @@ class LocalCfsInterface(CfsInterface):
         return_values["result"] = True
 
         return return_values
+
+    @staticmethod
+    def find_cfs_processes(pattern):
+        """
+        Find the processes whose command line matches a pattern.
+        @param pattern: the process pattern, as used by pgrep -f.
+        @return String: the pids of the matching processes, or an empty string if there are none.
+        """
+        # pgrep is run without a shell, whose command line would also match the pattern
+        return run(["pgrep", "-f", pattern], stdout=PIPE, stderr=STDOUT, check=False).stdout.decode()
@@ -0,0 +1,151 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+"""
+port_lease.py: Leases UDP ports to cFS targets, so that concurrent CTF processes on one host do not collide.
+
+- A port is leased by holding an exclusive lock on the file port_<N>.lock in the lease directory, which is shared
+  by all CTF processes on the host.
+- The lock is held by an open file descriptor, so leases are released when the lease holder closes the file or the
+  process exits, even if it crashes.
+- A port is only leased if it can also be bound, so ports used by other programs are skipped.
+"""
+
+import fcntl
+import os
+import socket
+
+from lib.logger import logger as log
+
+
+class PortLeaseRegistry:
+    """
+    The PortLeaseRegistry class leases free UDP ports in a range to named owners, such as cFS targets, and holds
+    the leases until they are released.
+
+    @param lease_dir: Directory of the lease files, shared by all CTF processes on the host
+    """
+
+    def __init__(self, lease_dir):
+        """
+        Constructor implementation for PortLeaseRegistry class.
+        """
+        self.lease_dir = lease_dir
+        # Open lease file of each leased port, and the owner of each leased port
+        self.lease_files = {}
+        self.owners = {}
+
+    def lease_ports(self, owner, count, port_min, port_max):
+        """
+        Lease count free ports in the range port_min to port_max.
+        @param owner: Name of the owner of the leases, used to release them.
+        @param count: The number of ports to lease.
+        @param port_min: The lowest port that can be leased.
+        @param port_max: The highest port that can be leased.
+        @return list: The leased ports in ascending order, or None if fewer than count ports are free.
+        """
+        os.makedirs(self.lease_dir, exist_ok=True)
+        ports = []
+        for port in range(port_min, port_max + 1):
+            if len(ports) == count:
+                break
+            if port not in self.lease_files and self.acquire(port, owner):
+                ports.append(port)
+
+        if len(ports) < count:
+            log.error("Only {} of {} ports in {}-{} are free for {}".format(len(ports), count, port_min, port_max,
+                                                                        owner))
+            for port in ports:
+                self.release(port)
+            return None
+        return ports
+
+    def acquire(self, port, owner):
+        """
+        Lock the lease file of a port, and check that the port can be bound.
+        @return bool: True if the port is leased to the owner; False otherwise.
+        """
+        lease_file = open(os.path.join(self.lease_dir, "port_{}.lock".format(port)), "a+")
+        try:
+            fcntl.flock(lease_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            # Leased by another process
+            lease_file.close()
+            return False
+
+        if not self.is_port_free(port):
+            log.debug("Port {} is not leased but is in use".format(port))
+            lease_file.close()
+            return False
+
+        lease_file.seek(0)
+        lease_file.truncate()
+        lease_file.write("{} {}\n".format(os.getpid(), owner))
+        lease_file.flush()
+        self.lease_files[port] = lease_file
+        self.owners[port] = owner
+        return True
+
+    @staticmethod
+    def is_port_free(port):
+        """
+        Check that a UDP port can be bound on this host.
+        """
+        test_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            test_socket.bind(("", port))
+            return True
+        except OSError:
+            return False
+        finally:
+            test_socket.close()
+
+    def release(self, port):
+        """
+        Release the lease of a port.
+        @return None
+        """
+        lease_file = self.lease_files.pop(port, None)
+        self.owners.pop(port, None)
+        if lease_file is not None:
+            lease_file.close()
+
+    def release_owner(self, owner):
+        """
+        Release the leases of all ports leased to an owner.
+        @return None
+        """
+        for port in [port for port, port_owner in self.owners.items() if port_owner == owner]:
+            self.release(port)
+
+    def get_ports(self, owner):
+        """
+        Get the ports leased to an owner.
+        @return list: The leased ports in ascending order.
+        """
+        return sorted(port for port, port_owner in self.owners.items() if port_owner == owner)
+
+
+# Lease registries of this process, by lease directory
+lease_registries = {}
+
+
+def get_port_lease_registry(lease_dir):
+    """
+    Get the lease registry of this process for a lease directory, creating it if needed.
+    """
+    lease_dir = os.path.abspath(lease_dir)
+    if lease_dir not in lease_registries:
+        lease_registries[lease_dir] = PortLeaseRegistry(lease_dir)
+    return lease_registries[lease_dir]
@@ -19,40 +19,188 @@ tlm_listener.py: Simple telemetry listener class that connects to a given ip/por
 """
 
 import errno
+import select
 import socket
+import struct
+import sys
+import threading
+from collections import deque
+
+from lib.logger import logger as log
 
 # Set the CCSDS Max Size to maximum theoretical UDP packet size
 #   - This value is used during the tlm_socket.recv() to receive *up to*
 #     CCSDS_MAX_SIZE bytes
 CCSDS_MAX_SIZE = 65535
 
+# Maximum time the receive thread blocks in select() before checking whether it should stop
+RECEIVE_THREAD_SELECT_TIMEOUT = 0.1
+
+# Linux socket option that attaches the count of datagrams dropped by the kernel to each received datagram.
+# Not all Python builds expose the constant, so fall back to the value defined in asm-generic/socket.h
+SO_RXQ_OVFL = getattr(socket, "SO_RXQ_OVFL", 40)
+RXQ_OVFL_ANCILLARY_SIZE = socket.CMSG_SPACE(struct.calcsize("I")) if hasattr(socket, "CMSG_SPACE") else 0
+
 
 class TlmListener:
     """
     Simple telemetry listener class that connects to a given ip/port via UDP and manages that connection.
     Can call read_socket() to receive the next packet in telemetry stream.
     """
-    def __init__(self, ipaddr, port):
+    # pylint: disable=too-many-instance-attributes, too-many-arguments
+    def __init__(self, ipaddr, port, receive_thread=False, receive_queue_size=10000, max_batch=1, rcvbuf_size=0):
         """
         Constructor of TlmListener class.
         @param ipaddr: IP address of cFS system.
         @param port:   port of cFS system.
+        @param receive_thread: If True, drain the socket continuously from a background thread (Optional).
+        @param receive_queue_size: Maximum number of datagrams held for the receive thread (Optional).
+        @param max_batch: Maximum number of datagrams drained from the socket per receive call (Optional).
+        @param rcvbuf_size: Size in bytes requested for the socket receive buffer, 0 for the OS default (Optional).
         @return None
         """
         self.ipaddr = ipaddr
         # Port = 0 will assign a random available port
         self.port = port
+        self.max_batch = max(1, max_batch)
+        self.rcvbuf_size = rcvbuf_size
+        self.rxq_ovfl_enabled = False
+        self.kernel_drop_count = 0
         self.socket = self.create_socket()
 
+        # Preallocated receive buffers for batched mode. Views returned into the ring are only valid
+        # until the next batch is received, so callers must copy what they keep.
+        self.receive_ring = []
+        self.receive_views = []
+        if self.max_batch > 1:
+            self.receive_ring = [bytearray(CCSDS_MAX_SIZE) for _ in range(self.max_batch)]
+            self.receive_views = [memoryview(buffer) for buffer in self.receive_ring]
+        self.pending_batch = []
+        self.pending_index = 0
+
+        # Datagrams received by the background thread, consumed in order by read_socket()
+        self.receive_queue = deque(maxlen=receive_queue_size)
+        self.receive_thread = None
+        self.receive_thread_stop = threading.Event()
+        self.queue_overflow_count = 0
+        if receive_thread:
+            self.start_receive_thread()
+
     def cleanup(self):
         """
-        Close socket connection.
+        Stop the receive thread, if running, and close socket connection.
 
         @return None
 
         """
+        self.stop_receive_thread()
+        if self.kernel_drop_count:
+            log.warning("Kernel dropped {} telemetry packets on port {}".format(self.kernel_drop_count, self.port))
         self.socket.close()
 
+    def start_receive_thread(self):
+        """
+        Start a daemon thread that continuously drains the telemetry socket into the receive queue, so that
+        datagrams are not lost in the kernel receive buffer between calls to read_socket().
+        @return None
+        """
+        if self.receive_thread is not None and self.receive_thread.is_alive():
+            return
+        self.receive_thread_stop.clear()
+        self.receive_thread = threading.Thread(target=self._receive_loop,
+                                               name="TlmListener-{}".format(self.port), daemon=True)
+        self.receive_thread.start()
+        log.debug("Started telemetry receive thread on port {}".format(self.port))
+
+    def stop_receive_thread(self):
+        """
+        Signal the receive thread to stop and wait for it to exit. Datagrams already queued remain available
+        to read_socket().
+        @return None
+        """
+        if self.receive_thread is None:
+            return
+        self.receive_thread_stop.set()
+        self.receive_thread.join()
+        self.receive_thread = None
+        if self.queue_overflow_count:
+            log.warning("Telemetry receive queue on port {} overflowed, {} packets dropped"
+                        .format(self.port, self.queue_overflow_count))
+
+    def is_receive_thread_running(self):
+        """
+        Return True if the background receive thread is draining the socket.
+        """
+        return self.receive_thread is not None and self.receive_thread.is_alive()
+
+    def _receive_loop(self):
+        """
+        Body of the receive thread: wait for the socket to become readable and queue every pending datagram.
+        """
+        while not self.receive_thread_stop.is_set():
+            try:
+                readable, _, _ = select.select([self.socket], [], [], RECEIVE_THREAD_SELECT_TIMEOUT)
+            except (OSError, ValueError):
+                # The socket was closed underneath the thread
+                break
+            if readable:
+                self._drain_socket_to_queue()
+
+    def _drain_socket_to_queue(self):
+        """
+        Receive datagrams until the socket would block, appending them to the receive queue.
+        """
+        while True:
+            batch = self._receive_datagrams()
+            if not batch:
+                return
+            for received in batch:
+                if len(self.receive_queue) == self.receive_queue.maxlen:
+                    # The oldest datagram is discarded by the bounded deque
+                    self.queue_overflow_count += 1
+                # Ring buffers are reused by the next batch, so queue a copy
+                self.receive_queue.append(bytes(received))
+
+    def _receive_datagrams(self):
+        """
+        Receive the datagrams currently pending on the socket, up to max_batch of them.
+        In batched mode the datagrams are received into the preallocated ring and returned as memoryviews
+        which remain valid until the next call.
+        @return list of received datagrams, empty if none are pending
+        """
+        if self.max_batch == 1:
+            try:
+                return [self.socket.recv(CCSDS_MAX_SIZE)]
+            except IOError:
+                return []
+
+        batch = []
+        for index in range(self.max_batch):
+            try:
+                if self.rxq_ovfl_enabled:
+                    nbytes, ancdata, _, _ = self.socket.recvmsg_into([self.receive_ring[index]],
+                                                                     RXQ_OVFL_ANCILLARY_SIZE)
+                    self._update_kernel_drop_count(ancdata)
+                else:
+                    nbytes = self.socket.recv_into(self.receive_ring[index])
+            except IOError:
+                break
+            batch.append(self.receive_views[index][:nbytes])
+        return batch
+
+    def _update_kernel_drop_count(self, ancdata):
+        """
+        Update the kernel drop counter from the SO_RXQ_OVFL ancillary data of a received datagram.
+        The kernel reports a running total for the socket.
+        """
+        for level, msg_type, data in ancdata:
+            if level == socket.SOL_SOCKET and msg_type == SO_RXQ_OVFL and len(data) >= struct.calcsize("I"):
+                drop_count = struct.unpack("I", data[:struct.calcsize("I")])[0]
+                if drop_count > self.kernel_drop_count:
+                    log.debug("Kernel dropped {} telemetry packets on port {}"
+                              .format(drop_count - self.kernel_drop_count, self.port))
+                    self.kernel_drop_count = drop_count
+
     def create_socket(self):
         """
         Create a UDP socket connection to a cFS system.
@@ -60,6 +208,16 @@ class TlmListener:
         """
         tlm_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         tlm_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.rcvbuf_size:
+            tlm_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf_size)
+            log.debug("Telemetry socket receive buffer set to {} bytes (requested {})"
+                      .format(tlm_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF), self.rcvbuf_size))
+        if self.max_batch > 1 and sys.platform.startswith("linux") and RXQ_OVFL_ANCILLARY_SIZE:
+            try:
+                tlm_socket.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+                self.rxq_ovfl_enabled = True
+            except OSError:
+                log.debug("SO_RXQ_OVFL is not supported, kernel drops will not be counted")
         tlm_socket.bind((self.ipaddr, self.port))
         tlm_socket.setblocking(False)
         self.port = tlm_socket.getsockname()[1]
@@ -75,12 +233,28 @@ class TlmListener:
     def read_socket(self):
         """
         Receive the UDP packet in the telemetry stream.
+        In batched mode the packet is a memoryview into the receive ring, valid until the next call.
 
         @return the number of bytes read from telemetry stream
         """
         received = 0
+        if self.receive_thread is not None:
+            try:
+                return self.receive_queue.popleft()
+            except IndexError:
+                return received
         if self.socket.fileno() == -1:
             self.socket = self.create_socket()
+        if self.max_batch > 1:
+            # Serve datagrams from the current batch, draining a new batch once it is consumed
+            if self.pending_index >= len(self.pending_batch):
+                self.pending_batch = self._receive_datagrams()
+                self.pending_index = 0
+                if not self.pending_batch:
+                    return received
+            received = self.pending_batch[self.pending_index]
+            self.pending_index += 1
+            return received
         try:
             received = self.socket.recv(CCSDS_MAX_SIZE)
         except IOError as exception:  # and here it is handled
@@ -0,0 +1,219 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+"""
+@namespace plugins.cfs.pycfs.tlm_log_writer
+tlm_log_writer.py: Formatting and background writing of the telemetry and event log files.
+
+Log records are rendered by functions that take the values captured when a packet is received, so that rendering
+can be done either immediately, or later by a LogWriter thread. Telemetry can also be logged as compact binary
+records, which are rendered to the text log format by render_binary_tlm_log when the log is read.
+"""
+
+import datetime
+import queue
+import struct
+import threading
+import traceback
+
+from lib.logger import logger as log
+
+# Binary telemetry record header: exec time, receive time, MID, sequence count, timestamp seconds,
+# timestamp subseconds, and the length of the payload bytes following the header
+BINARY_TLM_RECORD = struct.Struct("<ddIIIII")
+
+# Maximum number of records written by the LogWriter thread before flushing the files
+LOG_WRITER_BATCH_SIZE = 256
+
+
+def format_receive_time(receive_time):
+    """
+    Format a wall-clock time as it is displayed in the log files.
+    """
+    return datetime.datetime.fromtimestamp(receive_time).strftime("%H:%M:%S.%f")[:-3]
+
+
+def decode_payload(payload_class, buf):
+    """
+    Build a copy of a payload from its bytes, or return None if the bytes cannot be decoded as the payload type.
+    """
+    try:
+        return payload_class.from_buffer_copy(buf)
+    except (ValueError, TypeError):
+        log.error("Cannot decode payload of type {} from {} bytes.".format(payload_class, len(buf)))
+        log.debug(traceback.format_exc())
+        return None
+
+
+def format_tlm_record(exec_time, receive_time, mid, sequence_count, timestamp_seconds, timestamp_subseconds,
+                      payload, payload_class=None, buf=None):
+    """
+    Render a telemetry packet log entry. If payload is None, it is decoded from buf with payload_class.
+    """
+    if payload is None and payload_class is not None:
+        payload = decode_payload(payload_class, buf)
+    return "{} - {}: mid:{} seq: {} timestamp_seconds: {} timestamp_subseconds: {}\n\t{}\n".format(
+        exec_time, format_receive_time(receive_time), hex(mid), sequence_count, timestamp_seconds,
+        timestamp_subseconds, str(payload).replace("\n", "\n\t"))
+
+
+def format_tlm_debug_record(mid, buf):
+    """
+    Render the hex dump of a telemetry payload.
+    """
+    return "        For MID {} Payload length: {} hex values: 0x{}\n".format(hex(mid), len(buf), buf.hex())
+
+
+def format_tlm_error_record(exec_time, receive_time, mid, description):
+    """
+    Render a telemetry error log entry.
+    """
+    return "{} - {}: mid:{} \n\t{}\n".format(exec_time, format_receive_time(receive_time), mid, description)
+
+
+def format_tlm_error_debug_record(mid, buf):
+    """
+    Render the hex dump of a telemetry packet that could not be processed.
+    """
+    return "        For MID {} buf hex values: 0x{}\n".format(mid, buf.hex())
+
+
+def format_csv_record(mid, buf):
+    """
+    Render a telemetry CSV log line.
+    """
+    return "{}, {}, {}\n".format(mid, len(buf), buf.hex())
+
+
+def format_evs_record(payload):
+    """
+    Render an event log entry from an event message payload.
+    """
+    return "%s/%s/%s %s: %s\n" % (payload.PacketID.SpacecraftID,
+                                  payload.PacketID.ProcessorID,
+                                  payload.PacketID.AppName.decode(),
+                                  payload.PacketID.EventID,
+                                  payload.Message.decode() if hasattr(payload, "Message") else "")
+
+
+def pack_binary_tlm_record(exec_time, receive_time, mid, sequence_count, timestamp_seconds, timestamp_subseconds,
+                           buf):
+    """
+    Build a binary telemetry log record.
+    """
+    return BINARY_TLM_RECORD.pack(exec_time, receive_time, mid, sequence_count, timestamp_seconds,
+                                  timestamp_subseconds, len(buf)) + bytes(buf)
+
+
+def read_binary_tlm_log(path):
+    """
+    Iterate over the records of a binary telemetry log file.
+    @return tuple: (exec_time, receive_time, mid, sequence_count, timestamp_seconds, timestamp_subseconds, payload)
+    """
+    with open(path, "rb") as bin_file:
+        while True:
+            record_header = bin_file.read(BINARY_TLM_RECORD.size)
+            if len(record_header) < BINARY_TLM_RECORD.size:
+                return
+            fields = BINARY_TLM_RECORD.unpack(record_header)
+            payload = bin_file.read(fields[-1])
+            yield fields[:-1] + (payload,)
+
+
+def render_binary_tlm_log(path, mid_payload_map, output):
+    """
+    Write the records of a binary telemetry log file in the text telemetry log format.
+    @param path: The path of the binary telemetry log file.
+    @param mid_payload_map: Dictionary of payload types by MID, used to decode the payloads.
+    @param output: The text file the log is written to.
+    @return int: The number of records written.
+    """
+    count = 0
+    for exec_time, receive_time, mid, sequence_count, seconds, subseconds, payload in read_binary_tlm_log(path):
+        payload_class = mid_payload_map.get(mid)
+        payload = decode_payload(payload_class, payload) if payload_class is not None else payload.hex()
+        output.write(format_tlm_record(exec_time, receive_time, mid, sequence_count, seconds, subseconds, payload))
+        count += 1
+    return count
+
+
+class LogWriter:
+    """
+    Background thread rendering and writing log records. Records are queued with the function rendering them
+    and the values it needs, and are written in batches, flushing each file once per batch.
+    """
+
+    def __init__(self, queue_size=10000):
+        """
+        Constructor for LogWriter class.
+        @param queue_size: Maximum number of queued records. Writing a record blocks while the queue is full.
+        """
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+
+    def start(self):
+        """
+        Start the writer thread, if it is not running.
+        """
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._write_loop, name="LogWriter", daemon=True)
+            self.thread.start()
+
+    def write(self, file, render, *args):
+        """
+        Queue a record to be written to a file.
+        @param file: The file the record is written to.
+        @param render: Function returning the text or bytes of the record, called with args by the writer thread.
+        """
+        self.start()
+        self.queue.put((file, render, args))
+
+    def stop(self):
+        """
+        Write all queued records and stop the writer thread.
+        """
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def _write_loop(self):
+        """
+        Write queued records until a stop request is received.
+        """
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while len(batch) < LOG_WRITER_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            files = set()
+            for record in batch:
+                if record is None:
+                    running = False
+                    continue
+                file, render, args = record
+                try:
+                    file.write(render(*args))
+                    files.add(file)
+                except Exception:
+                    log.error("Failed to write log record to {}".format(getattr(file, "name", file)))
+                    log.debug(traceback.format_exc())
+            for file in files:
+                try:
+                    file.flush()
+                except (IOError, ValueError):
+                    log.debug(traceback.format_exc())
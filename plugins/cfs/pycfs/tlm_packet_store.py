@@ -0,0 +1,161 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+"""
+@namespace plugins.cfs.pycfs.tlm_packet_store
+tlm_packet_store.py: Bounded, time-indexed storage of received packets, organized by MID.
+"""
+
+from bisect import bisect_left
+
+# Number of evicted entries tolerated at the front of a buffer before its lists are compacted
+COMPACT_THRESHOLD = 1024
+
+
+class MidPacketBuffer:
+    """
+    Packets received for a single MID, in the order they were received. Supports the read-only list operations
+    used to inspect packets (len, indexing, slicing, iteration) plus append and clear.
+
+    The buffer keeps at most max_packets packets, and drops packets older than max_age relative to the newest
+    packet. Evicted packets are skipped by advancing a start index, and the underlying lists are compacted once
+    enough entries have been skipped, so eviction is amortized O(1). Packet timestamps are kept in a parallel
+    sorted list so that packets received before a given time can be found with a binary search.
+    """
+
+    __slots__ = ("max_packets", "max_age", "appended_count", "_packets", "_timestamps", "_start")
+
+    def __init__(self, max_packets=0, max_age=0.0, packets=None):
+        """
+        Constructor for MidPacketBuffer class.
+        @param max_packets: Maximum number of packets kept, 0 for no limit (Optional).
+        @param max_age: Maximum age of kept packets relative to the newest packet, 0 for no limit (Optional).
+        @param packets: Iterable of packets used to initialize the buffer (Optional).
+        """
+        self.max_packets = max_packets
+        self.max_age = max_age
+        # Total number of packets appended to the buffer, including evicted and cleared packets
+        self.appended_count = 0
+        self._packets = []
+        self._timestamps = []
+        self._start = 0
+        for packet in packets or []:
+            self.append(packet)
+
+    def append(self, packet):
+        """
+        Add a packet to the end of the buffer, evicting the oldest packets as needed to satisfy the limits.
+        Packets are expected to be appended in order of non-decreasing timestamp.
+        """
+        self._packets.append(packet)
+        self._timestamps.append(packet.timestamp)
+        self.appended_count += 1
+
+        if self.max_packets and len(self._packets) - self._start > self.max_packets:
+            self._start = len(self._packets) - self.max_packets
+        if self.max_age:
+            oldest_allowed = packet.timestamp - self.max_age
+            if self._timestamps[self._start] < oldest_allowed:
+                self._start = bisect_left(self._timestamps, oldest_allowed, self._start)
+        self._compact()
+
+    def discard_before(self, timestamp):
+        """
+        Discard all packets received before the given time.
+        """
+        self._start = bisect_left(self._timestamps, timestamp, self._start)
+        self._compact()
+
+    def since(self, timestamp):
+        """
+        Return a list of the packets received at or after the given time.
+        """
+        return self._packets[bisect_left(self._timestamps, timestamp, self._start):]
+
+    def appended_after(self, count):
+        """
+        Return a list of the kept packets that were appended after the first count packets appended to the buffer.
+        """
+        new_count = self.appended_count - count
+        if new_count <= 0:
+            return []
+        return self._packets[max(len(self._packets) - new_count, self._start):]
+
+    def clear(self):
+        """
+        Discard all packets. The count of appended packets is preserved.
+        """
+        self._packets = []
+        self._timestamps = []
+        self._start = 0
+
+    def _compact(self):
+        """
+        Release evicted entries once enough have accumulated at the front of the lists.
+        """
+        if self._start >= COMPACT_THRESHOLD and self._start * 2 >= len(self._packets):
+            del self._packets[:self._start]
+            del self._timestamps[:self._start]
+            self._start = 0
+
+    def __len__(self):
+        return len(self._packets) - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._packets[self._start:][index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("packet index out of range")
+        return self._packets[self._start + index]
+
+    def __iter__(self):
+        return iter(self._packets[self._start:])
+
+    def __reversed__(self):
+        return reversed(self._packets[self._start:])
+
+    def __eq__(self, other):
+        if isinstance(other, (MidPacketBuffer, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return "MidPacketBuffer({!r})".format(list(self))
+
+
+class TlmPacketStore(dict):
+    """
+    Dictionary of MidPacketBuffer keyed by MID. Assigning a list of packets to a MID replaces its buffer with a
+    new buffer holding those packets, subject to the store's limits.
+    """
+
+    def __init__(self, mids, max_packets=0, max_age=0.0):
+        """
+        Constructor for TlmPacketStore class.
+        @param mids: The MIDs for which packets are stored.
+        @param max_packets: Maximum number of packets kept per MID, 0 for no limit (Optional).
+        @param max_age: Maximum age of kept packets per MID, 0 for no limit (Optional).
+        """
+        super().__init__()
+        self.max_packets = max_packets
+        self.max_age = max_age
+        for mid in mids:
+            super().__setitem__(mid, MidPacketBuffer(max_packets, max_age))
+
+    def __setitem__(self, mid, packets):
+        if not isinstance(packets, MidPacketBuffer):
+            packets = MidPacketBuffer(self.max_packets, self.max_age, packets)
+        super().__setitem__(mid, packets)
@@ -0,0 +1,314 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+"""
+@namespace plugins.cfs.pycfs.tlm_predicate
+tlm_predicate.py: Telemetry check arguments compiled into predicates that are applied to received payloads.
+
+The arguments of a telemetry check (variable, compare, value, mask, tolerances) are parsed once when the predicate
+is built, so that checking a packet only needs to read the payload field and run the resolved comparison.
+Comparisons that cannot be resolved ahead of time are delegated to CfsInterface.check_value.
+"""
+
+import ctypes
+import re
+import traceback
+
+from lib import ctf_utility
+from lib.ctf_global import Global, CtfVerificationStage
+from lib.logger import logger as log
+
+OPERATION_DIC = {
+    "==": float.__eq__,
+    "!=": float.__ne__,
+    "<=": float.__le__,
+    ">=": float.__ge__,
+    "<": float.__lt__,
+    ">": float.__gt__
+}
+
+MASK_OPERATION_DIC = {
+    "&": int.__and__,
+    "|": int.__or__
+}
+
+
+def compile_attribute_path(variable):
+    """
+    Convert a dotted variable name, such as "Payload.Data[2].Value", into a function returning that attribute
+    of an object. Equivalent to ctf_utility.rgetattr, without parsing the name on each call.
+    """
+    steps = []
+    try:
+        for attr in variable.split('.'):
+            if '[' in attr:
+                steps.append((attr.split('[')[0], int(re.findall(ctf_utility.INDEX_PATTERN, attr)[0], 0)))
+            else:
+                steps.append((attr, None))
+    except (ValueError, IndexError):
+        # Let rgetattr report the invalid name when a payload is checked
+        return lambda obj: ctf_utility.rgetattr(obj, variable)
+
+    def get_attribute(obj):
+        for name, index in steps:
+            obj = getattr(obj, name)
+            if index is not None:
+                obj = obj[index]
+        return obj
+
+    return get_attribute
+
+
+class TlmComparison:
+    """
+    A single comparison of telemetry values against an expected value.
+    """
+
+    __slots__ = ("expected", "compare", "mask", "mask_value", "cfs", "_check")
+
+    def __init__(self, expected, compare, mask, mask_value, cfs):
+        """
+        Constructor for TlmComparison class. Resolves the comparison function.
+        @param expected: The expected value.
+        @param compare: The comparison operator.
+        @param mask: The mask operator, or None.
+        @param mask_value: The mask operand, or None.
+        @param cfs: The CfsInterface instance used for comparisons that cannot be resolved ahead of time.
+        """
+        self.expected = expected
+        self.compare = compare
+        self.mask = mask
+        self.mask_value = mask_value
+        self.cfs = cfs
+        self._check = self._resolve()
+
+    def __call__(self, actual):
+        return self._check(actual)
+
+    def _resolve(self):
+        """
+        Return the function implementing the comparison.
+        """
+        if self.compare == "regex" and isinstance(self.expected, str):
+            try:
+                return self._regex_check(re.compile(self.expected))
+            except re.error:
+                pass
+        elif self.compare in OPERATION_DIC:
+            numeric_check = self._numeric_check()
+            if numeric_check is not None:
+                return numeric_check
+        return self._generic_check
+
+    def _generic_check(self, actual):
+        return self.cfs.check_value(actual, self.expected, self.compare, self.mask, self.mask_value)
+
+    def _regex_check(self, pattern):
+        expected = self.expected
+
+        def check(actual):
+            if isinstance(actual, str):
+                if pattern.search(actual):
+                    return True
+            else:
+                log.warning("Type mismatch for comparator 'regex'! Actual value {} is not a string.".format(actual))
+            log.warning('Regex match failed, actual value:%s regex value: %s', actual, expected)
+            return False
+
+        return check
+
+    def _numeric_check(self):
+        """
+        Return the function comparing numbers with a pre-converted expected value and resolved operator and mask,
+        or None if the comparison cannot be resolved ahead of time.
+        """
+        expected = self.expected
+        mask_operation = None
+        try:
+            if isinstance(expected, str) and expected.lower().startswith("0x"):
+                expected = int(expected, 0)
+            expected = float(expected)
+        except (TypeError, ValueError):
+            return None
+        if self.mask is not None or self.mask_value is not None:
+            mask_operation = MASK_OPERATION_DIC.get(self.mask)
+            if mask_operation is None or not isinstance(self.mask_value, int):
+                return None
+
+        if isinstance(self.expected, str) and not self.expected.lower().startswith("0x"):
+            log.warning("Type mismatch for comparator '{}'! Expected value '{}' is a string."
+                        .format(self.compare, self.expected))
+
+        operation = OPERATION_DIC[self.compare]
+        compare = self.compare
+        mask_value = self.mask_value
+
+        def check(actual):
+            if isinstance(actual, str):
+                log.warning("Type mismatch for comparator '{}'! Actual value '{}' is a string."
+                            .format(compare, actual))
+            try:
+                actual = float(actual)
+            except ValueError as exception:
+                log.error("Failed to convert args: {}".format(exception))
+                return False
+            if mask_operation is not None:
+                try:
+                    actual = float(mask_operation(int(actual), mask_value))
+                except (TypeError, ValueError) as exception:
+                    log.error("Failed to apply mask: {}".format(exception))
+                    return False
+            return operation(actual, expected)
+
+        return check
+
+
+class TlmArgCheck:
+    """
+    The check of one telemetry variable, compiled from a telemetry check argument.
+    """
+
+    def __init__(self, arg, cfs):
+        """
+        Constructor for TlmArgCheck class.
+        @param arg: The argument dictionary, with keys variable, compare, value and optionally mask, maskValue,
+                    tolerance, tolerance_plus and tolerance_minus.
+        @param cfs: The CfsInterface instance used for comparisons that cannot be resolved ahead of time.
+        """
+        self.arg = arg
+        self.cfs = cfs
+        expected_value = arg.get("value")
+        if isinstance(expected_value, list):
+            expected_value = expected_value[0]
+        self.expected_value = expected_value
+        self.variable = arg.get("variable")
+        self.compare = arg.get("compare")
+        self.mask = arg.get("mask")
+        self.mask_value = arg.get("maskValue")
+
+        tol = arg.get("tolerance")
+        tol_plus = arg.get("tolerance_plus")
+        tol_minus = arg.get("tolerance_minus")
+        if tol is not None:
+            tol_plus = tol
+            tol_minus = tol
+        self.tol_plus = tol_plus if tol_plus is not None else 0
+        self.tol_minus = tol_minus if tol_minus is not None else 0
+
+        self.is_valid = self.expected_value is not None and self.variable is not None
+        if not self.is_valid:
+            return
+
+        self.get_actual = compile_attribute_path(self.variable)
+        self.check_expected = TlmComparison(expected_value, self.compare, self.mask, self.mask_value, cfs)
+        # Tolerance bounds are built when first needed, since their expected values may not support arithmetic
+        self._tolerance_checks = None
+
+    def log_invalid(self, payload):
+        """
+        Log why the argument cannot be checked, during the first check of a verification.
+        """
+        if Global.current_verification_stage != CtfVerificationStage.first_ver:
+            return
+        if self.expected_value is None:
+            log.error("No expected 'value' provided in arg: {}. with payload {}".format(self.arg, payload))
+        if self.variable is None:
+            log.error("No variable provided in arg: {}".format(self.arg))
+
+    def tolerance_checks(self):
+        """
+        Return the comparisons of the upper and lower tolerance bounds, each as a list of comparisons that must
+        all pass, or None for a tolerance of 0.
+        """
+        if self._tolerance_checks is None:
+            plus_checks = minus_checks = None
+            if self.tol_plus:
+                plus_checks = [
+                    TlmComparison(self.expected_value + self.tol_plus, "<=", self.mask, self.mask_value, self.cfs),
+                    TlmComparison(self.expected_value, ">=", self.mask, self.mask_value, self.cfs)]
+            if self.tol_minus:
+                minus_checks = [
+                    TlmComparison(self.expected_value - self.tol_minus, ">=", self.mask, self.mask_value, self.cfs),
+                    TlmComparison(self.expected_value, "<=", self.mask, self.mask_value, self.cfs)]
+            self._tolerance_checks = (plus_checks, minus_checks)
+        return self._tolerance_checks
+
+    def check(self, actual):
+        """
+        Compare the actual value of the variable with the expected value.
+        @return tuple: (result of the comparison, applied positive tolerance, applied negative tolerance)
+        """
+        # Note (ctypes.c_char*N) is not ctypes.Array
+        if isinstance(actual, ctypes.Array):
+            # does not allow tolerance compare
+            return self.cfs.check_array_value(actual, self.expected_value, self.compare), None, None
+
+        result = self.check_expected(actual)
+        if self.tol_plus or self.tol_minus:
+            plus_checks, minus_checks = self.tolerance_checks()
+            for bound_checks in (plus_checks, minus_checks):
+                if bound_checks:
+                    bound_result = bound_checks[0](actual)
+                    bound_result &= bound_checks[1](actual)
+                    result |= bound_result
+        return result, self.tol_plus, self.tol_minus
+
+
+class TlmPredicate:
+    """
+    The arguments of a telemetry check, compiled to be applied to received payloads.
+    """
+
+    def __init__(self, args, cfs):
+        """
+        Constructor for TlmPredicate class.
+        @param args: The list of argument dictionaries of the telemetry check.
+        @param cfs: The CfsInterface instance used for comparisons that cannot be resolved ahead of time.
+        """
+        self.arg_checks = [TlmArgCheck(arg, cfs) for arg in args]
+
+    def check(self, payload, log_result=True):
+        """
+        Check a payload against each argument.
+        @return bool: True if the payload satisfies every argument, False otherwise.
+        """
+        packet_passed = True
+        for arg_check in self.arg_checks:
+            if not arg_check.is_valid:
+                # If there is no variable or expected value provided, there is no value to compare to.
+                arg_check.log_invalid(payload)
+                return False
+
+            try:
+                actual = arg_check.get_actual(payload)
+            except (AttributeError, ValueError) as exception:
+                log.error("Failed to evaluate variable payload.{}: {}".format(arg_check.variable, exception))
+                log.debug(traceback.format_exc())
+                packet_passed = False
+                break
+
+            if isinstance(actual, bytes):
+                log.debug("Bytes object {} is decoded to {}".format(actual, actual.decode()))
+                actual = actual.decode()
+
+            arg_result, tol_plus, tol_minus = arg_check.check(actual)
+
+            if log_result:
+                log.debug("{} Intermediate Check - {}: Actual: {}, Expected: {}, Comparison: {}, Tol: +{}, -{}"
+                          .format("PASSED" if arg_result else "FAILED", arg_check.variable, actual,
+                                  arg_check.expected_value, arg_check.compare, tol_plus, tol_minus))
+
+            packet_passed = packet_passed and arg_result
+
+        return packet_passed
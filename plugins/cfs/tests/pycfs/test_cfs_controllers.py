@@ -753,6 +753,41 @@ def test_cfs_controller_send_cfs_command_errors(cfs_controller, workspace):
         cfs_controller.cfs.send_command.assert_not_called()
 
 
+def test_cfs_controller_send_cfs_command_burst(cfs_controller, utils):
+    from plugins.cfs.pycfs.command_interface import BurstResult
+    arg_class = type("BurstArgs", (ctypes.LittleEndianStructure,), {"_fields_": [("Value", ctypes.c_uint16)]})
+    cfs_controller.ccsds_reader = Mock(ctype_structure=ctypes.LittleEndianStructure)
+    cfs_controller.mid_map = {"BURST_CMD_MID": {"MID": 0x1880, "CC": {"BURST_CC": {"CODE": 2,
+                                                                                   "ARG_CLASS": arg_class}}}}
+    cfs_controller.macro_map = {}
+    cfs_controller.cfs = Mock()
+
+    cfs_controller.cfs.send_command_burst.return_value = BurstResult(10, 0, 0.5)
+    assert cfs_controller.send_cfs_command_burst("BURST_CMD_MID", "BURST_CC", {"Value": 258}, 10, rate="20")
+    cfs_controller.cfs.send_command_burst.assert_called_once_with(0x1880, 2, b"\x02\x01", 10, 20.0, None, None)
+
+    utils.clear_log()
+    cfs_controller.cfs.send_command_burst.return_value = BurstResult(9, 1, 0.5)
+    assert not cfs_controller.send_cfs_command_burst(0x1880, 2, {"Value": 1}, 10, gap=0.05)
+    assert utils.has_log_level("ERROR")
+
+    # a gap of 0 sends the commands back to back
+    cfs_controller.cfs.send_command_burst.reset_mock()
+    cfs_controller.cfs.send_command_burst.return_value = BurstResult(10, 0, 0.5)
+    assert cfs_controller.send_cfs_command_burst("BURST_CMD_MID", "BURST_CC", {"Value": 1}, 10, gap=0)
+    cfs_controller.cfs.send_command_burst.assert_called_once_with(0x1880, 2, b"\x01\x00", 10, None, None, None)
+
+    # invalid mid, cc, count and rate
+    cfs_controller.cfs.send_command_burst.reset_mock()
+    assert not cfs_controller.send_cfs_command_burst("INVALID_MID", "BURST_CC", {}, 10)
+    assert not cfs_controller.send_cfs_command_burst("BURST_CMD_MID", "INVALID_CC", {}, 10)
+    assert not cfs_controller.send_cfs_command_burst("BURST_CMD_MID", "BURST_CC", {}, 0)
+    assert not cfs_controller.send_cfs_command_burst("BURST_CMD_MID", "BURST_CC", {}, "many")
+    assert not cfs_controller.send_cfs_command_burst("BURST_CMD_MID", "BURST_CC", {}, 10, rate=0)
+    assert not cfs_controller.send_cfs_command_burst("BURST_CMD_MID", "BURST_CC", {}, 10, rate=-5)
+    cfs_controller.cfs.send_command_burst.assert_not_called()
+
+
 def test_send_cfs_raw_command(cfs_controller, workspace):
     TO_CMD_MID = workspace['TO_CMD_MID']
 
@@ -1263,11 +1298,12 @@ def test_cfs_controller_shutdown_cfs(cfs_controller_inited):
     Implementation of CFS plugin instructions shutdown_cfs. When CFS plugin instructions
     (shutdown_cfs) is executed, it calls CfsController instance's shutdown_cfs function.
     """
-    with patch('os.system') as mock_system:
+    with patch('os.system') as mock_system, patch('plugins.cfs.pycfs.cfs_controllers.run') as mock_run:
         mock_system.return_value = 0
+        mock_run.return_value.returncode = 0
         assert cfs_controller_inited.shutdown_cfs()
         mock_system.assert_any_call('kill -9 42')
-        mock_system.assert_called_with('pkill -fe -9 "tail -f /dev/null"')
+        mock_run.assert_called_once_with(["pkill", "-fe", "-9", "tail -f /dev/null"], check=False)
     assert not cfs_controller_inited.cfs
 
 
@@ -1278,36 +1314,40 @@ def test_cfs_controller_shutdown_cfs_fail_pid(cfs_controller_inited, utils):
     (shutdown_cfs) is executed, it calls CfsController instance's shutdown_cfs function.
     """
     # case: no cfs pid
-    with patch('os.system') as mock_system:
+    with patch('os.system') as mock_system, patch('plugins.cfs.pycfs.cfs_controllers.run') as mock_run:
+        mock_run.return_value.returncode = 1
         cfs_controller_inited.cfs_pid = None
         assert not cfs_controller_inited.shutdown_cfs()
         assert not cfs_controller_inited.cfs
         assert utils.has_log_level("WARNING")
         assert utils.has_log_level("ERROR")
-        mock_system.assert_called_once_with('pkill -fe -9 "tail -f /dev/null"')
+        mock_system.assert_not_called()
+        mock_run.assert_called_once_with(["pkill", "-fe", "-9", "tail -f /dev/null"], check=False)
 
 
 def test_cfs_controller_shutdown_cfs_fail_ps(cfs_controller_inited, utils):
     # case: ps fails
-    with patch('os.system') as mock_system:
+    with patch('os.system') as mock_system, patch('plugins.cfs.pycfs.cfs_controllers.run') as mock_run:
         mock_system.return_value = 1
+        mock_run.return_value.returncode = 0
         assert not cfs_controller_inited.shutdown_cfs()
         assert not cfs_controller_inited.cfs
         assert utils.has_log_level("ERROR")
-        mock_system.assert_any_call("ps -p 42")
-        mock_system.assert_called_with('pkill -fe -9 "tail -f /dev/null"')
+        mock_system.assert_called_once_with("ps -p 42")
+        mock_run.assert_called_once_with(["pkill", "-fe", "-9", "tail -f /dev/null"], check=False)
 
 
 def test_cfs_controller_shutdown_cfs_fail_kill(cfs_controller_inited, utils):
     # case: kill and pkill fail
-    with patch('os.system') as mock_system:
-        mock_system.side_effect = [0, 1, 1]
+    with patch('os.system') as mock_system, patch('plugins.cfs.pycfs.cfs_controllers.run') as mock_run:
+        mock_system.side_effect = [0, 1]
+        mock_run.return_value.returncode = 1
         assert not cfs_controller_inited.shutdown_cfs()
         assert not cfs_controller_inited.cfs
         assert utils.has_log_level("ERROR")
         mock_system.assert_any_call('ps -p 42')
         mock_system.assert_any_call('kill -9 42')
-        mock_system.assert_called_with('pkill -fe -9 "tail -f /dev/null"')
+        mock_run.assert_called_once_with(["pkill", "-fe", "-9", "tail -f /dev/null"], check=False)
 
 
 def test_cfs_controller_shutdown(cfs_controller_inited, utils):
@@ -1410,6 +1450,29 @@ def test_cfs_controller_validate_cc_value(cfs_controller_inited):
     assert cfs_controller_inited.validate_cc_value(cfs_controller_inited.mid_map['TO_SEND_HK_MID'], '') == ''
 
 
+def test_cfs_controller_validate_mid_index(cfs_controller):
+    """
+    Test CfsController class validate_mid_value and validate_cc_value methods with numeric values:
+    the reverse lookup indexes follow the MID map, and are rebuilt when it is replaced.
+    """
+    cfs_controller.macro_map = {}
+    cfs_controller.mid_map = {'A_CMD_MID': {'MID': 0x1880, 'CC': {'A_NOOP_CC': {'CODE': 0}, 'A_SET_CC': {'CODE': 1}}},
+                              'B_CMD_MID': {'MID': 0x1880, 'CC': {'B_SET_CC': {'CODE': 1}}}}
+    assert cfs_controller.validate_mid_value(0x1880) == 'A_CMD_MID'
+    assert cfs_controller.validate_mid_value('0x1880') == 'A_CMD_MID'
+    assert cfs_controller.validate_cc_value(cfs_controller.mid_map['A_CMD_MID'], 1) == 'A_SET_CC'
+    assert cfs_controller.validate_cc_value(cfs_controller.mid_map['A_CMD_MID'], '0') == 'A_NOOP_CC'
+    # entries sharing a MID value with the indexed entry are still resolved
+    assert cfs_controller.validate_cc_value(cfs_controller.mid_map['B_CMD_MID'], 1) == 'B_SET_CC'
+    assert cfs_controller.validate_cc_value(cfs_controller.mid_map['B_CMD_MID'], 0) is None
+    mid_index = cfs_controller.mid_index
+
+    cfs_controller.mid_map = {'C_CMD_MID': {'MID': 0x1881, 'CC': {}}}
+    assert cfs_controller.validate_mid_value(0x1880) is None
+    assert cfs_controller.validate_mid_value(0x1881) == 'C_CMD_MID'
+    assert cfs_controller.mid_index is not mid_index
+
+
 def test_cfs_controller_validate_cc_value_invalid(cfs_controller_inited, utils):
     """
     Test CfsController class validate_cc_value method: return None for invalid input
@@ -13,6 +13,7 @@
 # either expressed or implied.
 import ctypes
 import socket
+import struct
 from unittest.mock import patch, MagicMock, mock_open, seal
 
 import pytest
@@ -65,12 +66,14 @@ def test_cfs_interface_init(cfs):
     assert cfs.command
     assert cfs.telemetry
     assert [mid in cfs.mid_payload_map for mid in [8198, 10891, 8199, 1337]]
+    assert cfs.cmd_arg_class_map[(10891, cfs.mid_payload_map[10891]['TO_ENABLE_OUTPUT_CC']['CODE'])] is \
+        cfs.mid_payload_map[10891]['TO_ENABLE_OUTPUT_CC']['ARG_CLASS']
     assert cfs.output_manager
     assert cfs.cfs_std_out_path is None
     assert cfs.evs_log_file is None
     assert cfs.tlm_log_file is None
     assert cfs.tlm_has_been_received is False
-    assert cfs.unchecked_packet_mids == []
+    assert cfs.unchecked_packet_mids == set()
     assert cfs.tlm_verifications_by_mid_and_vid == {}
     assert cfs.cmd_packet_list == []
     assert cfs.received_mid_packets_dic == {
@@ -152,6 +155,31 @@ def test_cfs_interface_write_tlm_log(cfs, utils):
         assert utils.has_log_level('ERROR')
 
 
+def test_cfs_interface_write_tlm_log_async(cfs):
+    header = cfs.ccsds.CcsdsTelemetry()
+    cfs.log_writer = MagicMock()
+    with patch('builtins.open', new_callable=mock_open()) as mock_file:
+        cfs.config.telemetry_debug = False
+        cfs.write_tlm_log(None, bytearray(4), header, MagicMock())
+        # the record is rendered by the log writer
+        assert mock_file.return_value.write.call_count == 1
+        cfs.log_writer.write.assert_called_once()
+        assert cfs.log_writer.write.call_args[0][0] is cfs.tlm_log_file
+        cfs.stop_cfs()
+        cfs.log_writer.stop.assert_called_once()
+
+
+def test_cfs_interface_write_tlm_log_binary(cfs):
+    header = cfs.ccsds.CcsdsTelemetry()
+    cfs.config.tlm_log_format = "binary"
+    with patch('builtins.open', new_callable=mock_open()) as mock_file:
+        cfs.config.telemetry_debug = False
+        cfs.write_tlm_log(None, bytearray(4), header, MagicMock())
+        assert cfs.tlm_bin_file is mock_file.return_value
+        mock_file.assert_called_with('./cfs_tlm_msgs.bin', 'ab')
+        assert isinstance(mock_file.return_value.write.call_args[0][0], bytes)
+
+
 def test_cfs_interface_write_tlm_error_log_io_error(cfs, utils):
     assert cfs.tlm_log_file is None
     assert not utils.has_log_level('ERROR')
@@ -225,7 +253,7 @@ def test_cfs_interface_read_sb_packets_valid(cfs, utils):
         cfs.read_sb_packets()
         assert mock_tlm.read_socket.call_count == 2
         assert cfs.received_mid_packets_dic[8198]
-        assert cfs.unchecked_packet_mids == [8198]
+        assert cfs.unchecked_packet_mids == {8198}
         assert not utils.has_log_level('ERROR')
 
         # read valid cmd
@@ -233,7 +261,7 @@ def test_cfs_interface_read_sb_packets_valid(cfs, utils):
         cfs.read_sb_packets()
         assert mock_tlm.read_socket.call_count == 2
         assert cfs.received_mid_packets_dic[10891]
-        assert cfs.unchecked_packet_mids == [8198, 10891]
+        assert cfs.unchecked_packet_mids == {8198, 10891}
         assert not utils.has_log_level('ERROR')
 
 
@@ -336,6 +364,50 @@ def test_cfs_interface_read_sb_packets_invalid_headers(cfs, utils):
         assert not cfs.unchecked_packet_mids
 
 
+def test_cfs_interface_unpack_primary_header(cfs):
+    from plugins.cfs.pycfs.cfs_interface import unpack_primary_header
+    assert cfs.unpack_pheader
+    cmd = bytearray(b'\x1a\x8b\xc0\x05\x00\x1d\x00*\x00')
+    assert unpack_primary_header(cmd) == (True, 0x28b, 5, 0x1d)
+    pheader = cfs.ccsds.CcsdsPrimaryHeader.from_buffer_copy(cmd)
+    assert (pheader.is_command(), pheader.app_id, pheader.get_sequence_count(), pheader.length) == \
+        unpack_primary_header(cmd)
+    assert unpack_primary_header(memoryview(b'\x08\x06\xc0\x08\x00\xa5')) == (False, 0x6, 8, 0xa5)
+    with pytest.raises(struct.error):
+        unpack_primary_header(b'\x00\x00')
+
+
+def test_cfs_interface_is_standard_primary_header():
+    from plugins.cfs.pycfs.cfs_interface import is_standard_primary_header
+    from plugins.ccsds_plugin.ccsds_primary_header import CcsdsPrimaryHeaderBase
+
+    class ProjectPrimaryHeader(CcsdsPrimaryHeaderBase):
+        def get_msg_id(self) -> int:
+            return self.app_id
+
+    class ExtendedPrimaryHeader(CcsdsPrimaryHeaderBase):
+        _fields_ = [("extension", ctypes.c_uint16)]
+
+    assert is_standard_primary_header(CcsdsPrimaryHeaderBase)
+    assert not is_standard_primary_header(ProjectPrimaryHeader)
+    assert not is_standard_primary_header(ExtendedPrimaryHeader)
+    assert not is_standard_primary_header(None)
+
+
+def test_cfs_interface_read_sb_packets_pheader_structure(cfs, utils):
+    # primary headers without the standard layout are decoded as structures
+    cfs.unpack_pheader = False
+    recvd = [b':\x8b\xc0\x00\x00\x1d\x00*\x00\x00\x02\x02127.0.0.1'
+             b'\x00\x00\x00\x00\x00\x00\x00\x93\x13\x00\x00\x00\x00\x00\x00', b'\x00\x00', 0]
+    with patch.object(cfs, 'telemetry') as mock_tlm:
+        mock_tlm.read_socket.side_effect = recvd
+        cfs.read_sb_packets()
+        assert mock_tlm.read_socket.call_count == 3
+        assert cfs.received_mid_packets_dic[10891]
+        assert cfs.unchecked_packet_mids == {10891}
+        assert utils.has_log_level('ERROR')
+
+
 def test_cfs_interface_read_sb_packets_timeout(cfs, utils):
     with patch.object(cfs, 'telemetry') as mock_tlm:
         mock_tlm.read_socket.side_effect = socket.timeout
@@ -344,6 +416,49 @@ def test_cfs_interface_read_sb_packets_timeout(cfs, utils):
         assert utils.has_log_level('WARNING')
 
 
+class LazyPayloadStruct(ctypes.LittleEndianStructure):
+    _pack_ = 1
+    _fields_ = [('first', ctypes.c_uint16), ('second', ctypes.c_uint16)]
+
+
+def test_cfs_interface_parse_telemetry_packet_lazy(cfs, utils):
+    header = b'(\x06\xc0\x08\x00\xa5\x0c \x00B,F\x0f\x00V\xba'
+    cfs.mid_payload_map[8198] = LazyPayloadStruct
+    cfs.payload_size_by_mid[8198] = ctypes.sizeof(LazyPayloadStruct)
+    cfs.should_skip_header = True
+    with patch.object(cfs, 'write_tlm_log') as mock_log, patch.object(cfs, 'write_evs_log'):
+        assert cfs.parse_telemetry_packet(bytearray(header + b'\x01\x00\x02\x00')) == 8198
+        packet = cfs.received_mid_packets_dic[8198][-1]
+        assert bytes(packet.raw_payload) == b'\x01\x00\x02\x00'
+        assert packet.payload.first == 1 and packet.payload.second == 2
+        assert packet.payload is packet.payload
+        mock_log.assert_called_once()
+
+        # packets too short for the payload type are rejected without being decoded
+        cfs.has_received_mid[8198] = False
+        assert cfs.parse_telemetry_packet(bytearray(header + b'\x01\x00')) is None
+        assert len(cfs.received_mid_packets_dic[8198]) == 1
+        assert utils.has_log_level('ERROR')
+
+
+def test_cfs_interface_lazy_packet_decode_fail(utils):
+    from plugins.cfs.pycfs.cfs_interface import LazyPacket
+    packet = LazyPacket(8198, None, LazyPayloadStruct, memoryview(bytearray(2)), 1, 1.0)
+    assert packet.payload is None
+    assert utils.has_log_level('ERROR')
+
+
+def test_cfs_interface_subscription(cfs):
+    cfs.subscribe(8198)
+    cfs.on_packet_received(8199, None, None)
+    assert not cfs.subscription_updated
+    cfs.on_packet_received(8198, None, None)
+    assert cfs.subscription_updated
+    cfs.clear_subscriptions()
+    assert not cfs.subscribed_mids
+    assert not cfs.subscription_updated
+
+
 def test_cfs_interface_parse_telemetry_packet_crc_check_fail(cfs_interface_gw, utils, workspace):
     if workspace['type'] == 'open_source':
         return
@@ -390,49 +505,68 @@ def test_cfs_interface_remove_tlm_condition(cfs, mid_map, utils):
 
 
 def test_cfs_check_tlm_conditions(cfs, mid_map):
-    # ignore the logic of check_tlm_value for this test, because only pass/fail matters
-    with patch.object(cfs, 'check_tlm_value') as mock_check:
+    mid = 8198
+    # ignore the logic of the predicate for this test, because only pass/fail matters
+    with patch.object(cfs, 'compile_tlm_args') as mock_compile:
+        mock_check = mock_compile.return_value.check
         # test no unchecked packets
         assert not cfs.unchecked_packet_mids
         cfs.check_tlm_conditions()
         mock_check.assert_not_called()
 
         # test no matching verification
-        cfs.unchecked_packet_mids.append(8198)
+        cfs.unchecked_packet_mids.add(mid)
         cfs.check_tlm_conditions()
         assert not cfs.unchecked_packet_mids
         mock_check.assert_not_called()
 
-        # test placeholder only
-        cfs.unchecked_packet_mids.append(8198)
-        cfs.add_tlm_condition('v_id1', mid_map['CFE_EVS_LONG_EVENT_MSG_MID'], 'v_id1 args')
-        cfs.received_mid_packets_dic[8198].append(Packet(8198, None, MagicMock(), 1, 0.0))
+        # test packets received before the condition is added are not checked
+        cfs.on_packet_received(mid, None, MagicMock())
+        assert cfs.add_tlm_condition('v_id1', mid_map['CFE_EVS_LONG_EVENT_MSG_MID'], 'v_id1 args')
         cfs.check_tlm_conditions()
         assert not cfs.unchecked_packet_mids
         mock_check.assert_not_called()
 
-        # test check pass
-        cfs.unchecked_packet_mids.append(8198)
-        cfs.received_mid_packets_dic[8198].append(Packet(8198, None, MagicMock(), 1, 1.0))
+        # test check pass, with each new packet checked once
         mock_check.return_value = True
+        cfs.on_packet_received(mid, None, MagicMock())
+        cfs.on_packet_received(mid, None, MagicMock())
         cfs.check_tlm_conditions()
         assert not cfs.unchecked_packet_mids
-        mock_check.assert_called_once_with(mid_map['CFE_EVS_LONG_EVENT_MSG_MID'],
-                                           'v_id1 args',
-                                           discard_old_packets=False)
+        assert mock_check.call_count == 2
+        verification = cfs.tlm_verifications_by_mid_and_vid[mid]['v_id1']
+        assert verification.passed
+        assert verification.pass_count == 2
+        mock_compile.assert_called_once_with('v_id1 args')
         mock_check.reset_mock()
 
-        # test other conditions present
+        # test packets without payload are skipped
+        cfs.on_packet_received(mid, None, None)
+        cfs.check_tlm_conditions()
+        mock_check.assert_not_called()
 
-        # test check fail
+        # test check fail, with the packets after the failed one checked next time
+        mock_check.side_effect = [False, True]
+        cfs.config.remove_continuous_on_fail = False
+        cfs.on_packet_received(mid, None, MagicMock())
+        cfs.on_packet_received(mid, None, MagicMock())
+        with pytest.raises(CtfConditionError):
+            cfs.check_tlm_conditions()
+        assert verification.fail_count == 1
+        assert cfs.unchecked_packet_mids == {mid}
+        cfs.check_tlm_conditions()
+        assert verification.pass_count == 3
+        assert not cfs.unchecked_packet_mids
+
+        # test condition removed on failure
+        mock_check.side_effect = None
         mock_check.return_value = False
-        cfs.unchecked_packet_mids.append(8198)
-        cfs.received_mid_packets_dic[8198].append(Packet(8198, None, MagicMock(), 1, 1.0))
+        cfs.config.remove_continuous_on_fail = True
+        cfs.on_packet_received(mid, None, MagicMock())
         with pytest.raises(CtfConditionError):
             cfs.check_tlm_conditions()
-        # assert condition was removed
-        # assert not verification.passed
-        # assert not verification.pass_count
+        assert 'v_id1' not in cfs.tlm_verifications_by_mid_and_vid[mid]
+        assert 'v_id1' not in cfs.tlm_verification_mids
 
 
 def test_cfs_send_command(cfs):
@@ -441,6 +575,12 @@ def test_cfs_send_command(cfs):
     cfs.command.send_command.assert_called_once_with('mid', 'cc', bytearray(0x1), None)
 
 
+def test_cfs_send_command_burst(cfs):
+    cfs.command.send_command_burst.return_value = (2, 0, 0.5)
+    assert cfs.send_command_burst('mid', 'cc', bytearray(0x1), 2, rate=4) == (2, 0, 0.5)
+    cfs.command.send_command_burst.assert_called_once_with('mid', 'cc', bytearray(0x1), 2, 4, None, None)
+
+
 def test_cfs_check_strings(cfs):
     assert cfs.check_strings('foo', 'foo', True) is True
     assert cfs.check_strings('foo', 'foo', False) is False
@@ -735,6 +875,66 @@ def test_cfs_check_tlm_value(cfs, mid_map, utils):
     utils.clear_log()
 
 
+def test_cfs_check_tlm_value_cursor_limit(cfs, mid_map):
+    Global.time_manager.exec_time = 10.0
+    Global.current_verification_start_time = 0.0
+    Global.current_verification_stage = CtfVerificationStage.polling
+    mid = mid_map['MOCK_TLM_MID']['MID']
+    cfs.received_mid_packets_dic[mid].append(Packet(mid, None, MagicMock(), 1, 1.0))
+    with patch.object(cfs, 'check_tlm_packet', return_value=False), \
+            patch('plugins.cfs.pycfs.cfs_interface.TLM_CHECK_CURSOR_LIMIT', 2):
+        for value in range(5):
+            assert not cfs.check_tlm_value(mid, [{'compare': '==', 'variable': 'Payload.foo', 'value': value}],
+                                           discard_old_packets=False)
+            assert len(cfs.tlm_check_cursors) <= 2
+    cfs.tlm_check_cursors.clear()
+
+
+def test_cfs_check_tlm_value_incremental(cfs, mid_map):
+    Global.time_manager.exec_time = 10.0
+    Global.current_verification_start_time = 0.0
+    mid = mid_map['MOCK_TLM_MID']['MID']
+    args = [{'compare': '==', 'variable': 'Payload.foo', 'value': 42}]
+    cfs.received_mid_packets_dic[mid].append(Packet(mid, None, MagicMock(), 1, 1.0))
+    cfs.received_mid_packets_dic[mid].append(Packet(mid, None, MagicMock(), 2, 2.0))
+
+    with patch.object(cfs, 'check_tlm_packet', return_value=False) as mock_check:
+        Global.current_verification_stage = CtfVerificationStage.first_ver
+        assert not cfs.check_tlm_value(mid, args, discard_old_packets=False)
+        assert mock_check.call_count == 2
+
+        # packets rejected by a previous poll are not checked again
+        Global.current_verification_stage = CtfVerificationStage.polling
+        mock_check.reset_mock()
+        assert not cfs.check_tlm_value(mid, args, discard_old_packets=False)
+        mock_check.assert_not_called()
+        cfs.received_mid_packets_dic[mid].append(Packet(mid, None, MagicMock(), 3, 3.0))
+        assert not cfs.check_tlm_value(mid, args, discard_old_packets=False)
+        assert mock_check.call_count == 1
+
+        # checks with other arguments or without the cursor check every packet
+        mock_check.reset_mock()
+        assert not cfs.check_tlm_value(mid, args, discard_old_packets=False, use_cursor=False)
+        assert not cfs.check_tlm_value(mid, [{'compare': '==', 'variable': 'Payload.foo', 'value': 1}],
+                                       discard_old_packets=False)
+        assert mock_check.call_count == 6
+
+        # a new verification checks every packet again
+        Global.current_verification_stage = CtfVerificationStage.first_ver
+        mock_check.reset_mock()
+        mock_check.return_value = True
+        assert cfs.check_tlm_value(mid, args, discard_old_packets=False)
+        assert mock_check.call_count == 1
+
+
+def test_cfs_compile_tlm_args(cfs):
+    args = [{'compare': '==', 'variable': 'Payload.foo', 'value': 42}]
+    predicate = cfs.compile_tlm_args(args)
+    assert cfs.compile_tlm_args([{'compare': '==', 'variable': 'Payload.foo', 'value': 42}]) is predicate
+    assert cfs.compile_tlm_args(args, repr(args)) is predicate
+    assert cfs.compile_tlm_args([{'compare': '!=', 'variable': 'Payload.foo', 'value': 42}]) is not predicate
+
+
 def test_cfs_check_tlm_packet(cfs):
     Global.current_verification_stage = CtfVerificationStage.first_ver
     payload = MagicMock()
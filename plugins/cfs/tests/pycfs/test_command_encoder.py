@@ -0,0 +1,116 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+import ctypes
+from unittest.mock import Mock, patch
+
+import pytest
+
+from plugins.cfs.cfs_config import CfsConfig
+from plugins.cfs.pycfs.cfs_controllers import CfsController
+from plugins.cfs.pycfs.command_encoder import CommandEncoder, UnsupportedLayoutError, get_command_encoder
+
+
+def create_arg_class(structure_base):
+    inner = type("Inner", (structure_base,), {"_pack_": 1, "_fields_": [
+        ("Flags", ctypes.c_uint8, 3),
+        ("Mode", ctypes.c_uint8, 5),
+        ("Value", ctypes.c_int32),
+    ]})
+    return type("Args", (structure_base,), {"_pack_": 1, "_fields_": [
+        ("Code", ctypes.c_uint16),
+        ("Inner", inner),
+        ("Items", inner * 2),
+        ("Name", ctypes.c_char * 6),
+        ("Table", ctypes.c_uint16 * 3),
+        ("Gain", ctypes.c_float),
+        ("Scale", ctypes.c_double),
+        ("Enabled", ctypes.c_uint8),
+        ("Bits", ctypes.c_uint16, 12),
+        ("Spare", ctypes.c_uint16, 4),
+    ]})
+
+
+def fill_args(arg_class):
+    args = arg_class()
+    args.Code = 0x1234
+    args.Inner.Flags = 5
+    args.Inner.Mode = 17
+    args.Inner.Value = -2
+    args.Items[1].Flags = 3
+    args.Items[1].Value = 0x01020304
+    args.Name = b"abc"
+    args.Table[0] = 64
+    args.Table[2] = 512
+    args.Gain = 1.5
+    args.Scale = -0.25
+    args.Enabled = 1
+    args.Bits = 0xABC
+    args.Spare = 0xF
+    return args
+
+
+@pytest.fixture(name="controller")
+def _controller():
+    return CfsController(CfsConfig("cfs"))
+
+
+@pytest.mark.parametrize("structure_base, endianness", [(ctypes.LittleEndianStructure, "little"),
+                                                         (ctypes.BigEndianStructure, "big")])
+def test_command_encoder_matches_field_walk(controller, structure_base, endianness):
+    controller.ccsds_reader = Mock(ctype_structure=structure_base)
+    controller.config.endianess_of_target = endianness
+    args = fill_args(create_arg_class(structure_base))
+
+    with patch("plugins.cfs.pycfs.cfs_controllers.get_command_encoder", return_value=None):
+        expected = controller.encode_ctypes_to_bytes(args)
+    encoder = get_command_encoder(type(args), type(structure_base), endianness)
+    assert encoder is not None
+    assert encoder.encode(args) == expected
+    assert controller.encode_ctypes_to_bytes(args) == expected
+    assert len(expected) == ctypes.sizeof(args)
+
+
+def test_get_command_encoder_cached():
+    arg_class = create_arg_class(ctypes.LittleEndianStructure)
+    structure_meta = type(ctypes.LittleEndianStructure)
+    encoder = get_command_encoder(arg_class, structure_meta, "little")
+    assert get_command_encoder(arg_class, structure_meta, "little") is encoder
+    # the encoder is recompiled for a different target byte order
+    big_encoder = get_command_encoder(arg_class, structure_meta, "big")
+    assert big_encoder is not encoder
+    assert big_encoder.endianness == "big"
+
+
+def test_command_encoder_unsupported(controller):
+    structure_meta = type(ctypes.LittleEndianStructure)
+    arg_class = type("MixedArgs", (ctypes.LittleEndianStructure,), {"_fields_": [
+        ("Little", ctypes.c_uint16),
+        ("Big", ctypes.c_uint16.__ctype_be__),
+    ]})
+    with pytest.raises(UnsupportedLayoutError):
+        CommandEncoder(arg_class, structure_meta, "little")
+    assert get_command_encoder(arg_class, structure_meta, "little") is None
+
+    # unsupported layouts are encoded by the field walk
+    controller.ccsds_reader = Mock(ctype_structure=ctypes.LittleEndianStructure)
+    args = arg_class(0x0102, 0x0304)
+    with patch("plugins.cfs.pycfs.cfs_controllers.get_command_encoder", return_value=None):
+        expected = controller.encode_ctypes_to_bytes(args)
+    assert expected == b"\x02\x01\x03\x04"
+    assert controller.encode_ctypes_to_bytes(args) == expected
+
+    nested_class = type("NestedArgs", (ctypes.LittleEndianStructure,),
+                        {"_fields_": [("Rows", (ctypes.c_uint8 * 2) * 2)]})
+    assert get_command_encoder(nested_class, structure_meta, "little") is None
@@ -83,3 +83,42 @@ def test_command_interface_send_command_error(cmdif):
         mocksock.sendto.assert_called_once()
         mocksock.close.assert_called_once()
         assert mocksock != cmdif.command_socket, "Socket has been replaced with a new instance"
+
+
+def test_command_interface_send_command_burst(cmdif):
+    mid = 0xABC
+    cc = 3
+    data = 0x12345678.to_bytes(4, "little")
+    with patch.object(cmdif, 'command_socket', spec=socket.socket) as mocksock:
+        mocksock.fileno.return_value = 1
+        mocksock.sendto.side_effect = lambda packet, address: len(packet)
+        result = cmdif.send_command_burst(mid, cc, data, 5)
+        assert result.sent == 5
+        assert result.failed == 0
+        assert mocksock.sendto.call_count == 5
+        packets = [args[0][0] for args in mocksock.sendto.call_args_list]
+        assert all(packet.endswith(data) for packet in packets)
+        # the sequence count is the low 14 bits of the second word of the primary header
+        assert [int.from_bytes(packet[2:4], "big") & 0x3FFF for packet in packets] == [0, 1, 2, 3, 4]
+        assert packets[1][4:] == packets[0][4:]
+
+        # sequence counts continue from the previous burst, and wrap after 14 bits
+        cmdif.sequence_count = 0x3FFF
+        mocksock.sendto.reset_mock()
+        assert cmdif.send_command_burst(mid, cc, data, 2, gap=0.01).elapsed >= 0.01
+        packets = [args[0][0] for args in mocksock.sendto.call_args_list]
+        assert [int.from_bytes(packet[2:4], "big") & 0x3FFF for packet in packets] == [0x3FFF, 0]
+
+
+def test_command_interface_send_command_burst_error(cmdif):
+    data = bytes(4)
+    with patch.object(cmdif, 'command_socket', spec=socket.socket) as mocksock:
+        mocksock.fileno.return_value = 1
+        mocksock.sendto.side_effect = socket.error("mock error")
+        result = cmdif.send_command_burst(0xABC, 3, data, 3, rate=1000)
+        # the remaining commands are sent on the new socket
+        assert result.failed >= 1
+        assert result.sent + result.failed == 3
+        mocksock.sendto.assert_called_once()
+        mocksock.close.assert_called_once()
+        assert mocksock != cmdif.command_socket, "Socket has been replaced with a new instance"
@@ -12,6 +12,8 @@
 # License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
 # either expressed or implied.
 
+import os
+from copy import copy
 from subprocess import PIPE, STDOUT
 from unittest.mock import patch, MagicMock, mock_open, Mock
 
@@ -124,6 +126,75 @@ def test_local_cfs_interface_build_cfs_error(localcfs, utils):
         assert utils.has_log_level('ERROR')
 
 
+def test_local_cfs_interface_build_cfs_cache(localcfs, tmp_path):
+    build_dir = tmp_path / "cfs"
+    (build_dir / "src").mkdir(parents=True)
+    (build_dir / "src" / "app.c").write_text("int main;")
+    (build_dir / "build" / "exe").mkdir(parents=True)
+    localcfs.config.build_cache = True
+    localcfs.config.build_cache_exclude = ["build"]
+    localcfs.config.cfs_build_dir = str(build_dir)
+    localcfs.config.cfs_run_dir = str(build_dir / "build" / "exe")
+    localcfs.config.cfs_exe = "core-cpu1"
+
+    def run_build_cmd():
+        (build_dir / "build" / "exe" / "core-cpu1").write_text("exe")
+        return True
+
+    with patch.object(localcfs, "run_build_cmd", side_effect=run_build_cmd) as mock_build:
+        assert localcfs.build_cfs()
+        assert (build_dir / ".ctf_build_fingerprint").exists()
+        # unchanged sources and changed build outputs do not trigger a build
+        (build_dir / "build" / "exe" / "cfe_es_startup.scr").write_text("startup")
+        assert localcfs.build_cfs()
+        assert mock_build.call_count == 1
+
+        # changed sources, build command or a missing executable trigger a build
+        (build_dir / "src" / "app.c").write_text("int main();")
+        assert localcfs.build_cfs()
+        localcfs.config.cfs_build_cmd = "make"
+        assert localcfs.build_cfs()
+        (build_dir / "build" / "exe" / "core-cpu1").unlink()
+        assert localcfs.build_cfs()
+        assert mock_build.call_count == 4
+
+        # changed sources in linked directories trigger a build, and link cycles are not followed
+        apps_dir = tmp_path / "apps"
+        apps_dir.mkdir()
+        (apps_dir / "sample_app.c").write_text("int app;")
+        (build_dir / "src" / "apps").symlink_to(apps_dir, target_is_directory=True)
+        (apps_dir / "cfs").symlink_to(build_dir, target_is_directory=True)
+        assert localcfs.build_cfs()
+        assert localcfs.build_cfs()
+        assert mock_build.call_count == 5
+        (apps_dir / "sample_app.c").write_text("int sample_app;")
+        assert localcfs.build_cfs()
+        assert mock_build.call_count == 6
+
+        # sources modified during the build trigger the next build
+        def run_build_cmd_edit():
+            (build_dir / "src" / "app.c").write_text("int main(int argc);")
+            return True
+
+        mock_build.side_effect = run_build_cmd_edit
+        (build_dir / "src" / "app.c").write_text("int main(char);")
+        assert localcfs.build_cfs()
+        mock_build.side_effect = run_build_cmd
+        assert localcfs.build_cfs()
+        assert mock_build.call_count == 8
+
+        # the fingerprint is only saved for successful builds
+        (build_dir / "src" / "app.c").write_text("int main(void);")
+        mock_build.side_effect = None
+        mock_build.return_value = False
+        assert not localcfs.build_cfs()
+        assert not (build_dir / ".ctf_build_fingerprint").exists()
+
+    localcfs.config.cfs_build_dir = str(tmp_path / "missing")
+    with pytest.raises(CtfTestError):
+        localcfs.build_cfs()
+
+
 def test_local_cfs_interface_start_cfs_pass(localcfs):
     with patch('os.path.exists', return_value=True), \
          patch('plugins.cfs.pycfs.local_cfs_interface.run') as mock_run, \
@@ -143,6 +214,54 @@ def test_local_cfs_interface_start_cfs_pass(localcfs):
         assert start['pid'] == 42
 
 
+def test_local_cfs_interface_start_cfs_parallel_workers(localcfs, tmp_path):
+    from plugins.cfs.pycfs.cfs_controllers import CfsController
+    from plugins.cfs.pycfs.local_cfs_interface import LocalCfsInterface
+    run_dir = tmp_path / "exe"
+    run_dir.mkdir()
+    exe = run_dir / "core-ctf-worker-test"
+    exe.write_text("#!/bin/sh\nwhile true; do sleep 1; done\n")
+    exe.chmod(0o755)
+    ram_drive = tmp_path / "ram"
+    config = localcfs.config
+    config.cfs_run_in_xterm = False
+    config.prepend_arg = ""
+    config.cfs_run_dir = str(run_dir)
+    config.cfs_ram_drive_path = str(ram_drive)
+    config.set_cfs_run_cmd(exe.name)
+    config.cfs_port_arg = True
+
+    # the configs of workers 1 and 2, whose command ports are offset by offset_worker_ports
+    worker_configs = [copy(config), copy(config)]
+    worker_configs[0].cmd_udp_port = 5110
+    worker_configs[1].cmd_udp_port = 5210
+    log_dir = Global.current_script_log_dir
+    Global.current_script_log_dir = str(tmp_path)
+    try:
+        pids = []
+        for worker_config in worker_configs:
+            localcfs.config = worker_config
+            start = localcfs.start_cfs("")
+            assert start["result"] is True
+            pids.append(start["pid"])
+            ram_drive.mkdir(exist_ok=True)
+        # the second worker does not remove the ram drive of the first one
+        assert ram_drive.exists()
+        # a worker cannot start its target twice
+        assert localcfs.start_cfs("")["result"] is False
+
+        # shutting down the target of one worker leaves the target of the other running
+        controller = CfsController(worker_configs[0])
+        controller.cfs_pid = pids[0]
+        assert controller.shutdown_cfs()
+        assert not LocalCfsInterface.find_cfs_processes(worker_configs[0].get_process_pattern())
+        assert LocalCfsInterface.find_cfs_processes(worker_configs[1].get_process_pattern())
+    finally:
+        Global.current_script_log_dir = log_dir
+        for worker_config in worker_configs:
+            os.system('pkill -9 -f "{}"'.format(worker_config.get_process_pattern()))
+
+
 def test_local_cfs_interface_start_cfs_pid_exist(localcfs, utils):
     with patch('os.path.exists', return_value=True), \
          patch('plugins.cfs.pycfs.local_cfs_interface.run') as mock_run, \
@@ -0,0 +1,64 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+import socket
+from unittest.mock import patch
+
+import pytest
+
+from plugins.cfs.pycfs.port_lease import PortLeaseRegistry, get_port_lease_registry
+
+
+@pytest.fixture(name="bound_socket")
+def _bound_socket():
+    bound_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    bound_socket.bind(("", 0))
+    yield bound_socket
+    bound_socket.close()
+
+
+def test_port_lease_registry_lease_ports(tmp_path, bound_socket):
+    port = bound_socket.getsockname()[1]
+    registry = PortLeaseRegistry(str(tmp_path))
+    other_registry = PortLeaseRegistry(str(tmp_path))
+
+    # ports in use are skipped
+    ports = registry.lease_ports("cfs_a", 2, port, port + 20)
+    assert len(ports) == 2 and port not in ports
+    assert registry.get_ports("cfs_a") == ports
+    assert (tmp_path / "port_{}.lock".format(ports[0])).read_text().split()[1] == "cfs_a"
+
+    # ports leased through another lease file are skipped
+    other_ports = other_registry.lease_ports("cfs_b", 2, port, port + 20)
+    assert not set(other_ports) & set(ports)
+
+    registry.release_owner("cfs_a")
+    assert registry.get_ports("cfs_a") == []
+    assert other_registry.lease_ports("cfs_c", 1, ports[0], ports[0]) == [ports[0]]
+
+
+def test_port_lease_registry_lease_ports_exhausted(tmp_path, utils):
+    registry = PortLeaseRegistry(str(tmp_path))
+    utils.clear_log()
+    with patch.object(PortLeaseRegistry, "is_port_free", side_effect=[True, False, False]):
+        assert registry.lease_ports("cfs", 2, 30000, 30002) is None
+    assert utils.has_log_level("ERROR")
+    # leases are not kept if the request cannot be met
+    assert registry.get_ports("cfs") == []
+
+
+def test_get_port_lease_registry(tmp_path):
+    registry = get_port_lease_registry(str(tmp_path))
+    assert get_port_lease_registry(str(tmp_path / ".." / tmp_path.name)) is registry
+    assert get_port_lease_registry(str(tmp_path / "other")) is not registry
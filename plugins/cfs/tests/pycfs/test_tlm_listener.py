@@ -12,7 +12,10 @@
 # License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
 # either expressed or implied.
 
-from socket import socket
+import struct
+import time
+from collections import deque
+from socket import socket, AF_INET, SOCK_DGRAM, SOL_SOCKET
 from unittest.mock import patch
 
 import pytest
@@ -67,3 +70,68 @@ def test_tlm_listener_read_socket_error(tlm_listener):
     with patch.object(tlm_listener, 'socket', spec=socket) as mocksock:
         mocksock.recv.side_effect = IOError("mock error")
         assert tlm_listener.read_socket() == 0
+
+
+@pytest.mark.parametrize("max_batch", [1, 8])
+def test_tlm_listener_receive_thread(max_batch):
+    from plugins.cfs.pycfs.tlm_listener import TlmListener
+    listener = TlmListener("127.0.0.1", 0, receive_thread=True, max_batch=max_batch)
+    try:
+        assert listener.is_receive_thread_running()
+        sender = socket(AF_INET, SOCK_DGRAM)
+        for i in range(3):
+            sender.sendto(bytes([i]) * 8, ("127.0.0.1", listener.get_port()))
+        sender.close()
+        deadline = time.time() + 2
+        while len(listener.receive_queue) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert [listener.read_socket() for _ in range(3)] == [bytes([i]) * 8 for i in range(3)]
+        assert listener.read_socket() == 0
+    finally:
+        listener.cleanup()
+    assert not listener.is_receive_thread_running()
+    assert listener.socket._closed
+
+
+def test_tlm_listener_receive_thread_queue_overflow(tlm_listener):
+    tlm_listener.receive_queue = deque(maxlen=2)
+    with patch.object(tlm_listener, 'socket', spec=socket) as mocksock:
+        mocksock.recv.side_effect = [b'1', b'2', b'3', IOError("would block")]
+        tlm_listener._drain_socket_to_queue()
+    assert list(tlm_listener.receive_queue) == [b'2', b'3']
+    assert tlm_listener.queue_overflow_count == 1
+
+
+def test_tlm_listener_stop_receive_thread_not_started(tlm_listener):
+    tlm_listener.stop_receive_thread()
+    assert tlm_listener.receive_thread is None
+
+
+def test_tlm_listener_read_socket_batch():
+    from plugins.cfs.pycfs.tlm_listener import TlmListener
+    listener = TlmListener("127.0.0.1", 0, max_batch=2, rcvbuf_size=65536)
+    try:
+        assert len(listener.receive_ring) == 2
+        sender = socket(AF_INET, SOCK_DGRAM)
+        for i in range(3):
+            sender.sendto(bytes([i]) * (i + 1), ("127.0.0.1", listener.get_port()))
+        sender.close()
+        time.sleep(0.05)
+        received = []
+        while True:
+            packet = listener.read_socket()
+            if not packet:
+                break
+            received.append(bytes(packet))
+        assert received == [b'\x00', b'\x01\x01', b'\x02\x02\x02']
+        assert listener.kernel_drop_count == 0
+    finally:
+        listener.cleanup()
+
+
+def test_tlm_listener_update_kernel_drop_count(tlm_listener):
+    from plugins.cfs.pycfs.tlm_listener import SO_RXQ_OVFL
+    tlm_listener._update_kernel_drop_count([(SOL_SOCKET, SO_RXQ_OVFL, struct.pack("I", 7))])
+    assert tlm_listener.kernel_drop_count == 7
+    tlm_listener._update_kernel_drop_count([])
+    assert tlm_listener.kernel_drop_count == 7
@@ -0,0 +1,100 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+import ctypes
+import io
+from unittest.mock import MagicMock
+
+from plugins.cfs.pycfs.tlm_log_writer import LogWriter, format_tlm_record, pack_binary_tlm_record, \
+    read_binary_tlm_log, render_binary_tlm_log
+
+
+class LogPayload(ctypes.Structure):
+    _fields_ = [('first', ctypes.c_uint16),
+                ('second', ctypes.c_uint16)]
+
+    def __str__(self):
+        return "first: {}\nsecond: {}".format(self.first, self.second)
+
+
+def test_format_tlm_record():
+    buf = bytearray(b'\x01\x00\x02\x00')
+    record = format_tlm_record(1.5, 0.0, 0x0801, 3, 100, 200, None, LogPayload, memoryview(buf))
+    assert record.startswith("1.5 - ")
+    assert record.endswith(": mid:0x801 seq: 3 timestamp_seconds: 100 timestamp_subseconds: 200\n"
+                           "\tfirst: 1\n\tsecond: 2\n")
+    # the payload is decoded from a copy of the buffer
+    buf[0] = 5
+    assert "first: 1" in format_tlm_record(1.5, 0.0, 0x0801, 3, 100, 200, LogPayload.from_buffer_copy(
+        b'\x01\x00\x02\x00'))
+
+
+def test_log_writer():
+    file1 = MagicMock()
+    file2 = MagicMock()
+    writer = LogWriter(queue_size=4)
+    for i in range(10):
+        writer.write(file1 if i % 2 else file2, "{}\n".format, i)
+    assert writer.thread.is_alive()
+    writer.stop()
+    assert writer.thread is None
+    assert [call[0][0] for call in file1.write.call_args_list] == ["1\n", "3\n", "5\n", "7\n", "9\n"]
+    assert file2.write.call_count == 5
+    file1.flush.assert_called()
+    file2.flush.assert_called()
+    # stopping a writer that was never started does nothing
+    LogWriter().stop()
+
+
+def test_log_writer_error(utils):
+    file = MagicMock()
+    file.write.side_effect = IOError('mock error')
+    writer = LogWriter()
+    writer.write(file, str, 1)
+    writer.stop()
+    assert utils.has_log_level('ERROR')
+
+
+def test_log_writer_render_error(utils):
+    file = MagicMock()
+
+    def render(packet):
+        return packet.missing_field
+
+    writer = LogWriter()
+    writer.write(file, render, None)
+    writer.write(file, "{}\n".format, 1)
+    writer.stop()
+    assert utils.has_log_level('ERROR')
+    # the records after a failed render are still written and flushed
+    file.write.assert_called_once_with("1\n")
+    file.flush.assert_called()
+
+
+def test_binary_tlm_log(tmp_path):
+    path = tmp_path / "tlm.bin"
+    with open(path, "wb") as bin_file:
+        bin_file.write(pack_binary_tlm_record(1.5, 0.0, 0x0801, 3, 100, 200, memoryview(b'\x01\x00\x02\x00')))
+        bin_file.write(pack_binary_tlm_record(2.5, 0.0, 0x0802, 4, 101, 201, b'\xff'))
+
+    records = list(read_binary_tlm_log(path))
+    assert records == [(1.5, 0.0, 0x0801, 3, 100, 200, b'\x01\x00\x02\x00'),
+                       (2.5, 0.0, 0x0802, 4, 101, 201, b'\xff')]
+
+    output = io.StringIO()
+    assert render_binary_tlm_log(path, {0x0801: LogPayload}, output) == 2
+    text = output.getvalue()
+    assert "mid:0x801 seq: 3 timestamp_seconds: 100 timestamp_subseconds: 200\n\tfirst: 1\n\tsecond: 2\n" in text
+    # payloads of unknown MIDs are rendered as hex
+    assert "mid:0x802 seq: 4 timestamp_seconds: 101 timestamp_subseconds: 201\n\tff\n" in text
@@ -0,0 +1,107 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from plugins.cfs.pycfs.cfs_interface import Packet
+from plugins.cfs.pycfs.tlm_packet_store import MidPacketBuffer, TlmPacketStore
+
+
+def make_packet(timestamp, mid=1337):
+    return Packet(mid, None, MagicMock(), 1, timestamp)
+
+
+def test_mid_packet_buffer_list_operations():
+    packets = [make_packet(float(i)) for i in range(4)]
+    buffer = MidPacketBuffer(packets=packets)
+    assert len(buffer) == 4
+    assert buffer[0] is packets[0]
+    assert buffer[-1] is packets[3]
+    assert buffer[1:3] == packets[1:3]
+    assert list(buffer) == packets
+    assert list(reversed(buffer)) == packets[::-1]
+    assert buffer == packets
+    assert buffer.appended_count == 4
+    with pytest.raises(IndexError):
+        _ = buffer[4]
+
+    buffer.clear()
+    assert not buffer
+    assert buffer == []
+    assert buffer.appended_count == 4
+
+
+def test_mid_packet_buffer_max_packets():
+    buffer = MidPacketBuffer(max_packets=3)
+    packets = [make_packet(float(i)) for i in range(5)]
+    for packet in packets:
+        buffer.append(packet)
+    assert buffer == packets[2:]
+    assert buffer.appended_count == 5
+
+
+def test_mid_packet_buffer_max_age():
+    buffer = MidPacketBuffer(max_age=2.0)
+    packets = [make_packet(t) for t in [0.0, 1.0, 1.5, 3.5]]
+    for packet in packets:
+        buffer.append(packet)
+    assert buffer == packets[2:]
+
+
+def test_mid_packet_buffer_discard_before_and_since():
+    packets = [make_packet(t) for t in [1.0, 2.0, 2.0, 3.0]]
+    buffer = MidPacketBuffer(packets=packets)
+    assert buffer.since(2.0) == packets[1:]
+    assert buffer.since(4.0) == []
+    buffer.discard_before(2.0)
+    assert buffer == packets[1:]
+    buffer.discard_before(5.0)
+    assert not buffer
+
+
+def test_mid_packet_buffer_appended_after():
+    buffer = MidPacketBuffer(max_packets=3)
+    packets = [make_packet(float(i)) for i in range(5)]
+    for packet in packets:
+        buffer.append(packet)
+    assert buffer.appended_after(3) == packets[3:]
+    # evicted packets are not returned
+    assert buffer.appended_after(0) == packets[2:]
+    assert buffer.appended_after(5) == []
+    buffer.clear()
+    assert buffer.appended_after(3) == []
+
+
+def test_mid_packet_buffer_compact():
+    from plugins.cfs.pycfs.tlm_packet_store import COMPACT_THRESHOLD
+    buffer = MidPacketBuffer(max_packets=10)
+    for i in range(COMPACT_THRESHOLD * 3):
+        buffer.append(make_packet(float(i)))
+    assert len(buffer) == 10
+    assert len(buffer._packets) < COMPACT_THRESHOLD * 2
+    assert buffer[-1].timestamp == COMPACT_THRESHOLD * 3 - 1
+
+
+def test_tlm_packet_store():
+    store = TlmPacketStore([1, 2], max_packets=2)
+    assert store == {1: [], 2: []}
+    assert isinstance(store[1], MidPacketBuffer)
+
+    packets = [make_packet(float(i), 1) for i in range(3)]
+    store[1] = packets
+    assert isinstance(store[1], MidPacketBuffer)
+    assert store[1] == packets[1:]
+    assert store[1].max_packets == 2
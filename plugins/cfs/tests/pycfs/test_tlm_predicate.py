@@ -0,0 +1,103 @@
+# MSC-26646-1, "Core Flight System Test Framework (CTF)"
+#
+# Copyright (c) 2019-2024 United States Government as represented by the
+# Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is governed by the NASA Open Source Agreement (NOSA) License and may be used,
+# distributed and modified only pursuant to the terms of that agreement.
+# See the License for the specific language governing permissions and limitations under the
+# License at https://software.nasa.gov/ .
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either expressed or implied.
+
+import ctypes
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from plugins.cfs.pycfs.tlm_predicate import compile_attribute_path, TlmComparison, TlmPredicate
+
+
+class Inner(ctypes.Structure):
+    _fields_ = [('Value', ctypes.c_uint16)]
+
+
+class Payload(ctypes.Structure):
+    _fields_ = [('Count', ctypes.c_uint8),
+                ('Data', Inner * 3),
+                ('Name', ctypes.c_char * 8)]
+
+
+@pytest.fixture(name='payload')
+def _payload():
+    payload = Payload(Count=5, Name=b'hello')
+    payload.Data[2].Value = 0x1234
+    return payload
+
+
+def test_compile_attribute_path(payload):
+    assert compile_attribute_path('Count')(payload) == 5
+    assert compile_attribute_path('Data[2].Value')(payload) == 0x1234
+    assert compile_attribute_path('Data[0x2].Value')(payload) == 0x1234
+    with pytest.raises(AttributeError):
+        compile_attribute_path('Data[2].Missing')(payload)
+    # invalid indices are reported when the attribute is read
+    get_attribute = compile_attribute_path('Data[x].Value')
+    with pytest.raises(ValueError):
+        get_attribute(payload)
+
+
+def test_tlm_comparison_numeric(utils):
+    cfs = MagicMock()
+    assert TlmComparison('0x1234', '==', None, None, cfs)(0x1234)
+    assert TlmComparison(4, '>', None, None, cfs)(5)
+    assert TlmComparison(0x30, '==', '&', 0xF0, cfs)(0x34)
+    assert TlmComparison(0x3F, '==', '|', 0x0F, cfs)(0x34)
+    assert not TlmComparison(4, '<', None, None, cfs)('x')
+    assert utils.has_log_level('ERROR')
+    cfs.check_value.assert_not_called()
+
+    # comparisons that cannot be resolved ahead of time are delegated to the interface
+    TlmComparison('abc', '==', None, None, cfs)(1)
+    TlmComparison(1, '==', '^', 1, cfs)(1)
+    TlmComparison('hello', 'streq', None, None, cfs)('hello')
+    assert cfs.check_value.call_count == 3
+
+
+def test_tlm_comparison_regex(utils):
+    cfs = MagicMock()
+    check = TlmComparison('^he.*o$', 'regex', None, None, cfs)
+    assert check('hello')
+    assert not check('world')
+    assert not check(5)
+    assert utils.has_log_level('WARNING')
+    cfs.check_value.assert_not_called()
+
+
+def test_tlm_predicate(payload):
+    cfs = MagicMock()
+    predicate = TlmPredicate([{'compare': '==', 'variable': 'Count', 'value': [5]},
+                              {'compare': '==', 'variable': 'Data[2].Value', 'value': '0x1234'},
+                              {'compare': '<', 'variable': 'Count', 'value': 4, 'tolerance': 1}], cfs)
+    assert predicate.check(payload)
+    payload.Count = 6
+    assert not predicate.check(payload)
+
+    # arrays are compared by the interface
+    predicate = TlmPredicate([{'compare': '==', 'variable': 'Data', 'value': {'Value': 0x1234}}], cfs)
+    predicate.check(payload)
+    cfs.check_array_value.assert_called_once()
+    assert cfs.check_array_value.call_args[0][1:] == ({'Value': 0x1234}, '==')
+
+    assert not TlmPredicate([{'compare': '==', 'variable': 'Missing', 'value': 1}], cfs).check(payload)
+    assert not TlmPredicate([{'compare': '==', 'variable': 'Count'}], cfs).check(payload)
+    assert TlmPredicate([], cfs).check(payload)
+
+
+def test_tlm_predicate_bytes():
+    cfs = MagicMock()
+    predicate = TlmPredicate([{'compare': 'regex', 'variable': 'Name', 'value': 'hel+o'}], cfs)
+    assert predicate.check(SimpleNamespace(Name=b'hello'))
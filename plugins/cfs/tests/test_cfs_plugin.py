@@ -12,6 +12,8 @@
 # License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
 # either expressed or implied.
 
+import re
+import time
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -43,7 +45,7 @@ def test_cfs_plugin_init(cfs_plugin):
 
 
 def test_cfs_plugin_instruction_sets(cfs_plugin):
-    assert len(cfs_plugin.command_map) == 17
+    assert len(cfs_plugin.command_map) == 18
     assert "RegisterCfs" in cfs_plugin.command_map
     assert "BuildCfs" in cfs_plugin.command_map
     assert "StartCfs" in cfs_plugin.command_map
@@ -51,6 +53,7 @@ def test_cfs_plugin_instruction_sets(cfs_plugin):
     assert "SendCfsCommand" in cfs_plugin.command_map
     assert "SendCfsCommandWithPayloadLength" in cfs_plugin.command_map
     assert "SendCfsCommandWithRawPayload" in cfs_plugin.command_map
+    assert "SendCfsCommandBurst" in cfs_plugin.command_map
     assert "CheckTlmValue" in cfs_plugin.command_map
     assert "CheckTlmPacket" in cfs_plugin.command_map
     assert "CheckNoTlmPacket" in cfs_plugin.command_map
@@ -145,6 +148,51 @@ def test_cfs_plugin_register_cfs_fail_init(cfs_plugin):
         assert cfs_plugin.has_attempted_register
 
 
+def test_cfs_plugin_register_cfs_port_lease(cfs_plugin, tmp_path):
+    assert not cfs_plugin.targets
+    Global.config.set("cfs", "port_lease", "true")
+    Global.config.set("cfs", "port_lease_dir", str(tmp_path))
+    try:
+        with patch('plugins.cfs.cfs_plugin.CfsConfig.get_error_count', return_value=0):
+            with patch.object(cfs_plugin.protocols['local'][1].return_value, 'initialize', return_value=False):
+                assert not cfs_plugin.register_cfs('cfs')
+            # leases of targets failing to initialize are released
+            assert not cfs_plugin.port_lease_dirs
+
+            assert cfs_plugin.register_cfs('cfs')
+            config = cfs_plugin.protocols['local'][1].call_args[0][0]
+            assert 20000 <= config.cmd_udp_port < config.tlm_udp_port <= 29999
+            assert config.cfs_port_arg
+            assert (tmp_path / "port_{}.lock".format(config.cmd_udp_port)).exists()
+
+            cfs_plugin.shutdown()
+            assert not cfs_plugin.port_lease_dirs
+            with patch("plugins.cfs.cfs_plugin.get_port_lease_registry") as mock_registry:
+                mock_registry.return_value.lease_ports.return_value = None
+                assert not cfs_plugin.register_cfs('cfs')
+    finally:
+        Global.config.remove_option("cfs", "port_lease")
+        Global.config.remove_option("cfs", "port_lease_dir")
+
+
+def test_cfs_plugin_lease_target_ports_process_pattern(cfs_plugin, tmp_path):
+    from plugins.cfs.cfs_config import CfsConfig
+    configs = [CfsConfig("cfs"), CfsConfig("cfs")]
+    for index, config in enumerate(configs):
+        config.name = "cfs{}".format(index)
+        config.port_lease_dir = str(tmp_path)
+        assert cfs_plugin.lease_target_ports(config)
+    try:
+        # each leased target only matches the cFS process started with its own command port
+        command_lines = ["./{} -p {}".format(config.cfs_run_cmd, config.cmd_udp_port) for config in configs]
+        for config, command_line, other_command_line in zip(configs, command_lines, reversed(command_lines)):
+            assert re.search(config.get_process_pattern(), command_line)
+            assert not re.search(config.get_process_pattern(), other_command_line)
+    finally:
+        for config in configs:
+            cfs_plugin.release_target_ports(config.name)
+
+
 def test_cfs_plugin_register_cfs_local(cfs_plugin):
     assert not cfs_plugin.targets
     cfs_plugin.register_cfs('cfs')
@@ -375,6 +423,21 @@ def test_cfs_plugin_send_raw_cfs_command_pass(cfs_plugin):
     mock_controller.send_raw_cfs_command.assert_called_with("mid", 1, "", {})
 
 
+def test_cfs_plugin_send_cfs_command_burst(cfs_plugin):
+    num_controllers = 3
+    mock_controller = MagicMock()
+    mock_controller.send_cfs_command_burst.return_value = True
+    cfs_plugin.targets = {i: mock_controller for i in range(num_controllers)}
+    cfs_plugin.has_attempted_register = True
+    assert cfs_plugin.send_cfs_command_burst("mid", 1, {'args': True}, 100, rate=50)
+    assert mock_controller.send_cfs_command_burst.call_count == num_controllers
+    mock_controller.send_cfs_command_burst.assert_called_with("mid", 1, {'args': True}, 100, 50, None, None)
+
+    mock_controller.send_cfs_command_burst.side_effect = [True, False, True]
+    assert not cfs_plugin.send_cfs_command_burst("mid", 1, {}, 10, gap=0.1, header={})
+    mock_controller.send_cfs_command_burst.assert_called_with("mid", 1, {}, 10, None, 0.1, {})
+
+
 def test_cfs_plugin_send_raw_cfs_command_fail(cfs_plugin):
     num_controllers = 3
     mock_controller = MagicMock()
@@ -765,6 +828,48 @@ def test_cfs_plugin_archive_cfs_files_error(cfs_plugin, utils):
     assert utils.has_log_level("ERROR")
 
 
+def create_timed_controller(name, duration, error=None):
+    controller = MagicMock()
+    controller.config.name = name
+
+    def start_cfs(_run_args):
+        Global.time_manager.wait(duration)
+        if error:
+            raise error
+        return True
+
+    controller.start_cfs.side_effect = start_cfs
+    return controller
+
+
+def test_cfs_plugin_run_on_targets_concurrent(cfs_plugin):
+    targets = [create_timed_controller("cfs_{}".format(index), 0.2) for index in range(3)]
+    time_manager = CfsTimeManager({})
+    with patch.object(Global, "time_manager", time_manager):
+        cfs_plugin.concurrent_targets = True
+        start_time = time.monotonic()
+        assert cfs_plugin.run_on_targets("start_cfs", targets, "-R") == [True, True, True]
+        # the targets wait at the same time, without polling telemetry
+        assert time.monotonic() - start_time < 0.5
+        assert 0.2 <= time_manager.exec_time < 0.5
+        assert not time_manager.concurrent
+        for target in targets:
+            target.start_cfs.assert_called_once_with("-R")
+
+        # errors are raised once all targets have finished
+        targets[0] = create_timed_controller("cfs_0", 0, CtfTestError("Mock error"))
+        with pytest.raises(CtfTestError, match="cfs_0"):
+            cfs_plugin.run_on_targets("start_cfs", targets, "")
+        for target in targets[1:]:
+            assert target.start_cfs.call_count == 2
+
+        # targets are handled one at a time by default
+        cfs_plugin.concurrent_targets = False
+        with pytest.raises(CtfTestError):
+            cfs_plugin.run_on_targets("start_cfs", targets, "")
+        assert targets[1].start_cfs.call_count == 2
+
+
 def test_cfs_plugin_shutdown(cfs_plugin):
     cfs_plugin.load_configured_targets()
     assert cfs_plugin.targets
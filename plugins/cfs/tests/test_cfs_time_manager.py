@@ -13,6 +13,8 @@
 # either expressed or implied.
 
 import logging
+import socket
+import time
 from unittest.mock import Mock, patch
 
 import pytest
@@ -114,6 +116,205 @@ def test_pre_command_target_not_connected(time_mgr, utils):
     assert utils.has_log_level("DEBUG")
 
 
+def create_telemetry_socket():
+    tlm_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    tlm_socket.bind(("127.0.0.1", 0))
+    tlm_socket.setblocking(False)
+    return tlm_socket
+
+
+def create_socket_target():
+    target = Mock()
+    target.cfs.telemetry.is_receive_thread_running.return_value = False
+    target.cfs.telemetry.socket = create_telemetry_socket()
+
+    def read_sb_packets():
+        try:
+            target.cfs.telemetry.socket.recv(1024)
+        except BlockingIOError:
+            pass
+
+    target.cfs.read_sb_packets.side_effect = read_sb_packets
+    return target
+
+
+def test_pre_command_selects_ready_targets():
+    targets = {"idle": create_socket_target(), "active": create_socket_target(), "mock": Mock()}
+    time_mgr = CfsTimeManager(targets)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sender.sendto(b"packet", targets["active"].cfs.telemetry.socket.getsockname())
+        time.sleep(0.05)
+        time_mgr.pre_command()
+        # only targets with received telemetry, or whose telemetry cannot be selected, are read
+        targets["active"].cfs.read_sb_packets.assert_called_once()
+        targets["mock"].cfs.read_sb_packets.assert_called_once()
+        targets["idle"].cfs.read_sb_packets.assert_not_called()
+        for target in targets.values():
+            target.cfs.output_manager.on_time_interval.assert_called_once()
+        assert set(time_mgr.registered_sockets) == {"idle", "active"}
+
+        # re-created sockets are registered again, and disconnected targets are removed
+        targets["active"].cfs.telemetry.socket.close()
+        targets["active"].cfs.telemetry.socket = create_telemetry_socket()
+        targets["idle"].cfs = None
+        sender.sendto(b"packet", targets["active"].cfs.telemetry.socket.getsockname())
+        time.sleep(0.05)
+        time_mgr.pre_command()
+        assert targets["active"].cfs.read_sb_packets.call_count == 2
+        assert time_mgr.registered_sockets == {"active": targets["active"].cfs.telemetry.socket}
+
+        # targets drained by a receive thread are always read
+        targets["active"].cfs.telemetry.is_receive_thread_running.return_value = True
+        time_mgr.pre_command()
+        assert targets["active"].cfs.read_sb_packets.call_count == 3
+        assert not time_mgr.registered_sockets
+    finally:
+        sender.close()
+        for target in targets.values():
+            if target.cfs and isinstance(target.cfs.telemetry.socket, socket.socket):
+                target.cfs.telemetry.socket.close()
+
+
+def test_concurrent_section(time_mgr):
+    with patch("time.sleep") as mock_sleep, patch.object(time_mgr, "pre_command") as mock_pre, \
+            patch("time.monotonic", side_effect=[10.0, 12.5]):
+        with time_mgr.concurrent_section():
+            assert time_mgr.concurrent
+            # waits from threads handling targets only sleep
+            time_mgr.wait(2)
+        mock_sleep.assert_called_once_with(2)
+        mock_pre.assert_not_called()
+    assert not time_mgr.concurrent
+    assert time_mgr.exec_time == pytest.approx(2.5)
+
+
 def test_run_continuous_verifications(time_mgr):
     time_mgr.run_continuous_verifications()
     [target.cfs.check_tlm_conditions.assert_called_once() for target in time_mgr.cfs_targets.values()]
+
+
+@patch("plugins.cfs.cfs_time_manager.CfsTimeManager.post_command")
+def test_wait_realtime(mock_post, time_mgr):
+    clock = {"now": 100.0}
+
+    def sleep(seconds):
+        clock["now"] += seconds
+
+    def pre_command():
+        # each poll takes 0.2s of the 0.5s poll period
+        clock["now"] += 0.2
+
+    time_mgr.realtime_wait = True
+    time_mgr.monotonic_origin = 100.0
+    with patch("time.monotonic", side_effect=lambda: clock["now"]), patch("time.sleep", side_effect=sleep) as mock_sleep, \
+            patch.object(time_mgr, "pre_command", side_effect=pre_command) as mock_pre:
+        time_mgr.wait(1.25)
+        assert mock_pre.call_count == 3
+        assert mock_post.call_count == 3
+        assert [call.args[0] for call in mock_sleep.call_args_list] == pytest.approx([0.3, 0.3, 0.05])
+        assert time_mgr.exec_time == pytest.approx(1.25)
+        assert time_mgr.overrun_count == 0
+
+
+@patch("plugins.cfs.cfs_time_manager.CfsTimeManager.post_command")
+def test_wait_realtime_overrun(mock_post, time_mgr, utils):
+    clock = {"now": 10.0}
+
+    def sleep(seconds):
+        clock["now"] += seconds
+
+    def pre_command():
+        # polls take longer than the 0.5s poll period
+        clock["now"] += 0.7
+
+    time_mgr.realtime_wait = True
+    time_mgr.monotonic_origin = 10.0
+    # time spent executing instructions since the last wait is counted
+    clock["now"] += 2.0
+    with patch("time.monotonic", side_effect=lambda: clock["now"]), patch("time.sleep", side_effect=sleep) as mock_sleep, \
+            patch.object(time_mgr, "pre_command", side_effect=pre_command) as mock_pre:
+        time_mgr.wait(1)
+        assert mock_pre.call_count == 2
+        mock_sleep.assert_not_called()
+        assert time_mgr.exec_time == pytest.approx(3.4)
+        assert time_mgr.overrun_count == 2
+        assert utils.has_log_level("WARNING")
+
+
+@patch("plugins.cfs.cfs_time_manager.CfsTimeManager.post_command")
+def test_wait_realtime_overrun_end_deadline(mock_post, time_mgr):
+    clock = {"now": 10.0}
+    poll_times = [0.0, 0.0, 0.06]
+
+    def sleep(seconds):
+        if seconds < 0:
+            raise ValueError("sleep length must be non-negative")
+        clock["now"] += seconds
+
+    def pre_command():
+        # the last poll ends after the end of the wait but before the next poll is due
+        clock["now"] += poll_times.pop(0)
+
+    time_mgr.realtime_wait = True
+    time_mgr.monotonic_origin = 10.0
+    time_mgr.ctf_verification_poll_period = 0.1
+    with patch("time.monotonic", side_effect=lambda: clock["now"]), patch("time.sleep", side_effect=sleep) as mock_sleep, \
+            patch.object(time_mgr, "pre_command", side_effect=pre_command) as mock_pre:
+        time_mgr.wait(0.25)
+        assert mock_pre.call_count == 3
+        assert [call.args[0] for call in mock_sleep.call_args_list] == pytest.approx([0.1, 0.1])
+        assert time_mgr.exec_time == pytest.approx(0.26)
+        assert time_mgr.overrun_count == 0
+
+
+def test_wait_for_update_no_subscriptions(time_mgr):
+    time_mgr.cfs_targets["mock"].cfs.subscribed_mids = set()
+    with patch.object(time_mgr, "wait") as mock_wait:
+        time_mgr.wait_for_update(1)
+        mock_wait.assert_called_once_with(1)
+    time_mgr.cfs_targets["mock"].cfs.clear_subscriptions.assert_called_once()
+
+
+@patch("plugins.cfs.cfs_time_manager.CfsTimeManager.post_command")
+def test_wait_for_update(mock_post, time_mgr):
+    clock = {"now": 10.0}
+    cfs = time_mgr.cfs_targets["mock"].cfs
+    cfs.subscribed_mids = {0x0801}
+    cfs.subscription_updated = False
+    cfs.telemetry.is_receive_thread_running.return_value = False
+
+    def select(_read, _write, _error, timeout):
+        # a subscribed packet arrives 0.2s into the wait
+        clock["now"] += 0.2
+        cfs.subscription_updated = True
+        return [], [], []
+
+    with patch("time.monotonic", side_effect=lambda: clock["now"]), \
+            patch("select.select", side_effect=select) as mock_select, \
+            patch.object(time_mgr, "pre_command") as mock_pre:
+        time_mgr.wait_for_update(1)
+        assert mock_pre.call_count == 2
+        mock_select.assert_called_once_with([cfs.telemetry.socket], [], [], 0.5)
+        assert time_mgr.exec_time == pytest.approx(0.2)
+        cfs.clear_subscriptions.assert_called_once()
+
+
+@patch("plugins.cfs.cfs_time_manager.CfsTimeManager.post_command")
+def test_wait_for_update_timeout(mock_post, time_mgr):
+    clock = {"now": 10.0}
+    cfs = time_mgr.cfs_targets["mock"].cfs
+    cfs.subscribed_mids = {0x0801}
+    cfs.subscription_updated = False
+    cfs.telemetry.is_receive_thread_running.return_value = True
+
+    def sleep(seconds):
+        clock["now"] += seconds
+
+    with patch("time.monotonic", side_effect=lambda: clock["now"]), patch("time.sleep", side_effect=sleep), \
+            patch("plugins.cfs.cfs_time_manager.RECEIVE_THREAD_CHECK_PERIOD", 0.25), \
+            patch.object(time_mgr, "pre_command") as mock_pre:
+        time_mgr.wait_for_update(1)
+        # receive thread queues are checked more often than the poll period
+        assert mock_pre.call_count == 5
+        assert time_mgr.exec_time == pytest.approx(1)
@@ -83,6 +83,26 @@ def test_ctf_utility_resolve_dic_variable():
     Global.variable_store.clear()
 
 
+def test_ctf_utility_find_variable_args():
+    data = {'mid': 'MID', 'value': 'a$var_1$', 'args': [{'variable': 'x', 'value': '$var_1$'}],
+            'plain': ['$var_1$'], 'nested': {'$var_1$': 1}, 'cc': 5}
+    assert ctf_utility.find_variable_args(data) == ('value', 'args', 'nested')
+    assert ctf_utility.find_variable_args({'mid': 'MID'}) == ()
+    assert ctf_utility.find_variable_args({'$var_1$': 1}) is None
+    assert ctf_utility.find_variable_args(None) is None
+
+
+def test_ctf_utility_resolve_variable_args():
+    assert ctf_utility.set_variable('var_1', '=', 100)
+    data = {'mid': 'MID', 'value': 'a$var_1$', 'args': [{'variable': 'x', 'value': '$var_1$'}], 'plain': ['$var_1$']}
+    resolved = ctf_utility.resolve_variable_args(data, ctf_utility.find_variable_args(data))
+    assert resolved == resolve_dic_variable(data)
+    assert resolved['plain'] == data['plain']
+    assert resolved['plain'] is not data['plain']
+    assert data['value'] == 'a$var_1$'
+    Global.variable_store.clear()
+
+
 def test_ctf_utility_set_variable_pass():
     assert ctf_utility.set_variable('var_1', '=', 100)
     assert ctf_utility.set_variable('var_2', '=', 100)
@@ -22,3 +22,9 @@ def test_command():
     assert cmd.test == "Test"
     assert cmd.command_index == 0
     assert cmd.is_disabled is True
+
+
+def test_command_variable_args():
+    cmd = Instruction(1.0, {"instruction": "Command", "data": {"a": "$var$", "b": 1}}, 0, 0, False)
+    assert cmd.variable_args == ("a",)
+    assert Instruction(1.0, {"instruction": "Command"}, 0, 0, False).variable_args is None
@@ -44,10 +44,12 @@ Unit Test for Plugin class: The Plugin Manager is a CTF core component that mana
 # THE SOFTWARE.
 
 
+from inspect import signature
 from unittest.mock import patch
 import pytest
 from mock import Mock
 
+from lib.ctf_utility import resolve_dic_variable
 from lib.plugin_manager import Plugin, PluginManager, ArgTypes
 
 
@@ -88,6 +90,64 @@ def test_plugin_process_command(plugin, utils):
     plugin.verify_required_commands = ['CheckTlmValue', 'CheckTlmPacket', 'CheckNoTlmPacket']
 
     plugin.process_command(**kwargs)
+    mock_func.assert_called_once_with(target='', run_args='')
+
+    # the signature is computed once per instruction implementation
+    with patch("lib.plugin_manager.signature", wraps=signature) as mock_signature:
+        plugin.process_command(**kwargs)
+        plugin.process_command(**kwargs)
+        mock_signature.assert_not_called()
+        plugin.command_map = {'StartCfs': (lambda target, run_args: True, ['string', 'string'])}
+        assert plugin.process_command(**kwargs)
+        mock_signature.assert_called_once()
+
+    # only the arguments containing variables are resolved
+    with patch("lib.plugin_manager.resolve_dic_variable", wraps=resolve_dic_variable) as mock_resolve:
+        plugin.command_map = {'StartCfs': (mock_func, ['string', 'string'])}
+        mock_func.reset_mock()
+        plugin.process_command(instruction='StartCfs', data={'target': 'cfs', 'run_args': '$var$'},
+                               variable_args=())
+        mock_func.assert_called_once_with(target='cfs', run_args='$var$')
+        mock_resolve.assert_not_called()
+        plugin.process_command(**kwargs)
+        mock_resolve.assert_called_once()
+
+    # implementations may modify their arguments without modifying the instruction data
+    def append_arg(args):
+        args[0]['value'] = 2
+        args.append({'value': 3})
+        return True
+
+    data = {'args': [{'value': 1}]}
+    plugin.command_map = {'AppendArg': (append_arg, ['cmd_arg'])}
+    assert plugin.process_command(instruction='AppendArg', data=data, variable_args=())
+    assert data == {'args': [{'value': 1}]}
+
+
+def test_plugin_process_command_handler(plugin_manager):
+    """
+    test Plugin class method: process_command_handler
+    Invoke the implementation of a CTF Test Instruction given by a command table entry, without looking up the
+    implementation and its signature again.
+    """
+    example_plugin = plugin_manager.plugins['ExamplePlugin']
+    mock_func = Mock(return_value=True)
+    example_plugin.command_map['NewCommand'] = (lambda target, arg=None: mock_func(target, arg), ['string'])
+    handler = plugin_manager.find_command_handler('NewCommand')
+    assert (handler.required_args, handler.optional_args) == (1, 1)
+
+    with patch.object(example_plugin, "get_command_signature_info") as mock_signature_info:
+        for _ in range(3):
+            assert example_plugin.process_command_handler(handler, 'NewCommand', {'target': 'cfs'}, ())
+        mock_signature_info.assert_not_called()
+    assert mock_func.call_count == 3
+    mock_func.assert_called_with('cfs', None)
+
+    # invalid number of arguments
+    mock_func.reset_mock()
+    assert not example_plugin.process_command_handler(handler, 'NewCommand', {}, ())
+    mock_func.assert_not_called()
+    del example_plugin.command_map['NewCommand']
 
 
 def test_plugin_initialize(plugin, utils):
@@ -153,6 +213,34 @@ def test_plugin_manager_find_plugin_for_command(plugin_manager):
     assert plugin_manager.find_plugin_for_command('FailInstruction') is None
 
 
+def test_plugin_manager_find_command_handler(plugin_manager, utils):
+    """
+    test PluginManager class method: find_command_handler
+    Given a CTF Test Instruction, find the command table entry of the plugin that can execute that instruction.
+    """
+    cfs_plugin = plugin_manager.plugins['CFS Plugin']
+    handler = plugin_manager.find_command_handler('StartCfs')
+    assert handler.plugin is cfs_plugin
+    assert handler.func == cfs_plugin.command_map['StartCfs'][0]
+    assert list(handler.signature.parameters) == list(signature(cfs_plugin.command_map['StartCfs'][0]).parameters)
+    assert plugin_manager.find_command_handler('FailInstruction') is None
+
+    # instructions added after loading are found and added to the command table
+    example_plugin = plugin_manager.plugins['ExamplePlugin']
+    example_plugin.command_map['NewCommand'] = (Mock(), [])
+    assert plugin_manager.find_command_handler('NewCommand').plugin is example_plugin
+    assert 'NewCommand' in plugin_manager.command_table
+
+    # duplicate instructions resolve to the first plugin loaded
+    utils.clear_log()
+    example_plugin.command_map['StartCfs'] = (Mock(), [])
+    plugin_manager.build_command_table()
+    assert utils.has_log_level('WARNING')
+    first_plugin = next(p for p in plugin_manager.plugins.values() if p in (cfs_plugin, example_plugin))
+    assert plugin_manager.find_command_handler('StartCfs').plugin is first_plugin
+    del example_plugin.command_map['StartCfs']
+
+
 def test_plugin_manager_find_plugin_for_command_and_execute(plugin_manager, utils):
     """
     test PluginManager class method: find_plugin_for_command_and_execute
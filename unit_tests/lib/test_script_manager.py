@@ -16,8 +16,10 @@ Unit Test for ScriptManager: Loads and manages test scripts during a test run
 # License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
 # either expressed or implied.
 
+import json
+import os
 import time
-from unittest.mock import patch, Mock, mock_open
+from unittest.mock import call, patch, Mock, mock_open
 
 import pytest
 
@@ -26,7 +28,7 @@ from lib.exceptions import CtfTestError
 from lib.plugin_manager import PluginManager
 from lib.readers.json_script_reader import JSONScriptReader
 from lib.script_manager import ScriptManagerConfig, ScriptManager
-from lib.status_manager import StatusManager
+from lib.status_manager import StatusManager, StatusDefs
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -59,6 +61,8 @@ def test_script_manager_config_init(script_manager_config):
     """
     assert not script_manager_config.reset_plugins_between_scripts
     assert script_manager_config.json_results
+    assert script_manager_config.parallel_workers == 0
+    assert script_manager_config.parallel_port_stride == 100
 
 
 def test_script_manager_init(script_manager):
@@ -253,3 +257,57 @@ def test_script_manager_write_summary_line_open_exception(script_manager,example
         mocked_open.side_effect = IOError
         script_manager.write_summary_line(example_script)
         assert utils.has_log_level('ERROR')
+
+
+def test_script_manager_run_all_scripts_parallel(script_manager, tmp_path):
+    """
+    Test ScriptManager class method: run_all_scripts  with parallel_workers
+    Scripts run in worker processes, and their status and results are merged in script order.
+    """
+    for index in range(3):
+        script_manager.add_script(JSONScriptReader('./functional_tests/plugin_tests/Test_CTF_Basic_Example.json').script)
+        script_manager.script_list[index].input_file = "Script_{}.json".format(index)
+    script_manager.config.parallel_workers = 2
+
+    def run_script(script, status_manager):
+        script.num_tests = len(script.tests)
+        script.num_passed = script.num_tests
+        status_manager.update_script_status(StatusDefs.active, "")
+
+    with patch("lib.test_script.TestScript.run_script", run_script), \
+         patch("lib.script_manager.change_log_file"), \
+         patch.object(Global, "test_log_dir", str(tmp_path)), \
+         patch.object(Global, "CTF_log_dir_file", str(tmp_path / "CTF_Log.log")), \
+         patch.object(script_manager, 'plugin_manager', Mock(spec=PluginManager)):
+        assert script_manager.run_all_scripts() is None
+
+    assert sorted(os.listdir(str(tmp_path / "worker_0"))) == ["logs", "results_summary.txt"]
+    with open(str(tmp_path / "results_summary.txt")) as summary_file:
+        lines = summary_file.readlines()[2:]
+    assert [line.split()[-1] for line in lines] == [script.input_file for script in script_manager.script_list]
+    with open(str(tmp_path / "results_summary.json")) as json_file:
+        results = json.load(json_file)["Test_Results"]
+    assert [result["Script"] for result in results] == [script.input_file for script in script_manager.script_list]
+    assert all(result["Tests_Passed"] == result["Tests_Run"] > 0 for result in results)
+    # the status of each script is updated by the worker that ran it
+    assert all(script["status"] != StatusDefs.waiting for script in script_manager.status_manager.status["scripts"])
+
+
+def test_script_manager_offset_worker_ports(script_manager):
+    """
+    Test ScriptManager class method: offset_worker_ports
+    """
+    config = Global.config
+    with patch.object(Global, "config", Mock(wraps=config)):
+        Global.config.set = Mock()
+        # the ports of the first worker are not offset, but are passed to cFS
+        script_manager.offset_worker_ports(0)
+        assert all(set_call.args[1] == "cfs_port_arg" for set_call in Global.config.set.call_args_list)
+        Global.config.set.assert_any_call("cfs", "cfs_port_arg", "True")
+        Global.config.set.reset_mock()
+        script_manager.offset_worker_ports(2)
+        Global.config.set.assert_any_call("cfs", "cmd_udp_port", "5210")
+        Global.config.set.assert_any_call("cfs", "tlm_udp_port", "5211")
+        Global.config.set.assert_any_call("cfs", "cfs_port_arg", "True")
+        Global.config.set.assert_any_call("tgt1", "cfs_port_arg", "True")
+        assert call("core", "cfs_port_arg", "True") not in Global.config.set.call_args_list
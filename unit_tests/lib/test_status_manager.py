@@ -17,6 +17,8 @@ Unit Test for StatusManager: Publishes CTF status messages over a UDP socket (ut
 # either expressed or implied.
 
 import copy
+import json
+import queue
 import socket
 from unittest.mock import patch
 
@@ -24,7 +26,7 @@ import pytest
 
 from lib.readers.json_script_reader import JSONScriptReader
 from lib.status import StatusDefs
-from lib.status_manager import StatusManager
+from lib.status_manager import StatusManager, WorkerStatusReporter
 
 
 @pytest.fixture(name="status_manager_instance")
@@ -284,3 +286,123 @@ def test_status_manager_send_update_exception_sendall(status_manager_instance_in
         mock_sendall.side_effect = socket.error()
         status_manager_instance_inited.send_update()
         assert utils.has_log_level('ERROR')
+
+
+def test_status_manager_send_update_rate_limit(status_manager_instance_inited):
+    """
+    Test StatusManager class method: send_update - updates exceeding the maximum rate are coalesced
+    """
+    status_manager = status_manager_instance_inited
+    status_manager.min_update_interval = 10.0
+    status_manager.start()
+    status_manager.port = 5004
+    with patch('socket.socket.sendall') as mock_sendall:
+        status_manager.update_command_status(StatusDefs.active, "")
+        status_manager.update_command_status(StatusDefs.passed, "")
+        assert mock_sendall.call_count == 1
+        assert status_manager.update_pending
+        # script updates are always sent
+        status_manager.update_script_status(StatusDefs.active, "")
+        assert mock_sendall.call_count == 2
+        assert not status_manager.update_pending
+        status_manager.update_test_status(StatusDefs.passed, "")
+        status_manager.finalize_suite_status()
+        assert mock_sendall.call_count == 3
+
+
+def test_status_manager_send_update_rate_limit_flush(status_manager_instance_inited):
+    """
+    Test StatusManager class method: send_update - an update withheld by the rate limit is sent by the flush timer
+    """
+    status_manager = status_manager_instance_inited
+    status_manager.min_update_interval = 0.05
+    status_manager.start()
+    status_manager.port = 5004
+    with patch('socket.socket.sendall') as mock_sendall:
+        status_manager.update_command_status(StatusDefs.active, "")
+        status_manager.update_command_status(StatusDefs.passed, "")
+        assert mock_sendall.call_count == 1
+        flush_timer = status_manager.flush_timer
+        assert flush_timer is not None
+        flush_timer.join(1.0)
+        assert mock_sendall.call_count == 2
+        assert not status_manager.update_pending
+        assert status_manager.flush_timer is None
+
+
+def test_status_manager_send_update_delta(status_manager_instance_inited):
+    """
+    Test StatusManager class method: send_update - delta mode sends a snapshot, then changed nodes only
+    """
+    status_manager = status_manager_instance_inited
+    status_manager.mode = "delta"
+    status_manager.start()
+    status_manager.port = 5004
+    with patch('socket.socket.sendall') as mock_sendall:
+        status_manager.update_command_status(StatusDefs.active, "")
+        snapshot = json.loads(mock_sendall.call_args[0][0])
+        assert snapshot["seq"] == 1
+        assert "elapsed_time" in snapshot and snapshot["scripts"]
+
+        status_manager.update_command_status(StatusDefs.passed, "Verified")
+        delta = json.loads(mock_sendall.call_args[0][0])
+        assert delta["seq"] == 2
+        assert "elapsed_time" not in delta
+        assert delta["delta"]["changes"] == [{"path": [0, 0, 0], "status": StatusDefs.passed, "details": "Verified"}]
+
+        # looping back resets the status of the following instructions
+        status_manager.update_command_status(StatusDefs.active, "", index=1)
+        status_manager.update_command_status(StatusDefs.active, "", index=0)
+        delta = json.loads(mock_sendall.call_args[0][0])
+        assert [change["path"] for change in delta["delta"]["changes"]] == [[0, 0, 1], [0, 0, 0]]
+
+        status_manager.last_snapshot_time -= status_manager.snapshot_period
+        status_manager.update_test_status(StatusDefs.passed, "")
+        assert "scripts" in json.loads(mock_sendall.call_args[0][0])
+
+
+def test_status_manager_send_update_too_large(status_manager_instance_inited, utils):
+    """
+    Test StatusManager class method: send_update - messages larger than a datagram are not sent
+    """
+    status_manager_instance_inited.start()
+    status_manager_instance_inited.port = 5004
+    utils.clear_log()
+    with patch('socket.socket.sendall') as mock_sendall, patch('lib.status_manager.MAX_DATAGRAM_SIZE', 10):
+        status_manager_instance_inited.send_update()
+        mock_sendall.assert_not_called()
+        assert utils.has_log_level('WARNING')
+        assert status_manager_instance_inited.port == 5004
+
+
+def test_status_manager_apply_worker_update(status_manager_instance_inited, utils):
+    """
+    Test StatusManager class method: apply_worker_update - updates forwarded by a WorkerStatusReporter
+    """
+    status_manager = status_manager_instance_inited
+    status_manager.start()
+    message_queue = queue.Queue()
+    reporter = WorkerStatusReporter(message_queue, 1)
+    reporter.update_script_status(StatusDefs.active)
+    reporter.update_test_status(StatusDefs.failed, "")
+    reporter.end_command()
+    reporter.update_command_status(StatusDefs.passed, "Verified")
+    reporter.end_test()
+    reporter.end_script()
+    assert (reporter.test_index, reporter.command_index) == (0, 0)
+
+    while not message_queue.empty():
+        kind, worker_index, payload = message_queue.get()
+        assert (kind, worker_index) == ("status", 1)
+        status_manager.apply_worker_update(*payload)
+
+    script_status = status_manager.status["scripts"][0]
+    assert script_status["status"] == StatusDefs.active
+    assert script_status["tests"][0]["instructions"][1]["status"] == StatusDefs.passed
+    assert script_status["tests"][0]["instructions"][1]["details"] == "Verified"
+    assert script_status["tests"][0]["status"] == StatusDefs.failed
+
+    utils.clear_log()
+    status_manager.apply_worker_update((0, 0, 0), "set_scripts", ([],))
+    assert utils.has_log_level('WARNING')
+    assert status_manager.status["scripts"]
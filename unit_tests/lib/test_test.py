@@ -98,28 +98,28 @@ def test_test_execute_instruction(test_instance_inited):
                                       'description': 'Start CFS, Send TO NOOP command'}
 
     # test instruction pass
-    with patch("lib.plugin_manager.Plugin.process_command", return_value=True):
+    with patch("lib.plugin_manager.Plugin.process_command_handler", return_value=True):
         assert test_instance_inited.execute_instruction(test_instruction, 0) is True
     # test instruction fail
-    with patch("lib.plugin_manager.Plugin.process_command", return_value=False):
+    with patch("lib.plugin_manager.Plugin.process_command_handler", return_value=False):
         assert test_instance_inited.execute_instruction(test_instruction, 1) is False
     # test instruction return None
-    with patch("lib.plugin_manager.Plugin.process_command", return_value=None):
+    with patch("lib.plugin_manager.Plugin.process_command_handler", return_value=None):
         assert test_instance_inited.execute_instruction(test_instruction, 2) is False
     # raise exception
     test_instruction = {'instruction': 'StartCfs', 'data': {'target': ''}, 'wait': 1}
-    with patch("lib.plugin_manager.Plugin.process_command") as mock_process_command:
-        mock_process_command.side_effect = CtfTestError("Raise Exception from process_command")
+    with patch("lib.plugin_manager.Plugin.process_command_handler") as mock_process_command:
+        mock_process_command.side_effect = CtfTestError("Raise Exception from process_command_handler")
         assert test_instance_inited.execute_instruction(test_instruction, 3) is False
         mock_process_command.assert_called_once()
 
     # No test instruction
     test_instruction = {'instruction': 'Mock_StartCfs', 'data': {'target': ''}, 'wait': 1}
-    with patch("lib.plugin_manager.Plugin.process_command", return_value=None):
+    with patch("lib.plugin_manager.Plugin.process_command_handler", return_value=None):
         assert test_instance_inited.execute_instruction(test_instruction, 3) is False
     # verify_required_commands
     test_instruction = {'instruction': 'CheckNoEvent', 'data': {'target': ''}, 'wait': 1}
-    with patch("lib.plugin_manager.Plugin.process_command", return_value=None):
+    with patch("lib.plugin_manager.Plugin.process_command_handler", return_value=None):
         assert test_instance_inited.execute_instruction(test_instruction, 4) is False
 
 
@@ -135,14 +135,14 @@ def test_test_execute_verification_fail(test_instance_inited):
     timeout = 5.0
     new_verification = True
 
-    with patch("lib.plugin_manager.Plugin.process_command", return_value=None):
+    with patch("lib.plugin_manager.Plugin.process_command_handler", return_value=None):
         assert not test_instance_inited.execute_verification(command, command_index, timeout, new_verification)
 
-    with patch("lib.plugin_manager.Plugin.process_command", return_value=False):
+    with patch("lib.plugin_manager.Plugin.process_command_handler", return_value=False):
         assert not test_instance_inited.execute_verification(command, command_index, timeout, new_verification)
 
-    with patch("lib.plugin_manager.Plugin.process_command") as mock_process_command:
-        mock_process_command.side_effect = CtfTestError("Raise Exception from process_command")
+    with patch("lib.plugin_manager.Plugin.process_command_handler") as mock_process_command:
+        mock_process_command.side_effect = CtfTestError("Raise Exception from process_command_handler")
         assert not test_instance_inited.execute_verification(command, command_index, timeout, new_verification)
 
 
@@ -158,7 +158,7 @@ def test_test_execute_verification_pass(test_instance_inited):
     timeout = 5.0
     new_verification = True
 
-    with patch("lib.plugin_manager.Plugin.process_command", return_value=True):
+    with patch("lib.plugin_manager.Plugin.process_command_handler", return_value=True):
         assert test_instance_inited.execute_verification(command, command_index, timeout, new_verification)
 
 
@@ -174,12 +174,43 @@ def test_test_execute_verification_exception(test_instance_inited):
     timeout = 5.0
     new_verification = True
 
-    with patch("lib.plugin_manager.Plugin.process_command", return_value=False), \
+    with patch("lib.plugin_manager.Plugin.process_command_handler", return_value=False), \
          patch("lib.test.Test.process_verification_delay") as mock_process_verification_delay:
         mock_process_verification_delay.side_effect = CtfConditionError('Mock exception', False)
         assert not test_instance_inited.execute_verification(command, command_index, timeout, new_verification)
 
 
+def test_test_execute_verification_event_driven(test_instance_inited):
+    """
+    test Test class method: execute_verification:  event-driven verification
+    Execute a CTF Verification Instruction until the timeout elapses in execution time.
+    """
+    command = {'instruction': 'CheckTlmValue', 'data': {'target': '', 'mid': 'TO_HK_TLM_MID', 'args': [
+        {'compare': '==', 'variable': 'usCmdCnt', 'value': [2.0]}]}, 'wait': 1,
+               'args': [{'compare': '==', 'variable': 'usCmdCnt', 'value': [2.0]}]}
+    time_manager = Mock(exec_time=0.0)
+
+    def wait_for_update(seconds):
+        # new data wakes the verification after 0.2s
+        time_manager.exec_time += min(seconds, 0.2)
+
+    time_manager.wait_for_update.side_effect = wait_for_update
+    Global.set_time_manager(time_manager)
+    test_instance_inited.event_driven_verification = True
+
+    with patch("lib.plugin_manager.Plugin.process_command_handler", return_value=False) as mock_process_command:
+        assert not test_instance_inited.execute_verification(command, 6, 1.0, True)
+        assert mock_process_command.call_count == 6
+        assert isclose(time_manager.exec_time, 1.0)
+        time_manager.wait.assert_not_called()
+
+    time_manager.exec_time = 0.0
+    with patch("lib.plugin_manager.Plugin.process_command_handler", side_effect=[False, True]) as mock_process_command:
+        assert test_instance_inited.execute_verification(command, 6, 1.0, True)
+        assert mock_process_command.call_count == 2
+        time_manager.wait_for_update.assert_called_with(0.5)
+
+
 def test_test_process_command_delay(test_instance):
     """
     test Test class static  method: process_command_delay